@@ -0,0 +1,99 @@
+import re
+from functools import reduce
+from django.db import connection
+from django.db.models import F, Value
+from shared.busqueda import normalizar_texto
+from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
+
+# Configuración de texto de PostgreSQL para el catálogo académico
+CONFIG_BUSQUEDA = 'spanish'
+
+
+def vector_busqueda(*textos):
+    """
+    Construye el tsvector del catálogo a partir de pares (texto, peso).
+    Los textos se normalizan sin acentos para que la búsqueda no los distinga.
+    """
+    vectores = [
+        SearchVector(Value(normalizar_texto(texto)), weight=peso, config=CONFIG_BUSQUEDA)
+        for texto, peso in textos
+    ]
+    return reduce(lambda a, b: a + b, vectores)
+
+
+def usa_texto_completo():
+    return connection.vendor == 'postgresql'
+
+
+def poblar_vectores(conexion, tabla, filas):
+    """
+    Escribe la columna 'busqueda' de muchas filas con un único UPDATE ...
+    FROM (VALUES ...), con el mismo tsvector que vector_busqueda.
+
+    Args:
+        conexion: Conexión PostgreSQL (ej: schema_editor.connection)
+        tabla: Tabla con columnas id y busqueda
+        filas: Lista de (pk, [(texto, peso), ...]), con los mismos pesos en todas
+    """
+    if not filas:
+        return
+    pesos = [peso for _, peso in filas[0][1]]
+    columnas = [f't{indice}' for indice in range(len(pesos))]
+    vector = ' || '.join(
+        f"setweight(to_tsvector('{CONFIG_BUSQUEDA}'::regconfig, v.{columna}), '{peso}')"
+        for columna, peso in zip(columnas, pesos)
+    )
+    valores = ', '.join(['(%s' + ', %s' * len(columnas) + ')'] * len(filas))
+    parametros = [
+        valor for pk, textos in filas
+        for valor in (pk, *(normalizar_texto(texto) for texto, _ in textos))
+    ]
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {tabla} SET busqueda = {vector} '
+            f"FROM (VALUES {valores}) AS v(id, {', '.join(columnas)}) WHERE {tabla}.id = v.id",
+            parametros
+        )
+
+
+def _coincide(palabras, textos):
+    # Como 'palabra:*' en PostgreSQL: cada palabra es prefijo de alguna del texto
+    candidatas = normalizar_texto(' '.join(textos)).split()
+    return all(any(candidata.startswith(palabra) for candidata in candidatas) for palabra in palabras)
+
+
+def buscar_catalogo(queryset, texto, campos, orden=()):
+    """
+    Búsqueda de texto completo sobre la columna 'busqueda' del modelo,
+    con resultados ordenados por relevancia y coincidencia por prefijo
+    (ej: 'matem' encuentra 'Matemáticas').
+
+    Args:
+        queryset: QuerySet de un modelo con columna 'busqueda' (tsvector)
+        texto: Texto ingresado por el usuario
+        campos: Campos en que se busca fuera de PostgreSQL
+        orden: Orden secundario para empates de relevancia
+
+    Fuera de PostgreSQL (tests con SQLite) la coincidencia se evalúa en
+    Python con las mismas reglas (sin acentos, todas las palabras, por
+    prefijo) pero sin stemming ni relevancia: pensado para catálogos chicos.
+    """
+    palabras = re.findall(r'[^\W_]+', normalizar_texto(texto))
+    if not palabras:
+        return queryset
+
+    if not usa_texto_completo():
+        ids = [
+            fila[0] for fila in queryset.values_list('pk', *campos)
+            if _coincide(palabras, [valor or '' for valor in fila[1:]])
+        ]
+        return queryset.filter(pk__in=ids).order_by(*orden) if orden else queryset.filter(pk__in=ids)
+
+    query = SearchQuery(
+        ' & '.join(f'{palabra}:*' for palabra in palabras),
+        search_type='raw',
+        config=CONFIG_BUSQUEDA
+    )
+    return queryset.filter(busqueda=query).annotate(
+        relevancia=SearchRank(F('busqueda'), query)
+    ).order_by('-relevancia', *orden)
@@ -0,0 +1,240 @@
+import json
+import random
+import statistics
+import threading
+import http.client
+from itertools import cycle, islice
+from time import perf_counter, sleep
+from urllib.parse import urlsplit
+from django.urls import reverse
+from authentication.models import Usuario
+from .models import Gestion, Grupo, Trimestre
+
+# Escenarios por rol: (nombre, peso, pasos), cada paso (método, nombre de la
+# URL, query). La query admite {gestion}, {trimestre}, {grupo} y {pagina}.
+#
+# Profesores y alumnos solo tienen acceso a la sesión (login, refresh,
+# logout); el pase de lista y la carga de notas no tienen endpoints propios,
+# así que se simulan con las lecturas del director sobre los mismos datos.
+ESCENARIOS = {
+    'director': [
+        ('panel', 6, [
+            ('GET', 'dashboard-director', ''),
+            ('GET', 'academic-stats', ''),
+            ('GET', 'bitacora-stats', ''),
+        ]),
+        ('pase_de_lista', 3, [
+            ('GET', 'horario-vista-semanal', 'trimestre={trimestre}&grupo={grupo}'),
+            ('GET', 'matriculacion-list-create', 'gestion={gestion}&page={pagina}&expand=alumno'),
+        ]),
+        ('notas', 1, [('GET', 'exportar-notas-examenes', 'gestion={gestion}')]),
+        ('bitacora', 2, [('GET', 'bitacora-list', 'page={pagina}')]),
+    ],
+    'profesor': [
+        ('renovar_sesion', 4, [('POST', 'token-refresh', '')]),
+        ('reingreso', 1, [('POST', 'logout', ''), ('POST', 'login', '')]),
+    ],
+    'alumno': [
+        ('renovar_sesion', 4, [('POST', 'token-refresh', '')]),
+        ('reingreso', 1, [('POST', 'logout', ''), ('POST', 'login', '')]),
+    ],
+}
+
+PAGINAS = 5
+
+
+def cuentas(rol, cantidad, dominio):
+    """
+    Emails de `cantidad` usuarios activos del rol cuyo email termina en el
+    dominio (p. ej. los de generar_datos_sinteticos). Si hay menos usuarios
+    que los pedidos se repiten: cada usuario virtual tiene su propia sesión.
+    """
+    emails = list(
+        Usuario.objects.filter(tipo_usuario=rol, email__endswith=dominio, is_active=True)
+        .order_by('id').values_list('email', flat=True)[:cantidad]
+    )
+    return list(islice(cycle(emails), cantidad)) if emails else []
+
+
+def contexto(anio=None):
+    """Pk de gestión, trimestres y grupos con que se completan las queries"""
+    gestiones = Gestion.objects.order_by('-activa', '-anio')
+    gestion = (gestiones.filter(anio=anio) if anio else gestiones).first()
+    if gestion is None:
+        return None
+    return {
+        'gestion': gestion.pk,
+        'trimestres': list(Trimestre.objects.filter(gestion=gestion).values_list('pk', flat=True)) or [0],
+        'grupos': list(Grupo.objects.values_list('pk', flat=True)) or [0],
+    }
+
+
+class Registro:
+    """Latencias por endpoint, compartidas por todos los hilos"""
+
+    def __init__(self):
+        self.muestras = {}
+        self._lock = threading.Lock()
+
+    def agregar(self, etiqueta, ms, correcta):
+        with self._lock:
+            self.muestras.setdefault(etiqueta, []).append((ms, correcta))
+
+
+class UsuarioVirtual:
+    """
+    Un cliente HTTP con su propia conexión keep-alive y sus tokens, que
+    ejecuta escenarios de su rol elegidos por peso.
+    """
+
+    def __init__(self, base, rol, email, password, datos, registro, semilla):
+        partes = urlsplit(base)
+        self.host, self.puerto = partes.hostname, partes.port or 80
+        self.rol, self.email, self.password = rol, email, password
+        self.datos, self.registro = datos, registro
+        self.rng = random.Random(f'{semilla}:{rol}:{email}')
+        self.access = self.refresh = None
+        self.conexion = None
+
+    def _enviar(self, metodo, ruta, cuerpo, cabeceras):
+        # Un reintento si el servidor cerró la conexión keep-alive inactiva
+        for intento in range(2):
+            if self.conexion is None:
+                self.conexion = http.client.HTTPConnection(self.host, self.puerto, timeout=60)
+            try:
+                self.conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras)
+                respuesta = self.conexion.getresponse()
+                return respuesta.status, respuesta.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.conexion.close()
+                self.conexion = None
+                if intento:
+                    raise
+
+    def _cuerpo(self, nombre):
+        if nombre == 'login':
+            return {'email': self.email, 'password': self.password}
+        if nombre in ('token-refresh', 'logout'):
+            return {'refresh': self.refresh}
+        return None
+
+    def peticion(self, metodo, nombre, query='', etiqueta=None):
+        valores = {
+            'gestion': self.datos['gestion'],
+            'trimestre': self.rng.choice(self.datos['trimestres']),
+            'grupo': self.rng.choice(self.datos['grupos']),
+            'pagina': self.rng.randint(1, PAGINAS),
+        }
+        ruta = reverse(nombre) + ('?' + query.format(**valores) if query else '')
+        cabeceras = {'Content-Type': 'application/json'}
+        if self.access and nombre != 'login':
+            cabeceras['Authorization'] = f'Bearer {self.access}'
+        cuerpo = self._cuerpo(nombre)
+
+        inicio = perf_counter()
+        try:
+            estado, contenido = self._enviar(
+                metodo, ruta, json.dumps(cuerpo).encode() if cuerpo is not None else None, cabeceras
+            )
+        except (OSError, http.client.HTTPException):
+            estado, contenido = None, b''
+        correcta = estado is not None and estado < 400
+        self.registro.agregar(etiqueta or f'{metodo} {nombre}', (perf_counter() - inicio) * 1000, correcta)
+
+        if estado == 401:
+            # Sesión perdida (token vencido o refresh rechazado): el próximo
+            # escenario vuelve a iniciar sesión
+            self.access = None
+        elif correcta and nombre in ('login', 'token-refresh'):
+            # ROTATE_REFRESH_TOKENS: el refresh anterior queda en la lista negra
+            respuesta = json.loads(contenido)
+            self.access = respuesta['access']
+            self.refresh = respuesta.get('refresh', self.refresh)
+        return correcta
+
+    def escenario(self):
+        nombres, pesos, pasos = zip(*ESCENARIOS[self.rol])
+        indice = self.rng.choices(range(len(nombres)), weights=pesos)[0]
+        if self.access is None and not self.peticion('POST', 'login'):
+            return
+        for metodo, nombre, query in pasos[indice]:
+            if not self.peticion(metodo, nombre, query):
+                break
+
+    def cerrar(self):
+        if self.conexion is not None:
+            self.conexion.close()
+
+
+def ejecutar(base, cuentas_por_rol, password, datos, duracion, pausa=0.0, semilla=0):
+    """
+    Lanza un hilo por usuario virtual. Todos inician sesión a la vez (la
+    tormenta de login de la mañana) y luego repiten escenarios de su rol,
+    con `pausa` segundos entre uno y otro, hasta cumplir `duracion`.
+
+    Returns:
+        (registro, segundos transcurridos)
+    """
+    registro = Registro()
+    usuarios = [
+        UsuarioVirtual(base, rol, email, password, datos, registro, f'{semilla}:{indice}')
+        for rol, emails in cuentas_por_rol.items() for indice, email in enumerate(emails)
+    ]
+    barrera = threading.Barrier(len(usuarios) + 1)
+    fin = [0.0]
+
+    def correr(usuario):
+        barrera.wait()
+        try:
+            # Si falla, el primer escenario vuelve a intentarlo
+            usuario.peticion('POST', 'login', etiqueta='POST login (tormenta inicial)')
+            while perf_counter() < fin[0]:
+                usuario.escenario()
+                if pausa:
+                    sleep(usuario.rng.uniform(0, 2 * pausa))
+        finally:
+            usuario.cerrar()
+
+    hilos = [threading.Thread(target=correr, args=(usuario,), daemon=True) for usuario in usuarios]
+    for hilo in hilos:
+        hilo.start()
+    inicio = perf_counter()
+    fin[0] = inicio + duracion
+    barrera.wait()
+    for hilo in hilos:
+        hilo.join()
+    return registro, perf_counter() - inicio
+
+
+def _percentiles(latencias):
+    if len(latencias) < 2:
+        return (latencias * 3)[:3] or [None] * 3
+    cuantiles = statistics.quantiles(latencias, n=100, method='inclusive')
+    return [cuantiles[49], cuantiles[94], cuantiles[98]]
+
+
+def resumen(registro, duracion):
+    """
+    Returns:
+        Lista de filas por endpoint más una fila TOTAL: peticiones, errores,
+        tasa de error, peticiones por segundo y p50/p95/p99 en ms de las
+        respuestas correctas
+    """
+    filas = []
+    todas = []
+    for etiqueta, muestras in sorted(registro.muestras.items()) + [('TOTAL', None)]:
+        muestras = todas if muestras is None else muestras
+        if etiqueta != 'TOTAL':
+            todas.extend(muestras)
+        latencias = [ms for ms, correcta in muestras if correcta]
+        errores = len(muestras) - len(latencias)
+        p50, p95, p99 = _percentiles(latencias)
+        filas.append({
+            'endpoint': etiqueta,
+            'peticiones': len(muestras),
+            'errores': errores,
+            'tasa_error': errores / len(muestras) if muestras else 0.0,
+            'rps': len(muestras) / duracion if duracion else 0.0,
+            'p50': p50, 'p95': p95, 'p99': p99,
+        })
+    return filas
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+)
+from shared.rendimiento import cargar_base, guardar_base, regresiones
+from academic.rendimiento import RUTA_BASE, RUTA_TIEMPOS, sembrar_datos, medir_endpoints, rutas_sin_medir
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide consultas, filas leídas y tiempo de cada endpoint de authentication, '
+        'academic y audit sobre una base de prueba con datos sembrados, y los '
+        'compara con la línea base versionada (academic/rendimiento_base.json). '
+        'Los tiempos solo se comparan con --tolerancia, contra los guardados en '
+        'esta máquina (academic/rendimiento_tiempos.json, sin versionar)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=5, help='Ejecuciones por endpoint (tiempo = mediana)')
+        parser.add_argument('--tolerancia', type=float, default=0,
+                            help='Regresión de tiempo si ms > base local x tolerancia + 5 (0 = no comparar tiempos)')
+        parser.add_argument('--actualizar', action='store_true', help='Guardar las mediciones como nueva línea base')
+
+    def handle(self, *args, **options):
+        # Base de prueba propia (como manage.py test): los datos sembrados
+        # no se mezclan con los de la base configurada
+        setup_test_environment()
+        configuracion = setup_databases(verbosity=0, interactive=False)
+        try:
+            with transaction.atomic():
+                datos = sembrar_datos()
+                faltantes = rutas_sin_medir(datos)
+                mediciones = medir_endpoints(datos, options['repeticiones'])
+                transaction.set_rollback(True)
+        finally:
+            teardown_databases(configuracion, verbosity=0)
+            teardown_test_environment()
+
+        base = cargar_base(RUTA_BASE)
+        tiempos = cargar_base(RUTA_TIEMPOS)
+        for nombre, anterior in base.items():
+            anterior.update(tiempos.get(nombre, {}))
+        self.stdout.write(f"{'endpoint':<58} {'estado':>6} {'consultas':>10} {'filas':>10} {'ms':>16}")
+        for nombre, medicion in mediciones.items():
+            anterior = base.get(nombre, {})
+            filas = '-' if medicion['filas'] is None else medicion['filas']
+            self.stdout.write(
+                f"{nombre:<58} {medicion['estado']:>6} "
+                f"{medicion['consultas']:>4} ({anterior.get('consultas', '-'):>3}) "
+                f"{filas:>4} ({anterior.get('filas', '-'):>3}) "
+                f"{medicion['ms']:>7.1f} ({anterior.get('ms', '-'):>6})"
+            )
+
+        errores = [f'Rutas sin medir: {", ".join(faltantes)}'] if faltantes else []
+        errores += [
+            f"{nombre}: respondió {medicion['estado']}"
+            for nombre, medicion in mediciones.items() if medicion['estado'] >= 400
+        ]
+
+        if options['actualizar']:
+            if errores:
+                raise CommandError('\n'.join(errores))
+            guardar_base(RUTA_BASE, mediciones)
+            guardar_base(RUTA_TIEMPOS, mediciones, claves=('ms',))
+            self.stdout.write(self.style.SUCCESS(f'Línea base guardada en {RUTA_BASE} (tiempos en {RUTA_TIEMPOS})'))
+            return
+
+        errores += regresiones(mediciones, base, options['tolerancia'] or None)
+        if errores:
+            raise CommandError('Regresiones de rendimiento:\n' + '\n'.join(errores))
+        self.stdout.write(self.style.SUCCESS('Sin regresiones respecto de la línea base'))
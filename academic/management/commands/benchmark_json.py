@@ -0,0 +1,83 @@
+import io
+import json
+import statistics
+from math import ceil
+from time import perf_counter
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from shared.parsers import ORJSONParser
+from shared.renderers import ORJSONRenderer, orjson
+from authentication.models import Alumno
+from authentication.serializers import AlumnoListSerializer
+from academic.models import Horario, Matriculacion
+from academic.serializers import HorarioSerializer, MatriculacionSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el tiempo de render JSON (DRF estándar contra orjson) sobre los '
+        'listados más grandes de la API: horarios, matriculaciones y alumnos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=5000, help='Filas por listado')
+        parser.add_argument('--muestras', type=int, default=10, help='Repeticiones por medición')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson no está instalado: ORJSONRenderer usa el encoder estándar'))
+
+        filas = max(1, options['filas'])
+        muestras = max(1, options['muestras'])
+
+        listados = {
+            'horarios': (HorarioSerializer, Horario.objects.select_related(
+                'profesor_materia__profesor', 'profesor_materia__materia', 'grupo__nivel', 'aula', 'trimestre'
+            )),
+            'matriculaciones': (MatriculacionSerializer, Matriculacion.objects.select_related(
+                'alumno', 'alumno__usuario', 'gestion'
+            )),
+            'alumnos': (AlumnoListSerializer, Alumno.objects.select_related(
+                'usuario', 'grupo', 'grupo__nivel'
+            )),
+        }
+
+        estandar, rapido = JSONRenderer(), ORJSONRenderer()
+
+        self.stdout.write(f"{'listado':<16} {'filas':>6} {'json ms':>9} {'orjson ms':>10} {'parse ms (orjson)':>18} {'mejora':>7}")
+
+        for nombre, (serializer_class, queryset) in listados.items():
+            datos = serializer_class(queryset[:filas], many=True).data
+            if not datos:
+                self.stdout.write(f'{nombre:<16} sin datos')
+                continue
+
+            # Con pocos datos en la base se repiten las filas hasta completar
+            datos = (list(datos) * ceil(filas / len(datos)))[:filas]
+
+            salida_estandar = estandar.render(datos)
+            salida_rapida = rapido.render(datos)
+            if json.loads(salida_estandar) != json.loads(salida_rapida):
+                self.stdout.write(self.style.WARNING(f'{nombre}: la salida de orjson difiere de la estándar'))
+            elif salida_estandar != salida_rapida:
+                # Mismos valores, floats escritos distinto (ver ORJSONRenderer)
+                self.stdout.write(f'{nombre}: mismos valores, bytes distintos en floats')
+
+            tiempo_estandar = self._medir(lambda: estandar.render(datos), muestras)
+            tiempo_rapido = self._medir(lambda: rapido.render(datos), muestras)
+            tiempo_parse = self._medir(lambda: ORJSONParser().parse(io.BytesIO(salida_rapida)), muestras)
+
+            self.stdout.write(
+                f'{nombre:<16} {len(datos):>6} {tiempo_estandar:>9.2f} {tiempo_rapido:>10.2f} '
+                f'{tiempo_parse:>18.2f} {tiempo_estandar / tiempo_rapido:>6.1f}x'
+            )
+
+    @staticmethod
+    def _medir(funcion, muestras):
+        tiempos = []
+        for _ in range(muestras):
+            inicio = perf_counter()
+            funcion()
+            tiempos.append((perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
+
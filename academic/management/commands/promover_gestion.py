@@ -0,0 +1,86 @@
+from django.utils.dateparse import parse_date
+from academic.models import Gestion
+from authentication.models import Alumno
+from django.core.management.base import BaseCommand, CommandError
+from academic.promocion import calcular_promocion, aplicar_promocion
+
+
+def _etiqueta(grupo):
+    return f'{grupo.nivel.numero}{grupo.letra}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Promueve a todos los alumnos de una gestión al nivel siguiente y los '
+        'matricula en la nueva gestión en una sola transacción.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('origen', type=int, help='Año de la gestión que se cierra')
+        parser.add_argument('destino', type=int, help='Año de la gestión a la que se promueve')
+        parser.add_argument('--fecha', help='Fecha de matriculación (YYYY-MM-DD), por defecto hoy')
+        parser.add_argument(
+            '--repite', action='append', default=[], metavar='MATRICULA',
+            help='Matrícula de un alumno que repite el nivel (se puede repetir la opción)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Muestra los cambios sin aplicarlos'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            origen = Gestion.objects.get(anio=options['origen'])
+            destino = Gestion.objects.get(anio=options['destino'])
+        except Gestion.DoesNotExist:
+            raise CommandError('Gestión de origen o destino no encontrada')
+
+        fecha = None
+        if options['fecha']:
+            fecha = parse_date(options['fecha'])
+            if fecha is None:
+                raise CommandError('Fecha inválida, use el formato YYYY-MM-DD')
+
+        repiten = dict(Alumno.objects.filter(matricula__in=options['repite']).values_list('matricula', 'pk'))
+        desconocidas = sorted(set(options['repite']) - set(repiten))
+        if desconocidas:
+            raise CommandError(f"Matrículas no encontradas: {', '.join(desconocidas)}")
+
+        plan = calcular_promocion(origen, destino, repiten.values())
+
+        if options['dry_run']:
+            for alumno, grupo_origen, grupo_destino in plan['promociones']:
+                self.stdout.write(
+                    f'  {alumno.matricula} {alumno.apellidos}, {alumno.nombres}: '
+                    f'{_etiqueta(grupo_origen)} -> {_etiqueta(grupo_destino)}'
+                )
+            for alumno in plan['repitentes']:
+                self.stdout.write(f'  {alumno.matricula} {alumno.apellidos}, {alumno.nombres}: repite')
+            for alumno in plan['egresados']:
+                self.stdout.write(f'  {alumno.matricula} {alumno.apellidos}, {alumno.nombres}: egresa')
+
+        for alumno in plan['sin_grupo']:
+            self.stdout.write(self.style.WARNING(
+                f'Sin grupo en el nivel siguiente: {alumno.matricula} ({_etiqueta(alumno.grupo)})'
+            ))
+        for grupo, cantidad in plan['excede_capacidad']:
+            self.stdout.write(self.style.WARNING(
+                f'El grupo {_etiqueta(grupo)} tendría {cantidad} alumnos en {destino.anio} '
+                f'(capacidad {grupo.capacidad_maxima})'
+            ))
+
+        resumen = (
+            f"{len(plan['promociones'])} a promover, {len(plan['repitentes'])} repitentes, "
+            f"{len(plan['egresados'])} egresados, "
+            f"{len(plan['sin_grupo'])} sin grupo, {len(plan['ya_matriculados'])} ya matriculados en {destino.anio}"
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'Dry run: {resumen}')
+            return
+
+        promovidos, matriculados, egresados = aplicar_promocion(plan, origen, destino, fecha)
+        self.stdout.write(self.style.SUCCESS(
+            f'{promovidos} alumnos promovidos, {matriculados} matriculados en {destino.anio} '
+            f'y {egresados} egresados ({resumen})'
+        ))
@@ -0,0 +1,72 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from academic.carga import ESCENARIOS, contexto, cuentas, ejecutar, resumen
+from evaluations.sintetico import PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga HTTP contra un servidor en marcha: usuarios virtuales de cada rol '
+        'inician sesión a la vez y repiten escenarios ponderados; informa peticiones por '
+        'segundo, p50/p95/p99 y tasa de error por endpoint'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Servidor a probar (runserver o gunicorn)')
+        parser.add_argument('--directores', type=int, default=2, help='Usuarios virtuales con rol director')
+        parser.add_argument('--profesores', type=int, default=10, help='Usuarios virtuales con rol profesor')
+        parser.add_argument('--alumnos', type=int, default=40, help='Usuarios virtuales con rol alumno')
+        parser.add_argument('--duracion', type=float, default=60, help='Segundos de carga, contando la tormenta de login')
+        parser.add_argument('--pausa', type=float, default=1.0, help='Pausa media en segundos entre escenarios de un usuario')
+        parser.add_argument(
+            '--dominio', default='.sintetico.bo',
+            help='Sufijo del email de las cuentas a usar (por defecto las de generar_datos_sinteticos)'
+        )
+        parser.add_argument('--password', default=PASSWORD, help='Contraseña común de esas cuentas')
+        parser.add_argument('--gestion', type=int, help='Año de la gestión consultada (por defecto la activa)')
+        parser.add_argument('--semilla', type=int, default=0, help='Semilla de la elección de escenarios')
+        parser.add_argument('--json', help='Ruta donde guardar también el resumen en JSON')
+
+    def handle(self, *args, **options):
+        datos = contexto(options['gestion'])
+        if datos is None:
+            raise CommandError('No hay gestión que consultar')
+
+        cuentas_por_rol = {}
+        for rol, opcion in (('director', 'directores'), ('profesor', 'profesores'), ('alumno', 'alumnos')):
+            cantidad = max(0, options[opcion])
+            cuentas_por_rol[rol] = cuentas(rol, cantidad, options['dominio'])
+            if cantidad and not cuentas_por_rol[rol]:
+                raise CommandError(
+                    f"No hay usuarios {rol} con email terminado en {options['dominio']} "
+                    '(ver generar_datos_sinteticos)'
+                )
+        if not any(cuentas_por_rol.values()):
+            raise CommandError('Indique al menos un usuario virtual')
+
+        self.stdout.write(
+            'Usuarios virtuales: ' + ', '.join(f'{len(emails)} {rol}' for rol, emails in cuentas_por_rol.items())
+            + f" · escenarios: {', '.join(nombre for rol in ESCENARIOS.values() for nombre, _, _ in rol)}"
+        )
+        registro, duracion = ejecutar(
+            options['url'], cuentas_por_rol, options['password'], datos,
+            options['duracion'], options['pausa'], options['semilla']
+        )
+        filas = resumen(registro, duracion)
+
+        self.stdout.write(
+            f"{'endpoint':<42} {'pet.':>7} {'req/s':>7} {'error %':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for fila in filas:
+            latencias = ''.join(
+                f' {fila[clave]:>8.1f}' if fila[clave] is not None else f" {'-':>8}" for clave in ('p50', 'p95', 'p99')
+            )
+            linea = (
+                f"{fila['endpoint']:<42} {fila['peticiones']:>7} {fila['rps']:>7.1f} "
+                f"{fila['tasa_error'] * 100:>7.1f}{latencias}"
+            )
+            self.stdout.write(self.style.WARNING(linea) if fila['errores'] else linea)
+
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as archivo:
+                json.dump({'duracion': duracion, 'endpoints': filas}, archivo, indent=2, ensure_ascii=False)
@@ -0,0 +1,60 @@
+# Generated by Django 5.2 on 2026-10-19 11:54
+
+import django.contrib.postgres.search
+from django.db import migrations
+from academic.busqueda import poblar_vectores
+
+
+def poblar_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Materia = apps.get_model('academic', 'Materia')
+    Aula = apps.get_model('academic', 'Aula')
+    # Un UPDATE por tabla (los catálogos son chicos: caben en un VALUES)
+    poblar_vectores(schema_editor.connection, 'materias', [
+        (pk, [(codigo, 'A'), (nombre, 'A'), (descripcion, 'B')])
+        for pk, codigo, nombre, descripcion in Materia.objects.values_list('pk', 'codigo', 'nombre', 'descripcion')
+    ])
+    poblar_vectores(schema_editor.connection, 'aulas', [
+        (pk, [(nombre, 'A'), (descripcion, 'B')])
+        for pk, nombre, descripcion in Aula.objects.values_list('pk', 'nombre', 'descripcion')
+    ])
+
+
+def crear_indices_gin(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('CREATE INDEX IF NOT EXISTS materias_busqueda_gin ON materias USING gin (busqueda)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS aulas_busqueda_gin ON aulas USING gin (busqueda)')
+
+
+def eliminar_indices_gin(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP INDEX IF EXISTS materias_busqueda_gin')
+        cursor.execute('DROP INDEX IF EXISTS aulas_busqueda_gin')
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aula',
+            name='busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='materia',
+            name='busqueda',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(poblar_busqueda, migrations.RunPython.noop),
+        migrations.RunPython(crear_indices_gin, eliminar_indices_gin),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from shared.models import BaseEntity
+from .busqueda import vector_busqueda, usa_texto_completo
+from django.contrib.postgres.search import SearchVectorField
 
 class Nivel(BaseEntity):
     numero = models.IntegerField(unique=True)
@@ -34,19 +36,37 @@ class Aula(BaseEntity):
     nombre = models.CharField(max_length=20, unique=True)
     capacidad = models.IntegerField()
     descripcion = models.CharField(max_length=20, blank=True)
+    # tsvector para búsqueda de texto completo (ver academic.busqueda)
+    busqueda = SearchVectorField(null=True, editable=False)
     
     class Meta:
         db_table = 'aulas'
 
+    def save(self, *args, **kwargs):
+        if usa_texto_completo():
+            self.busqueda = vector_busqueda((self.nombre, 'A'), (self.descripcion, 'B'))
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'busqueda'}
+        super().save(*args, **kwargs)
+
 class Materia(BaseEntity):
     codigo = models.CharField(max_length=10, unique=True)
     nombre = models.CharField(max_length=100)
     descripcion = models.CharField(max_length=40, blank=True)
     horas_semanales = models.IntegerField()
+    # tsvector para búsqueda de texto completo (ver academic.busqueda)
+    busqueda = SearchVectorField(null=True, editable=False)
     
     class Meta:
         db_table = 'materias'
 
+    def save(self, *args, **kwargs):
+        if usa_texto_completo():
+            self.busqueda = vector_busqueda((self.codigo, 'A'), (self.nombre, 'A'), (self.descripcion, 'B'))
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'busqueda'}
+        super().save(*args, **kwargs)
+
 class ProfesorMateria(BaseEntity):
     profesor = models.ForeignKey('authentication.Profesor', on_delete=models.CASCADE)
     materia = models.ForeignKey(Materia, on_delete=models.CASCADE)
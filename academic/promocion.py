@@ -0,0 +1,142 @@
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from authentication.models import Alumno
+from shared.copia import insertar_nuevos
+from .models import Grupo, Matriculacion
+
+# Observación de la matriculación de origen de quienes egresan
+OBSERVACION_EGRESO = 'Egresado'
+
+
+def calcular_promocion(origen, destino, repiten=()):
+    """
+    Calcula en memoria la promoción de fin de gestión sin modificar nada.
+
+    Cada alumno con matriculación activa en la gestión de origen pasa al grupo
+    con la misma letra del nivel siguiente. Los que repiten se matriculan en
+    destino sin cambiar de grupo. Los alumnos del último nivel egresan: no se
+    matriculan en destino y su matriculación de origen se cierra. Los que ya
+    están matriculados en destino (o ya egresaron) se omiten, así que volver
+    a ejecutarla no cambia nada.
+
+    Args:
+        origen: Gestion que se cierra
+        destino: Gestion a la que se promueve
+        repiten: pk de los alumnos que repiten el nivel
+
+    Returns:
+        Diccionario con las promociones (alumno, grupo origen, grupo destino),
+        repitentes, egresados, alumnos sin grupo destino, ya matriculados en
+        destino y grupos cuya capacidad se excede (grupo, alumnos en destino)
+    """
+    repiten = set(repiten)
+    grupos = {
+        (grupo.nivel.numero, grupo.letra): grupo
+        for grupo in Grupo.objects.select_related('nivel')
+    }
+    ultimo_nivel = max((numero for numero, _ in grupos), default=0)
+
+    alumnos = list(
+        Alumno.objects.filter(matriculacion__gestion=origen, matriculacion__activa=True)
+        .select_related('grupo__nivel')
+        .only('matricula', 'nombres', 'apellidos', 'grupo__letra', 'grupo__capacidad_maxima', 'grupo__nivel__numero')
+        .order_by('grupo__nivel__numero', 'grupo__letra', 'apellidos', 'nombres')
+    )
+
+    ya_matriculados = set(
+        Matriculacion.objects.filter(
+            gestion=destino, alumno_id__in=[alumno.pk for alumno in alumnos]
+        ).values_list('alumno_id', flat=True)
+    )
+
+    # Ocupación de cada grupo en destino: los ya matriculados más los que llegan
+    ocupacion = Counter(dict(
+        Alumno.objects.filter(matriculacion__gestion=destino)
+        .values('grupo').annotate(alumnos=Count('pk')).values_list('grupo', 'alumnos')
+    ))
+
+    promociones = []
+    repitentes = []
+    egresados = []
+    sin_grupo = []
+
+    for alumno in alumnos:
+        # Ya procesados (manualmente o en una ejecución anterior)
+        if alumno.pk in ya_matriculados:
+            continue
+
+        if alumno.pk in repiten:
+            repitentes.append(alumno)
+            ocupacion[alumno.grupo.pk] += 1
+            continue
+
+        nivel = alumno.grupo.nivel.numero
+        if nivel >= ultimo_nivel:
+            egresados.append(alumno)
+            continue
+
+        grupo_destino = grupos.get((nivel + 1, alumno.grupo.letra))
+        if grupo_destino is None:
+            sin_grupo.append(alumno)
+            continue
+
+        promociones.append((alumno, alumno.grupo, grupo_destino))
+        ocupacion[grupo_destino.pk] += 1
+
+    grupos_por_pk = {grupo.pk: grupo for grupo in grupos.values()}
+    return {
+        'promociones': promociones,
+        'repitentes': repitentes,
+        'egresados': egresados,
+        'sin_grupo': sin_grupo,
+        'ya_matriculados': ya_matriculados,
+        'excede_capacidad': [
+            (grupos_por_pk[grupo_id], cantidad) for grupo_id, cantidad in sorted(ocupacion.items())
+            if cantidad > grupos_por_pk[grupo_id].capacidad_maxima
+        ],
+    }
+
+
+def aplicar_promocion(plan, origen, destino, fecha_matriculacion=None):
+    """
+    Aplica un plan de calcular_promocion en una sola transacción.
+
+    Los cambios de grupo se hacen con un UPDATE por par (grupo origen,
+    grupo destino), el cierre de los egresados con un UPDATE y las
+    matriculaciones nuevas con un INSERT por lote, de modo que la
+    transacción es corta aunque haya cientos de alumnos.
+
+    Returns:
+        Tupla (alumnos promovidos, matriculaciones creadas, egresados)
+    """
+    fecha_matriculacion = fecha_matriculacion or timezone.now().date()
+
+    por_grupo = defaultdict(list)
+    for alumno, grupo_origen, grupo_destino in plan['promociones']:
+        por_grupo[(grupo_origen.pk, grupo_destino.pk)].append(alumno.pk)
+
+    nuevas = [
+        Matriculacion(alumno=alumno, gestion=destino, fecha_matriculacion=fecha_matriculacion)
+        for alumno in [alumno for alumno, _, _ in plan['promociones']] + plan['repitentes']
+    ]
+
+    promovidos = 0
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        for (grupo_origen_id, grupo_destino_id), ids in por_grupo.items():
+            promovidos += Alumno.objects.filter(pk__in=ids, grupo_id=grupo_origen_id).update(
+                grupo_id=grupo_destino_id,
+                updated_at=ahora
+            )
+
+        egresados = Matriculacion.objects.filter(
+            gestion=origen, activa=True, alumno_id__in=[alumno.pk for alumno in plan['egresados']]
+        ).update(activa=False, observaciones=OBSERVACION_EGRESO, updated_at=ahora)
+
+        # Solo cuentan las que se insertaron ahora (no las de una ejecución simultánea)
+        matriculados = len(insertar_nuevos(nuevas, clave=('alumno', 'gestion')))
+
+    return promovidos, matriculados, egresados
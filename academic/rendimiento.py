@@ -0,0 +1,271 @@
+import re
+import tempfile
+from pathlib import Path
+from datetime import date, time, timedelta
+from importlib import import_module
+from django.urls import reverse
+from django.db import transaction
+from django.core.cache import cache
+from django.test import override_settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from audit.models import Bitacora
+from authentication.models import Usuario, Profesor, Alumno
+from authentication.tokens import RefreshTokenCacheado
+from shared.rendimiento import medir
+from .models import (
+    Nivel, Grupo, Aula, Materia, ProfesorMateria, Gestion, Trimestre, Horario, Matriculacion
+)
+
+# Línea base versionada: consultas y filas por endpoint (ver benchmark_endpoints)
+RUTA_BASE = Path(__file__).with_name('rendimiento_base.json')
+# Tiempos de la última --actualizar en esta máquina: no se versionan, los ms
+# de otra máquina no sirven de referencia
+RUTA_TIEMPOS = Path(__file__).with_name('rendimiento_tiempos.json')
+
+# URLconfs cuyas rutas deben estar todas medidas
+URLS_MEDIDAS = ('authentication.urls', 'academic.urls', 'audit.urls')
+
+PASSWORD = 'clave-benchmark'
+
+
+def sembrar_datos():
+    """
+    Crea un colegio pequeño pero completo, siempre igual, para medir los
+    endpoints: 3 niveles x 2 grupos, 60 alumnos, 8 profesores, 10 materias,
+    una gestión activa que incluye la fecha de hoy y otra anterior.
+
+    Returns:
+        Diccionario con el director, su refresh token y los pk que usan
+        las peticiones de peticiones()
+    """
+    hoy = date.today()
+    clave = make_password(PASSWORD)
+
+    niveles = Nivel.objects.bulk_create(
+        Nivel(numero=numero, nombre=f'{numero}° Secundaria') for numero in range(1, 4)
+    )
+    grupos = Grupo.objects.bulk_create(
+        Grupo(nivel=nivel, letra=letra) for nivel in niveles for letra in 'AB'
+    )
+    aulas = Aula.objects.bulk_create(Aula(nombre=f'Aula {numero}', capacidad=40) for numero in range(1, 7))
+    materias = Materia.objects.bulk_create(
+        Materia(codigo=f'MAT{numero:02d}', nombre=f'Materia {numero}', horas_semanales=4)
+        for numero in range(1, 11)
+    )
+
+    director = Usuario.objects.create(email='director@benchmark.bo', password=clave, tipo_usuario='director')
+
+    usuarios = Usuario.objects.bulk_create(
+        [Usuario(email=f'profesor{numero}@benchmark.bo', password=clave, tipo_usuario='profesor')
+         for numero in range(8)]
+        + [Usuario(email=f'alumno{numero}@benchmark.bo', password=clave, tipo_usuario='alumno')
+           for numero in range(60)]
+    )
+    profesores = [
+        Profesor(
+            usuario=usuario, nombres='Ana', apellidos=f'Pérez {numero}', cedula_identidad=f'CI{numero:04d}',
+            fecha_nacimiento=date(1980, 1, 1), genero='F', fecha_contratacion=date(2020, 2, 1),
+            especialidad='Ciencias'
+        )
+        for numero, usuario in enumerate(usuarios[:8])
+    ]
+    alumnos = [
+        Alumno(
+            usuario=usuario, matricula=f'B{numero:05d}', nombres='José', apellidos=f'Núñez {numero}',
+            fecha_nacimiento=date(2010, 1, 1), genero='M', grupo=grupos[numero % len(grupos)]
+        )
+        for numero, usuario in enumerate(usuarios[8:])
+    ]
+    for perfil in profesores + alumnos:
+        perfil.busqueda = perfil.texto_busqueda()
+    Profesor.objects.bulk_create(profesores)
+    Alumno.objects.bulk_create(alumnos)
+
+    # La gestión activa empieza hace 100 días: el segundo trimestre es el actual
+    inicio = hoy - timedelta(days=100)
+    anterior = Gestion.objects.create(
+        anio=hoy.year - 1, nombre='Gestión anterior',
+        fecha_inicio=inicio - timedelta(days=365), fecha_fin=inicio - timedelta(days=30)
+    )
+    gestion = Gestion.objects.create(
+        anio=hoy.year, nombre='Gestión actual', activa=True,
+        fecha_inicio=inicio, fecha_fin=inicio + timedelta(days=300)
+    )
+    trimestres = Trimestre.objects.bulk_create(
+        Trimestre(
+            gestion=gestion_trimestre, numero=numero, nombre=f'Trimestre {numero}',
+            fecha_inicio=gestion_trimestre.fecha_inicio + timedelta(days=90 * (numero - 1)),
+            fecha_fin=gestion_trimestre.fecha_inicio + timedelta(days=90 * numero - 1)
+        )
+        for gestion_trimestre in (anterior, gestion) for numero in range(1, 4)
+    )
+    actual = trimestres[4]
+
+    asignaciones = ProfesorMateria.objects.bulk_create(
+        ProfesorMateria(profesor=profesores[numero % 8], materia=materias[numero % 10]) for numero in range(13)
+    )
+    # La última asignación queda sin horarios (se puede eliminar)
+    Horario.objects.bulk_create(
+        Horario(
+            profesor_materia=asignaciones[(indice * 5 + numero) % 12], grupo=grupo, aula=aulas[indice],
+            trimestre=actual, dia_semana=numero % 5 + 1,
+            hora_inicio=time(8 + numero // 5), hora_fin=time(9 + numero // 5)
+        )
+        for indice, grupo in enumerate(grupos) for numero in range(5)
+    )
+    matriculaciones = Matriculacion.objects.bulk_create(
+        Matriculacion(alumno=alumno, gestion=gestion, fecha_matriculacion=inicio) for alumno in alumnos[:50]
+    )
+    Bitacora.objects.bulk_create(
+        Bitacora(usuario=director, tipo_accion=f'ACCION_{numero % 4}', ip='127.0.0.1') for numero in range(100)
+    )
+
+    return {
+        'director': director,
+        'refresh': str(RefreshTokenCacheado.for_user(director)),
+        'profesor': profesores[0].pk,
+        'alumno': alumnos[0].pk,
+        'sin_matricular': [alumno.pk for alumno in alumnos[50:]],
+        'grupo': grupos[0].pk,
+        'materia': materias[0].pk,
+        'aula': aulas[0].pk,
+        'gestion': gestion.pk,
+        'gestion_anterior': anterior.pk,
+        'trimestre': actual.pk,
+        'matriculacion': matriculaciones[0].pk,
+        'horario': Horario.objects.filter(trimestre=actual).order_by('pk').values_list('pk', flat=True)[0],
+        'profesor_materia': asignaciones[-1].pk,
+    }
+
+
+def _csv_importacion():
+    contenido = (
+        'email,password,matricula,nombres,apellidos,fecha_nacimiento,genero,nivel,letra\n'
+        'nuevo@benchmark.bo,clave,N00001,Luis,Quispe,2010-05-01,M,1,A\n'
+    )
+    return SimpleUploadedFile('alumnos.csv', contenido.encode(), content_type='text/csv')
+
+
+def peticiones(datos):
+    """
+    Peticiones medidas: (nombre de la URL, método, kwargs, query, cuerpo).
+
+    Cada ruta de URLS_MEDIDAS aparece al menos una vez (GET si lo admite);
+    los listados con ?expand= cubren las consultas de las expansiones.
+    """
+    return [
+        # authentication
+        ('login', 'POST', {}, '', {'email': datos['director'].email, 'password': PASSWORD}),
+        ('logout', 'POST', {}, '', {'refresh': datos['refresh']}),
+        ('token-refresh', 'POST', {}, '', {'refresh': datos['refresh']}),
+        ('user-activity', 'GET', {}, '', None),
+        ('profesor-list-create', 'GET', {}, '', None),
+        ('profesor-detail', 'GET', {'pk': datos['profesor']}, '', None),
+        ('alumno-list-create', 'GET', {}, '', None),
+        ('alumno-importar', 'POST', {}, '', _csv_importacion),
+        ('alumno-detail', 'GET', {'pk': datos['alumno']}, '', None),
+        ('dashboard-director', 'GET', {}, '', None),
+
+        # academic
+        ('materia-list-create', 'GET', {}, '', None),
+        ('materia-detail', 'GET', {'pk': datos['materia']}, '', None),
+        ('aula-list-create', 'GET', {}, '', None),
+        ('aula-detail', 'GET', {'pk': datos['aula']}, '', None),
+        ('nivel-list-create', 'GET', {}, '', None),
+        ('grupo-list-create', 'GET', {}, '', None),
+        ('gestion-list-create', 'GET', {}, '', None),
+        ('gestion-detail', 'GET', {'pk': datos['gestion']}, '', None),
+        ('activar-gestion', 'POST', {'pk': datos['gestion_anterior']}, '', {}),
+        ('trimestre-list-create', 'GET', {}, '', None),
+        ('trimestre-detail', 'GET', {'pk': datos['trimestre']}, '', None),
+        ('matriculacion-list-create', 'GET', {}, '', None),
+        ('matriculacion-list-create', 'GET', {}, 'expand=alumno', None),
+        ('matriculacion-detail', 'GET', {'pk': datos['matriculacion']}, '', None),
+        ('matricular-masivo', 'POST', {}, '', {
+            'gestion_id': datos['gestion'], 'alumnos_ids': datos['sin_matricular']
+        }),
+        ('exportar-matriculaciones', 'GET', {}, f"gestion={datos['gestion']}", None),
+        ('horario-list-create', 'GET', {}, '', None),
+        ('horario-list-create', 'GET', {}, 'expand=profesor_materia,trimestre', None),
+        ('horario-detail', 'GET', {'pk': datos['horario']}, '', None),
+        ('horario-vista-semanal', 'GET', {}, f"trimestre={datos['trimestre']}&grupo={datos['grupo']}", None),
+        ('profesor-materia-list-create', 'GET', {}, '', None),
+        ('profesor-materia-list-create', 'GET', {}, 'expand=profesor', None),
+        ('profesor-materia-delete', 'DELETE', {'pk': datos['profesor_materia']}, '', None),
+        ('academic-stats', 'GET', {}, '', None),
+
+        # audit
+        ('bitacora-list', 'GET', {}, '', None),
+        ('bitacora-stats', 'GET', {}, '', None),
+    ]
+
+
+def rutas_sin_medir(datos):
+    """Nombres de URL de URLS_MEDIDAS que no aparecen en peticiones()"""
+    medidas = {nombre for nombre, *_ in peticiones(datos)}
+    return sorted(
+        patron.name
+        for modulo in URLS_MEDIDAS
+        for patron in import_module(modulo).urlpatterns
+        if patron.name not in medidas
+    )
+
+
+def _ejecutar(cliente, metodo, url, cuerpo):
+    if metodo in ('GET', 'DELETE'):
+        respuesta = getattr(cliente, metodo.lower())(url)
+    elif callable(cuerpo):
+        # Archivo nuevo en cada repetición: la vista lo consume al leerlo
+        respuesta = cliente.post(url, {'archivo': cuerpo()}, format='multipart')
+    else:
+        respuesta = getattr(cliente, metodo.lower())(url, cuerpo, format='json')
+    if respuesta.streaming:
+        b''.join(respuesta.streaming_content)
+    # Las escrituras se deshacen: no cambian los datos de las siguientes mediciones
+    transaction.set_rollback(True)
+    return respuesta.status_code
+
+
+@override_settings(
+    # Las consultas de las vistas asíncronas en el hilo del test y la
+    # primaria como única base
+    CONSULTAS_PARALELAS=0,
+    DATABASE_ROUTERS=[],
+)
+def medir_endpoints(datos, repeticiones=1):
+    """
+    Mide cada petición de peticiones() con el test client.
+
+    Returns:
+        Diccionario {'MÉTODO nombre[?query]': medición} (ver shared.rendimiento.medir)
+        con el código de estado HTTP en 'estado'
+    """
+    cliente = APIClient()
+    cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(datos['director'])}")
+
+    # Los archivos que guardan las peticiones (entradas de trabajos) no se
+    # deshacen con la transacción: van a una carpeta temporal
+    with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+        return _medir_peticiones(cliente, datos, repeticiones)
+
+
+def _medir_peticiones(cliente, datos, repeticiones):
+    mediciones = {}
+    for nombre, metodo, kwargs, query, cuerpo in peticiones(datos):
+        url = reverse(nombre, kwargs=kwargs) + (f'?{query}' if query else '')
+        # Sin los pk en la etiqueta: cambian de una base a otra
+        etiqueta = f'{metodo} {nombre}' + ('?' + re.sub(r'=[0-9]+', '=<id>', query) if query else '')
+
+        def peticion():
+            # Sin cachés entre mediciones (blacklist de JWT, respuestas)
+            cache.clear()
+            return _ejecutar(cliente, metodo, url, cuerpo)
+
+        # Cada petición en su propio savepoint, abierto fuera de la medición
+        medicion = medir(peticion, repeticiones, entorno=transaction.atomic)
+        medicion['estado'] = medicion.pop('resultado')
+        mediciones[etiqueta] = medicion
+    return mediciones
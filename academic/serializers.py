@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from authentication.serializers import ProfesorListSerializer, AlumnoListSerializer
 from .models import (
     Nivel, Grupo, Materia, Aula, ProfesorMateria,
     Gestion, Trimestre, Matriculacion, Horario
@@ -16,6 +17,7 @@ class NivelSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        fuentes = {'total_grupos': [], 'total_alumnos': []}
 
     def get_total_grupos(self, obj):
         return obj.grupo_set.count()
@@ -39,6 +41,7 @@ class GrupoSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        fuentes = {'total_alumnos': [], 'nombre_completo': ['nivel__numero', 'letra']}
 
     def get_total_alumnos(self, obj):
         return obj.alumno_set.count()
@@ -82,6 +85,7 @@ class MateriaListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'codigo', 'nombre', 'descripcion', 'horas_semanales', 'total_profesores'
         ]
+        fuentes = {'total_profesores': []}
 
     def get_total_profesores(self, obj):
         return obj.profesormateria_set.count()
@@ -117,6 +121,7 @@ class AulaListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Aula
         fields = ['id', 'nombre', 'capacidad', 'horarios_count']
+        fuentes = {'horarios_count': []}
 
     def get_horarios_count(self, obj):
         return obj.horario_set.count()
@@ -146,6 +151,7 @@ class ProfesorMateriaSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandibles = {'profesor': ProfesorListSerializer}
 
 class GestionSerializer(serializers.ModelSerializer):
     """Serializer para gestiones académicas"""
@@ -160,6 +166,7 @@ class GestionSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        fuentes = {'total_trimestres': [], 'total_matriculaciones': []}
 
     def get_total_trimestres(self, obj):
         return obj.trimestre_set.count()
@@ -209,6 +216,13 @@ class MatriculacionSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandibles = {'alumno': AlumnoListSerializer}
+
+class MatriculacionMasivaSerializer(serializers.Serializer):
+    """Datos de entrada de matricular_masivo"""
+    gestion_id = serializers.IntegerField()
+    alumnos_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    fecha_matriculacion = serializers.DateField(required=False, allow_null=True)
 
 class HorarioSerializer(serializers.ModelSerializer):
     """Serializer para horarios"""
@@ -245,6 +259,14 @@ class HorarioSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        fuentes = {
+            'grupo_nombre': ['grupo__nivel__numero', 'grupo__letra'],
+            'dia_semana_nombre': ['dia_semana'],
+        }
+        expandibles = {
+            'profesor_materia': ProfesorMateriaSerializer,
+            'trimestre': TrimestreSerializer,
+        }
 
     def get_grupo_nombre(self, obj):
         return f"{obj.grupo.nivel.numero}° {obj.grupo.letra}"
@@ -1,3 +1,626 @@
-from django.test import TestCase
+import io
+import json
+import uuid
+import tempfile
+import warnings
+from decimal import Decimal
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APIClient
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.tokens import AccessToken
+from asgiref.sync import async_to_sync
+from audit.models import Bitacora
+from authentication.models import Usuario, Profesor, Alumno
+from authentication.serializers import AlumnoListSerializer
+from shared.campos import campos_solicitados, podar_queryset
+from shared.copia import insertar_nuevos
+from shared.serializacion import serializar_lista
+from shared.pruebas import ParidadSerializacionMixin
+from shared.rendimiento import ContadorConsultas, cargar_base, regresiones
+from shared.renderers import ORJSONRenderer
+from shared.trabajos import encolar
+from .serializers import (
+    HorarioSerializer, MatriculacionSerializer, MateriaListSerializer, AulaListSerializer, NivelSerializer,
+    GrupoSerializer, GestionSerializer, TrimestreSerializer, ProfesorMateriaSerializer
+)
+from .rendimiento import RUTA_BASE, sembrar_datos, medir_endpoints, rutas_sin_medir
+from .carga import ESCENARIOS, Registro, resumen
+from .busqueda import buscar_catalogo, poblar_vectores
+from .promocion import OBSERVACION_EGRESO, calcular_promocion, aplicar_promocion
+from .models import Nivel, Grupo, Aula, Materia, ProfesorMateria, Gestion, Trimestre, Horario, Matriculacion
 
-# Create your tests here.
+
+class SerializacionRapidaTests(ParidadSerializacionMixin, TestCase):
+    """La serialización de listados debe coincidir con la de los serializers DRF"""
+
+    @classmethod
+    def setUpTestData(cls):
+        nivel = Nivel.objects.create(numero=1, nombre='Primero')
+        grupo = Grupo.objects.create(nivel=nivel, letra='A')
+        aula = Aula.objects.create(nombre='A-01', capacidad=30)
+        materia = Materia.objects.create(codigo='MAT', nombre='Matemáticas', horas_semanales=4)
+
+        usuario_profesor = Usuario.objects.create_user('profesor@colegio.bo', 'clave', tipo_usuario='profesor')
+        profesor = Profesor.objects.create(
+            usuario=usuario_profesor, nombres='Ana', apellidos='Pérez', cedula_identidad='123',
+            fecha_nacimiento=date(1980, 1, 1), genero='F', fecha_contratacion=date(2020, 2, 1)
+        )
+        profesor_materia = ProfesorMateria.objects.create(profesor=profesor, materia=materia)
+
+        gestion = Gestion.objects.create(
+            anio=2025, nombre='Gestión 2025', fecha_inicio=date(2025, 2, 1), fecha_fin=date(2025, 12, 1)
+        )
+        trimestre = Trimestre.objects.create(
+            gestion=gestion, numero=1, nombre='Primer trimestre',
+            fecha_inicio=date(2025, 2, 1), fecha_fin=date(2025, 5, 1)
+        )
+
+        for dia in range(1, 6):
+            Horario.objects.create(
+                profesor_materia=profesor_materia, grupo=grupo, aula=aula, trimestre=trimestre,
+                dia_semana=dia, hora_inicio=time(8, 0), hora_fin=time(9, 30)
+            )
+
+        for numero in range(3):
+            usuario = Usuario.objects.create_user(f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno')
+            alumno = Alumno.objects.create(
+                usuario=usuario, matricula=f'2025{numero:03d}', nombres='José', apellidos=f'Núñez {numero}',
+                fecha_nacimiento=date(2012, 5, 6), genero='M', grupo=grupo
+            )
+            Matriculacion.objects.create(
+                alumno=alumno, gestion=gestion, fecha_matriculacion=date(2025, 2, 1),
+                activa=numero != 2, observaciones='Beca' if numero == 1 else ''
+            )
+
+    def test_horarios(self):
+        self.assertParidad(HorarioSerializer, Horario.objects.select_related(
+            'profesor_materia__profesor', 'profesor_materia__materia', 'grupo__nivel', 'aula', 'trimestre'
+        ))
+
+    def test_matriculaciones(self):
+        self.assertParidad(MatriculacionSerializer, Matriculacion.objects.select_related('alumno', 'gestion'))
+
+    def test_catalogos(self):
+        # Los querysets de los listados de academic.views
+        listados = [
+            (MateriaListSerializer, Materia.objects.order_by('codigo')),
+            (AulaListSerializer, Aula.objects.order_by('nombre')),
+            (NivelSerializer, Nivel.objects.order_by('numero')),
+            (GrupoSerializer, Grupo.objects.select_related('nivel').order_by('nivel__numero', 'letra')),
+            (GestionSerializer, Gestion.objects.order_by('-anio')),
+            (TrimestreSerializer, Trimestre.objects.select_related('gestion')),
+            (ProfesorMateriaSerializer, ProfesorMateria.objects.select_related('profesor', 'profesor__usuario', 'materia')),
+        ]
+        for serializer_class, queryset in listados:
+            with self.subTest(serializer_class.__name__):
+                self.assertParidad(serializer_class, queryset)
+
+    def test_fechas_en_utc(self):
+        with timezone.override('UTC'):
+            self.assertParidad(MatriculacionSerializer, Matriculacion.objects.select_related('alumno', 'gestion'))
+
+    def test_sin_select_related(self):
+        self.assertParidad(HorarioSerializer, Horario.objects.all())
+
+    def test_campos_parciales(self):
+        campos = frozenset({'id', 'grupo_nombre', 'dia_semana_nombre'})
+        queryset = podar_queryset(Horario.objects.order_by('dia_semana'), HorarioSerializer, campos)
+        esperado = [
+            {nombre: valor for nombre, valor in fila.items() if nombre in campos}
+            for fila in HorarioSerializer(Horario.objects.order_by('dia_semana'), many=True).data
+        ]
+
+        # Una sola consulta: sin JOIN a profesores, materias, aulas ni trimestres
+        with self.assertNumQueries(1):
+            self.assertEqual(serializar_lista(HorarioSerializer, queryset, campos), esperado)
+        self.assertNotIn('aulas', str(queryset.query))
+
+    def test_expandir(self):
+        queryset = podar_queryset(
+            Matriculacion.objects.order_by('id'), MatriculacionSerializer,
+            frozenset({'id', 'alumno'}), frozenset({'alumno'})
+        )
+        with self.assertNumQueries(1):
+            filas = serializar_lista(MatriculacionSerializer, queryset, frozenset({'id', 'alumno'}), {'alumno'})
+
+        matriculaciones = Matriculacion.objects.order_by('id')
+        self.assertEqual(filas, [
+            {'id': matriculacion.id, 'alumno': AlumnoListSerializer(matriculacion.alumno).data}
+            for matriculacion in matriculaciones
+        ])
+
+    def test_campos_desconocidos(self):
+        request = RequestFactory().get('/', {'fields': 'id,inexistente', 'expand': 'gestion'})
+        with self.assertRaises(ValidationError) as contexto:
+            campos_solicitados(request, MatriculacionSerializer)
+        self.assertEqual(set(contexto.exception.detail), {'fields', 'expand'})
+
+
+class BusquedaCatalogoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for codigo, nombre, descripcion in [
+            ('MAT', 'Matemáticas', 'Álgebra y geometría'),
+            ('FIS', 'Física', 'Ciencias Físicas'),
+            ('QUI', 'Química', 'Ciencias Químicas'),
+            ('EDF', 'Ed. Física', 'Deportes'),
+        ]:
+            Materia.objects.create(codigo=codigo, nombre=nombre, descripcion=descripcion, horas_semanales=3)
+
+    def buscar(self, texto):
+        queryset = buscar_catalogo(
+            Materia.objects.order_by('codigo'), texto, campos=['codigo', 'nombre', 'descripcion'], orden=['codigo']
+        )
+        return sorted(queryset.values_list('codigo', flat=True))
+
+    def test_prefijo_sin_acentos(self):
+        for texto, esperado in [
+            ('matem', ['MAT']),
+            ('ALGEBRA', ['MAT']),
+            ('fisica', ['EDF', 'FIS']),
+            ('ciencias quím', ['QUI']),
+            ('deportes fisica', ['EDF']),
+            ('biologia', []),
+        ]:
+            with self.subTest(texto=texto):
+                self.assertEqual(self.buscar(texto), esperado)
+                # Sin texto completo (otros motores) el resultado es el mismo
+                with mock.patch('academic.busqueda.usa_texto_completo', return_value=False):
+                    self.assertEqual(self.buscar(texto), esperado)
+
+    @skipUnless(connection.vendor == 'postgresql', 'tsvector solo en PostgreSQL')
+    def test_relevancia(self):
+        # El nombre pesa más que la descripción
+        codigos = buscar_catalogo(Materia.objects.all(), 'fisica', ['nombre'], orden=['codigo'])
+        self.assertEqual(list(codigos.values_list('codigo', flat=True)), ['FIS', 'EDF'])
+
+    @skipUnless(connection.vendor == 'postgresql', 'tsvector solo en PostgreSQL')
+    def test_poblar_vectores_igual_que_save(self):
+        guardados = dict(Materia.objects.values_list('pk', 'busqueda'))
+        Materia.objects.update(busqueda=None)
+
+        filas = [
+            (pk, [(codigo, 'A'), (nombre, 'A'), (descripcion, 'B')])
+            for pk, codigo, nombre, descripcion in Materia.objects.values_list('pk', 'codigo', 'nombre', 'descripcion')
+        ]
+        with self.assertNumQueries(1):
+            poblar_vectores(connection, 'materias', filas)
+        self.assertEqual(dict(Materia.objects.values_list('pk', 'busqueda')), guardados)
+
+
+class GetCondicionalTests(TestCase):
+    """Los listados responden 304 mientras los datos no cambien"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+        cls.materia = Materia.objects.create(codigo='MAT', nombre='Matemáticas', horas_semanales=4)
+        Materia.objects.create(codigo='LEN', nombre='Lenguaje', horas_semanales=4)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.director)
+
+    def test_no_modificado(self):
+        etag = self.client.get('/api/academic/materias/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/academic/materias/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cambios_invalidan(self):
+        etag = self.client.get('/api/academic/materias/')['ETag']
+        self.materia.delete()
+        response = self.client.get('/api/academic/materias/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_sin_permisos_no_hay_304(self):
+        etag = self.client.get('/api/academic/materias/')['ETag']
+        response = APIClient().get('/api/academic/materias/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 401)
+
+
+class MatriculacionMasivaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+        grupo = Grupo.objects.create(nivel=Nivel.objects.create(numero=1, nombre='Primero'), letra='A')
+        cls.gestion = Gestion.objects.create(
+            anio=2025, nombre='Gestión 2025', fecha_inicio=date(2025, 2, 1), fecha_fin=date(2025, 12, 1)
+        )
+        cls.alumnos = []
+        for numero in range(12):
+            usuario = Usuario.objects.create_user(f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno')
+            cls.alumnos.append(Alumno.objects.create(
+                usuario=usuario, matricula=f'2025{numero:03d}', nombres='Ana', apellidos=f'Rojas {numero}',
+                fecha_nacimiento=date(2012, 1, 1), genero='F', grupo=grupo
+            ))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.director)
+
+    def matricular(self, alumnos_ids, **extra):
+        return self.client.post(
+            reverse('matricular-masivo'), {'gestion_id': self.gestion.pk, 'alumnos_ids': alumnos_ids, **extra},
+            format='json'
+        )
+
+    def test_crea_y_reporta_errores(self):
+        primero, segundo, tercero = self.alumnos[:3]
+        Matriculacion.objects.create(alumno=primero, gestion=self.gestion, fecha_matriculacion=date(2025, 2, 1))
+
+        respuesta = self.matricular(
+            [primero.pk, segundo.pk, str(tercero.pk), float(segundo.pk), 999999], fecha_matriculacion='2025-02-03'
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data['matriculaciones_creadas'], 2)
+        self.assertEqual(respuesta.data['errores'], [
+            f'Alumno {primero.matricula} ya está matriculado',
+            f'Alumno {segundo.matricula} ya está matriculado',
+            'Alumno con ID 999999 no encontrado',
+        ])
+        creadas = respuesta.data['matriculaciones']
+        self.assertEqual([fila['alumno'] for fila in creadas], [segundo.pk, tercero.pk])
+        self.assertEqual(
+            [fila['id'] for fila in creadas],
+            list(Matriculacion.objects.filter(alumno__in=[segundo, tercero]).order_by('alumno').values_list('id', flat=True))
+        )
+        self.assertTrue(all(fila['fecha_matriculacion'] == '2025-02-03' for fila in creadas))
+
+    def test_ids_invalidos(self):
+        for alumnos_ids in (['abc'], [1.5], [], 'todos'):
+            with self.subTest(alumnos_ids=alumnos_ids):
+                respuesta = self.matricular(alumnos_ids)
+                self.assertEqual(respuesta.status_code, 400)
+                self.assertIn('alumnos_ids', respuesta.data)
+        self.assertFalse(Matriculacion.objects.exists())
+
+    def test_consultas_constantes(self):
+        # Las mismas consultas para 2 alumnos que para 10: inserción por conjuntos
+        consultas = []
+        for alumnos in (self.alumnos[:2], self.alumnos[2:]):
+            with CaptureQueriesContext(connection) as contexto:
+                respuesta = self.matricular([alumno.pk for alumno in alumnos])
+            self.assertEqual(respuesta.data['matriculaciones_creadas'], len(alumnos))
+            consultas.append(len(contexto))
+        self.assertEqual(consultas[0], consultas[1])
+
+    def test_concurrente_no_se_reporta_como_propia(self):
+        # Otra petición matriculó al primero después de la consulta previa
+        primero, segundo = self.alumnos[:2]
+        Matriculacion.objects.create(alumno=primero, gestion=self.gestion, fecha_matriculacion=date(2025, 2, 1))
+        nuevas = [
+            Matriculacion(alumno=alumno, gestion=self.gestion, fecha_matriculacion=date(2025, 2, 2))
+            for alumno in (primero, segundo)
+        ]
+
+        insertadas = insertar_nuevos(nuevas, clave=('alumno', 'gestion'))
+
+        self.assertEqual(insertadas, [nuevas[1]])
+        self.assertIsNone(nuevas[0].pk)
+        self.assertEqual(Matriculacion.objects.get(alumno=segundo).pk, nuevas[1].pk)
+
+
+class PromocionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.grupos = {
+            numero: Grupo.objects.create(
+                nivel=Nivel.objects.create(numero=numero, nombre=f'Nivel {numero}'), letra='A', capacidad_maxima=2
+            )
+            for numero in (1, 2, 3)
+        }
+        cls.origen = Gestion.objects.create(
+            anio=2024, nombre='Gestión 2024', fecha_inicio=date(2024, 2, 1), fecha_fin=date(2024, 11, 30)
+        )
+        cls.destino = Gestion.objects.create(
+            anio=2025, nombre='Gestión 2025', fecha_inicio=date(2025, 2, 1), fecha_fin=date(2025, 11, 30)
+        )
+        cls.alumnos = {}
+        for matricula, nivel, gestiones in [
+            ('promueve', 1, [cls.origen]),
+            ('repite', 1, [cls.origen]),
+            ('egresa', 3, [cls.origen]),
+            # Ya está en 2A para 2025 (ingresó antes de la promoción)
+            ('nuevo', 2, [cls.destino]),
+        ]:
+            usuario = Usuario.objects.create_user(f'{matricula}@colegio.bo', 'clave', tipo_usuario='alumno')
+            alumno = Alumno.objects.create(
+                usuario=usuario, matricula=matricula, nombres='Luis', apellidos=matricula,
+                fecha_nacimiento=date(2010, 1, 1), genero='M', grupo=cls.grupos[nivel]
+            )
+            for gestion in gestiones:
+                Matriculacion.objects.create(alumno=alumno, gestion=gestion, fecha_matriculacion=gestion.fecha_inicio)
+            cls.alumnos[matricula] = alumno
+
+    def promover(self):
+        plan = calcular_promocion(self.origen, self.destino, repiten=[self.alumnos['repite'].pk])
+        return plan, aplicar_promocion(plan, self.origen, self.destino, date(2025, 2, 1))
+
+    def grupo(self, matricula):
+        return Alumno.objects.get(matricula=matricula).grupo.nivel.numero
+
+    def test_promueve_repite_y_egresa(self):
+        plan, (promovidos, matriculados, egresados) = self.promover()
+
+        self.assertEqual([alumno.matricula for alumno, _, _ in plan['promociones']], ['promueve'])
+        self.assertEqual([alumno.matricula for alumno in plan['repitentes']], ['repite'])
+        self.assertEqual([alumno.matricula for alumno in plan['egresados']], ['egresa'])
+        self.assertEqual((promovidos, matriculados, egresados), (1, 2, 1))
+
+        self.assertEqual(self.grupo('promueve'), 2)
+        self.assertEqual(self.grupo('repite'), 1)
+        self.assertEqual(
+            set(Matriculacion.objects.filter(gestion=self.destino).values_list('alumno__matricula', flat=True)),
+            {'promueve', 'repite', 'nuevo'}
+        )
+        cierre = Matriculacion.objects.get(gestion=self.origen, alumno__matricula='egresa')
+        self.assertFalse(cierre.activa)
+        self.assertEqual(cierre.observaciones, OBSERVACION_EGRESO)
+
+    def test_repetir_no_cambia_nada(self):
+        self.promover()
+        plan, resultado = self.promover()
+
+        self.assertEqual(resultado, (0, 0, 0))
+        self.assertEqual(plan['promociones'] + plan['repitentes'] + plan['egresados'], [])
+        self.assertEqual(self.grupo('promueve'), 2)
+        self.assertEqual(Matriculacion.objects.filter(gestion=self.destino).count(), 3)
+
+    def test_capacidad_cuenta_a_los_ya_matriculados(self):
+        Grupo.objects.filter(pk=self.grupos[2].pk).update(capacidad_maxima=1)
+        plan = calcular_promocion(self.origen, self.destino)
+        # 'nuevo' ya está en 2A y llega 'promueve' (y 'repite', que no repite aquí)
+        self.assertEqual([(grupo.pk, cantidad) for grupo, cantidad in plan['excede_capacidad']], [(self.grupos[2].pk, 3)])
+
+    def test_matriculadas_cuenta_solo_las_insertadas(self):
+        plan = calcular_promocion(self.origen, self.destino, repiten=[self.alumnos['repite'].pk])
+        # Otra ejecución matriculó a uno entre el cálculo y la aplicación
+        Matriculacion.objects.create(
+            alumno=self.alumnos['repite'], gestion=self.destino, fecha_matriculacion=date(2025, 2, 1)
+        )
+        _, matriculados, _ = aplicar_promocion(plan, self.origen, self.destino)
+        self.assertEqual(matriculados, 1)
+
+    def test_comando(self):
+        salida = io.StringIO()
+        call_command('promover_gestion', '2024', '2025', '--repite', 'repite', '--dry-run', stdout=salida)
+        self.assertIn('repite repite, Luis: repite', salida.getvalue())
+        self.assertEqual(self.grupo('promueve'), 1)
+
+        call_command('promover_gestion', '2024', '2025', '--repite', 'repite', stdout=salida)
+        self.assertIn('1 alumnos promovidos, 2 matriculados en 2025 y 1 egresados', salida.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('promover_gestion', '2024', '2025', '--repite', 'no-existe', stdout=salida)
+
+
+class RendimientoEndpointsTests(TestCase):
+    """
+    Consultas y filas de cada endpoint contra la línea base versionada.
+    Tras una mejora (o un cambio justificado) se actualiza con
+    manage.py benchmark_endpoints --actualizar
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = sembrar_datos()
+
+    def test_todas_las_rutas_medidas(self):
+        self.assertEqual(rutas_sin_medir(self.datos), [])
+
+    def test_sin_regresiones(self):
+        mediciones = medir_endpoints(self.datos)
+        errores = [
+            f"{nombre}: respondió {medicion['estado']}"
+            for nombre, medicion in mediciones.items() if medicion['estado'] >= 400
+        ]
+        errores += regresiones(mediciones, cargar_base(RUTA_BASE))
+        self.assertEqual(errores, [], '\n'.join(errores))
+
+    def test_tiempos_opcionales(self):
+        medicion = {'ruta': {'consultas': 2, 'filas': 5, 'ms': 80.0}}
+        # La base versionada no trae ms: sin tiempos locales no se comparan
+        self.assertEqual(regresiones(medicion, {'ruta': {'consultas': 2, 'filas': 5}}, 2.0), [])
+        local = {'ruta': {'consultas': 2, 'filas': 5, 'ms': 10.0}}
+        self.assertEqual(regresiones(medicion, local), [])
+        self.assertEqual(regresiones(medicion, local, 2.0), ['ruta: 80.0 ms (base 10.0 ms)'])
+
+    def test_filas_sin_medir_en_sqlite(self):
+        # SQLite informa rowcount -1 en todo SELECT: filas queda en None
+        contador = ContadorConsultas()
+        for vendor, rowcount in (('postgresql', 3), ('sqlite', -1)):
+            contexto = {'cursor': mock.Mock(rowcount=rowcount), 'connection': mock.Mock(vendor=vendor)}
+            contador(lambda *args: None, 'SELECT 1', None, False, contexto)
+        self.assertIsNone(contador.filas)
+
+        base = {'ruta': {'consultas': 2, 'filas': 5}}
+        self.assertEqual(regresiones({'ruta': {'consultas': 2, 'filas': None, 'ms': 1}}, base), [])
+        self.assertEqual(
+            regresiones({'ruta': {'consultas': 2, 'filas': 6, 'ms': 1}}, base), ['ruta: 6 filas (base 5)']
+        )
+
+
+class RenderJSONTests(SimpleTestCase):
+    """ORJSONRenderer contra el JSONRenderer de DRF"""
+
+    CARGAS = {
+        'listado': [
+            {'id': 1, 'codigo': 'MAT', 'nombre': 'Matemáticas', 'horas_semanales': 4, 'activa': True, 'descripcion': None},
+            {'id': 2, 'codigo': 'LEN', 'nombre': 'Lenguaje – «Ñandú»', 'horas_semanales': 3, 'activa': False, 'descripcion': ''},
+        ],
+        'paginado': {'count': 2, 'next': None, 'previous': 'http://testserver/api/?page=1', 'results': []},
+        'fechas': {
+            'utc': datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'offset': datetime(2024, 5, 1, 8, 30, tzinfo=dt_timezone(timedelta(hours=-4))),
+            'fecha': date(2024, 5, 1),
+            'hora': time(7, 45),
+        },
+        'tipos_drf': {'decimal': Decimal('87.50'), 'lazy': gettext_lazy('Ya existe'), 'uuid': uuid.UUID(int=1)},
+        'claves_no_texto': {1: 'uno', 2: {'dos': [1, 2]}},
+        'separadores_js': {'texto': 'línea\u2028párrafo\u2029fin'},
+        'entero_grande': {'valor': 2 ** 70},
+    }
+
+    def test_mismos_bytes(self):
+        for nombre, datos in self.CARGAS.items():
+            with self.subTest(nombre):
+                self.assertEqual(ORJSONRenderer().render(datos), JSONRenderer().render(datos))
+                self.assertEqual(
+                    ORJSONRenderer().render(datos, 'application/json; indent=2'),
+                    JSONRenderer().render(datos, 'application/json; indent=2')
+                )
+
+    def test_floats(self):
+        # Mismo valor al parsear; solo cambia cómo se escribe el exponente
+        datos = {'valores': [0.1, 2.5, -0.0, 123456789.125, 1e16, 1e-7, 1.5e300]}
+
+        rapido, estandar = ORJSONRenderer().render(datos), JSONRenderer().render(datos)
+
+        self.assertEqual(json.loads(rapido), json.loads(estandar))
+        self.assertIn(b'1e16', rapido)
+        self.assertIn(b'1e+16', estandar)
+
+
+@override_settings(CONSULTAS_PARALELAS=0)
+class VistasAsincronasTests(TestCase):
+    """api_async, academic_stats y bitacora_stats (dashboard_director en authentication)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+        cls.profesor = Usuario.objects.create_user('profesor@colegio.bo', 'clave', tipo_usuario='profesor')
+        Materia.objects.create(codigo='MAT', nombre='Matemáticas', horas_semanales=4)
+        Materia.objects.create(codigo='LEN', nombre='Lenguaje', horas_semanales=3)
+        Aula.objects.create(nombre='A-01', capacidad=30)
+        Bitacora.objects.bulk_create(
+            Bitacora(usuario=cls.director, tipo_accion='LOGIN', ip='127.0.0.1') for _ in range(3)
+        )
+
+    def _get(self, nombre, usuario=None, **extra):
+        if usuario is not None:
+            extra['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(usuario)}'
+        return self.client.get(reverse(nombre), **extra)
+
+    def test_autenticacion_y_permisos(self):
+        sin_token = self._get('academic-stats')
+        self.assertEqual(sin_token.status_code, 401)
+        self.assertIn('Bearer', sin_token['WWW-Authenticate'])
+
+        self.assertEqual(self._get('academic-stats', HTTP_AUTHORIZATION='Bearer roto').status_code, 401)
+        self.assertEqual(self._get('academic-stats', self.profesor).status_code, 403)
+
+        no_permitido = self.client.post(
+            reverse('academic-stats'), HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.director)}'
+        )
+        self.assertEqual(no_permitido.status_code, 405)
+
+    def test_academic_stats(self):
+        respuesta = self._get('academic-stats', self.director)
+
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual(datos['estadisticas']['total_materias'], 2)
+        self.assertEqual(datos['estadisticas']['aulas_disponibles'], 1)
+        self.assertEqual(len(datos['materias_mas_profesores']), 2)
+
+    def test_bitacora_stats(self):
+        self.assertEqual(self._get('bitacora-stats', self.profesor).status_code, 403)
+
+        datos = self._get('bitacora-stats', self.director).json()
+        self.assertEqual(datos['total_acciones'], 3)
+        self.assertEqual(datos['acciones_por_tipo'], [{'tipo_accion': 'LOGIN', 'count': 3}])
+        self.assertEqual(datos['usuarios_mas_activos'][0]['usuario__email'], 'director@colegio.bo')
+
+
+class StreamingASGITests(TestCase):
+    """Exportaciones y descargas servidas por ASGI sin armar la respuesta en memoria"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+        grupo = Grupo.objects.create(nivel=Nivel.objects.create(numero=1, nombre='Primero'), letra='A')
+        cls.gestion = Gestion.objects.create(
+            anio=2025, nombre='Gestión 2025', fecha_inicio=date(2025, 2, 1), fecha_fin=date(2025, 12, 1)
+        )
+        for numero in range(3):
+            alumno = Alumno.objects.create(
+                usuario=Usuario.objects.create_user(f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno'),
+                matricula=f'2025{numero:03d}', nombres='José', apellidos=f'Núñez {numero}',
+                fecha_nacimiento=date(2012, 5, 6), genero='M', grupo=grupo
+            )
+            Matriculacion.objects.create(alumno=alumno, gestion=cls.gestion, fecha_matriculacion=date(2025, 2, 1))
+
+    def setUp(self):
+        self.cabeceras = {'Authorization': f'Bearer {AccessToken.for_user(self.director)}'}
+
+    def _descargar(self, url):
+        async def descargar():
+            respuesta = await self.async_client.get(url, headers=self.cabeceras)
+            return respuesta, b''.join([parte async for parte in respuesta.streaming_content])
+
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter('always')
+            respuesta, contenido = async_to_sync(descargar)()
+        self.assertEqual([str(aviso.message) for aviso in avisos if 'iterators' in str(aviso.message)], [])
+        self.assertTrue(respuesta.is_async)
+        return respuesta, contenido
+
+    def test_exportacion_csv(self):
+        respuesta, contenido = self._descargar(
+            reverse('exportar-matriculaciones') + f'?gestion={self.gestion.pk}'
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        filas = contenido.decode('utf-8-sig').splitlines()
+        self.assertEqual(len(filas), 4)
+        self.assertTrue(filas[1].startswith('2025000,Núñez 0,José'))
+
+    def test_descarga_de_trabajo(self):
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            trabajo = encolar('boletines', self.director)
+            trabajo.archivo.save('boletines.zip', io.BytesIO(b'x' * 100_000))
+
+            respuesta, contenido = self._descargar(reverse('trabajo-archivo', kwargs={'pk': trabajo.pk}))
+
+        self.assertEqual(respuesta['Content-Length'], '100000')
+        self.assertEqual(contenido, b'x' * 100_000)
+
+
+class PruebaCargaTests(SimpleTestCase):
+    def test_escenarios_validos(self):
+        valores = {'gestion': 1, 'trimestre': 1, 'grupo': 1, 'pagina': 1}
+        for rol, escenarios in ESCENARIOS.items():
+            for nombre, peso, pasos in escenarios:
+                self.assertGreater(peso, 0, f'{rol}/{nombre}')
+                for metodo, url, query in pasos:
+                    reverse(url)
+                    query.format(**valores)
+
+    def test_resumen(self):
+        registro = Registro()
+        for ms in range(1, 101):
+            registro.agregar('GET a', ms, True)
+        registro.agregar('GET a', 5000, False)
+        registro.agregar('POST b', 10, True)
+
+        filas = {fila['endpoint']: fila for fila in resumen(registro, duracion=10)}
+
+        self.assertEqual(filas['GET a']['errores'], 1)
+        self.assertAlmostEqual(filas['GET a']['p50'], 50.5)
+        self.assertAlmostEqual(filas['GET a']['p99'], 99.01)
+        self.assertEqual(filas['POST b']['p95'], 10)
+        self.assertEqual(filas['TOTAL']['peticiones'], 102)
+        self.assertAlmostEqual(filas['TOTAL']['rps'], 10.2)
@@ -27,6 +27,7 @@ urlpatterns = [
     path('matriculaciones/', views.matriculacion_list_create, name='matriculacion-list-create'),
     path('matriculaciones/<int:pk>/', views.matriculacion_detail, name='matriculacion-detail'),
     path('matriculaciones/masivo/', views.matricular_masivo, name='matricular-masivo'),
+    path('matriculaciones/exportar/', views.exportar_matriculaciones, name='exportar-matriculaciones'),
 
     # Horarios
     path('horarios/', views.horario_list_create, name='horario-list-create'),
@@ -1,21 +1,32 @@
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status
+from django.db import transaction
 from django.db.models import Count
-from authentication.models import Alumno
+from authentication.models import Usuario, Profesor, Alumno
 from shared.permissions import IsDirector
+from shared.serializacion import serializar_lista
+from shared.campos import campos_solicitados, podar_queryset
+from shared.condicional import get_condicional
+from shared.routers import lectura_en_replica
+from shared.asincrono import api_async, en_paralelo, respuesta_api
 from django.core.paginator import Paginator
 from rest_framework.response import Response
+from .busqueda import buscar_catalogo
+from shared.copia import insertar_nuevos
+from shared.exportacion import respuesta_csv
 from audit.utils import registrar_accion_bitacora
 from rest_framework.decorators import api_view, permission_classes
 from .serializers import (
     MateriaSerializer, MateriaListSerializer, AulaSerializer, AulaListSerializer, NivelSerializer, GrupoSerializer,
-    GestionSerializer, ProfesorMateriaSerializer, HorarioSerializer, MatriculacionSerializer, TrimestreSerializer
+    GestionSerializer, ProfesorMateriaSerializer, HorarioSerializer, MatriculacionSerializer, TrimestreSerializer,
+    MatriculacionMasivaSerializer
 )
 from .models import Materia, Aula, Nivel, Grupo, Gestion, ProfesorMateria, Horario, Matriculacion, Trimestre
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Materia, ProfesorMateria)
 def materia_list_create(request):
     """
     GET: Listar materias con paginación y filtros
@@ -31,26 +42,28 @@ def materia_list_create(request):
         queryset = Materia.objects.all().order_by('codigo')
 
         if search:
-            queryset = queryset.filter(
-                Q(codigo__icontains=search) |
-                Q(nombre__icontains=search) |
-                Q(descripcion__icontains=search)
+            queryset = buscar_catalogo(
+                queryset, search,
+                campos=['codigo', 'nombre', 'descripcion'],
+                orden=['codigo']
             )
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, MateriaListSerializer)
+        queryset = podar_queryset(queryset, MateriaListSerializer, campos, expandir)
+
         # Paginar
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
 
         # Serializar
-        serializer = MateriaListSerializer(page_obj.object_list, many=True)
-
         return Response({
             'count': paginator.count,
             'total_pages': paginator.num_pages,
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(MateriaListSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -73,6 +86,7 @@ def materia_list_create(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
+@get_condicional(Materia, ProfesorMateria, Profesor, Usuario)
 def materia_detail(request, pk):
     """
     GET: Ver detalle de materia
@@ -138,6 +152,7 @@ def materia_detail(request, pk):
 # CRUD DE AULAS
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Aula, Horario)
 def aula_list_create(request):
     """
     GET: Listar aulas con paginación y filtros
@@ -155,9 +170,10 @@ def aula_list_create(request):
         queryset = Aula.objects.all().order_by('nombre')
 
         if search:
-            queryset = queryset.filter(
-                Q(nombre__icontains=search) |
-                Q(descripcion__icontains=search)
+            queryset = buscar_catalogo(
+                queryset, search,
+                campos=['nombre', 'descripcion'],
+                orden=['nombre']
             )
 
         if capacidad_min:
@@ -166,20 +182,22 @@ def aula_list_create(request):
         if capacidad_max:
             queryset = queryset.filter(capacidad__lte=capacidad_max)
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, AulaListSerializer)
+        queryset = podar_queryset(queryset, AulaListSerializer, campos, expandir)
+
         # Paginar
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
 
         # Serializar
-        serializer = AulaListSerializer(page_obj.object_list, many=True)
-
         return Response({
             'count': paginator.count,
             'total_pages': paginator.num_pages,
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(AulaListSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -202,6 +220,7 @@ def aula_list_create(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
+@get_condicional(Aula, Horario)
 def aula_detail(request, pk):
     """
     GET: Ver detalle de aula
@@ -266,12 +285,13 @@ def aula_detail(request, pk):
 # CRUD ADICIONALES (Niveles y Grupos para completitud)
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Nivel, Grupo, Alumno)
 def nivel_list_create(request):
     """Listar y crear niveles académicos"""
     if request.method == 'GET':
-        niveles = Nivel.objects.all().order_by('numero')
-        serializer = NivelSerializer(niveles, many=True)
-        return Response(serializer.data)
+        campos, expandir = campos_solicitados(request, NivelSerializer)
+        niveles = podar_queryset(Nivel.objects.all().order_by('numero'), NivelSerializer, campos, expandir)
+        return Response(serializar_lista(NivelSerializer, niveles, campos, expandir))
 
     elif request.method == 'POST':
         serializer = NivelSerializer(data=request.data)
@@ -292,6 +312,7 @@ def nivel_list_create(request):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Grupo, Nivel, Alumno)
 def grupo_list_create(request):
     """Listar y crear grupos"""
     if request.method == 'GET':
@@ -301,8 +322,11 @@ def grupo_list_create(request):
         if nivel:
             queryset = queryset.filter(nivel__numero=nivel)
 
-        serializer = GrupoSerializer(queryset, many=True)
-        return Response(serializer.data)
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, GrupoSerializer)
+        queryset = podar_queryset(queryset, GrupoSerializer, campos, expandir)
+
+        return Response(serializar_lista(GrupoSerializer, queryset, campos, expandir))
 
     elif request.method == 'POST':
         serializer = GrupoSerializer(data=request.data)
@@ -322,31 +346,33 @@ def grupo_list_create(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # Vista de estadísticas académicas
-@api_view(['GET'])
-@permission_classes([IsDirector])
-def academic_stats(request):
-    """Estadísticas académicas para dashboard"""
-    stats = {
-        'total_materias': Materia.objects.count(),
-        'total_aulas': Aula.objects.count(),
-        'total_niveles': Nivel.objects.count(),
-        'total_grupos': Grupo.objects.count(),
-        'materias_sin_profesor': Materia.objects.filter(profesormateria__isnull=True).count(),
-        'aulas_disponibles': Aula.objects.filter(horario__isnull=True).count(),
-    }
-
-    # Materias por número de profesores
-    materias_populares = Materia.objects.annotate(
-        num_profesores=Count('profesormateria')
-    ).order_by('-num_profesores')[:5]
+@api_async(IsDirector)
+@lectura_en_replica
+async def academic_stats(request):
+    """Estadísticas académicas para dashboard (consultas independientes en paralelo)"""
+    stats = await en_paralelo(
+        total_materias=Materia.objects.count,
+        total_aulas=Aula.objects.count,
+        total_niveles=Nivel.objects.count,
+        total_grupos=Grupo.objects.count,
+        materias_sin_profesor=Materia.objects.filter(profesormateria__isnull=True).count,
+        aulas_disponibles=Aula.objects.filter(horario__isnull=True).count,
+        # Materias por número de profesores
+        materias_mas_profesores=lambda: MateriaListSerializer(
+            Materia.objects.annotate(num_profesores=Count('profesormateria')).order_by('-num_profesores')[:5],
+            many=True
+        ).data,
+    )
 
-    return Response({
+    materias_populares = stats.pop('materias_mas_profesores')
+    return respuesta_api({
         'estadisticas': stats,
-        'materias_mas_profesores': MateriaListSerializer(materias_populares, many=True).data,
+        'materias_mas_profesores': materias_populares,
     })
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Gestion, Trimestre, Matriculacion)
 def gestion_list_create(request):
     """
     GET: Listar gestiones académicas
@@ -363,9 +389,12 @@ def gestion_list_create(request):
             activa_bool = activa.lower() == 'true'
             queryset = queryset.filter(activa=activa_bool)
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, GestionSerializer)
+        queryset = podar_queryset(queryset, GestionSerializer, campos, expandir)
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
-        serializer = GestionSerializer(page_obj.object_list, many=True)
 
         return Response({
             'count': paginator.count,
@@ -373,7 +402,7 @@ def gestion_list_create(request):
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(GestionSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -381,7 +410,7 @@ def gestion_list_create(request):
         if serializer.is_valid():
             # Solo una gestión puede estar activa
             if request.data.get('activa', False):
-                Gestion.objects.filter(activa=True).update(activa=False)
+                Gestion.objects.filter(activa=True).update(activa=False, updated_at=timezone.now())
 
             gestion = serializer.save()
 
@@ -399,6 +428,7 @@ def gestion_list_create(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
+@get_condicional(Gestion, Trimestre, Matriculacion)
 def gestion_detail(request, pk):
     """
     GET: Ver detalle de gestión
@@ -424,7 +454,7 @@ def gestion_detail(request, pk):
         if serializer.is_valid():
             # Solo una gestión puede estar activa
             if request.data.get('activa', False):
-                Gestion.objects.exclude(pk=pk).update(activa=False)
+                Gestion.objects.filter(activa=True).exclude(pk=pk).update(activa=False, updated_at=timezone.now())
 
             gestion_updated = serializer.save()
 
@@ -473,7 +503,7 @@ def activar_gestion(request, pk):
         )
 
     # Desactivar todas las demás
-    Gestion.objects.update(activa=False)
+    Gestion.objects.filter(activa=True).update(activa=False, updated_at=timezone.now())
 
     # Activar la seleccionada
     gestion.activa = True
@@ -492,6 +522,7 @@ def activar_gestion(request, pk):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(ProfesorMateria, Profesor, Materia)
 def profesor_materia_list_create(request):
     """
     GET: Listar asignaciones profesor-materia
@@ -512,9 +543,12 @@ def profesor_materia_list_create(request):
         if materia_id:
             queryset = queryset.filter(materia_id=materia_id)
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, ProfesorMateriaSerializer)
+        queryset = podar_queryset(queryset, ProfesorMateriaSerializer, campos, expandir)
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
-        serializer = ProfesorMateriaSerializer(page_obj.object_list, many=True)
 
         return Response({
             'count': paginator.count,
@@ -522,7 +556,7 @@ def profesor_materia_list_create(request):
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(ProfesorMateriaSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -581,6 +615,7 @@ def profesor_materia_delete(request, pk):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Trimestre, Gestion)
 def trimestre_list_create(request):
     """
     GET: Listar trimestres
@@ -594,8 +629,11 @@ def trimestre_list_create(request):
         if gestion_id:
             queryset = queryset.filter(gestion_id=gestion_id)
 
-        serializer = TrimestreSerializer(queryset, many=True)
-        return Response(serializer.data)
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, TrimestreSerializer)
+        queryset = podar_queryset(queryset, TrimestreSerializer, campos, expandir)
+
+        return Response(serializar_lista(TrimestreSerializer, queryset, campos, expandir))
 
     elif request.method == 'POST':
         serializer = TrimestreSerializer(data=request.data)
@@ -616,6 +654,7 @@ def trimestre_list_create(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
+@get_condicional(Trimestre, Gestion)
 def trimestre_detail(request, pk):
     """CRUD individual de trimestres"""
     try:
@@ -672,6 +711,7 @@ def trimestre_detail(request, pk):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Matriculacion, Alumno, Usuario, Grupo, Nivel, Gestion)
 def matriculacion_list_create(request):
     """
     GET: Listar matriculaciones
@@ -702,17 +742,19 @@ def matriculacion_list_create(request):
                 Q(alumno__matricula__icontains=search)
             )
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, MatriculacionSerializer)
+        queryset = podar_queryset(queryset, MatriculacionSerializer, campos, expandir)
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
-        serializer = MatriculacionSerializer(page_obj.object_list, many=True)
-
         return Response({
             'count': paginator.count,
             'total_pages': paginator.num_pages,
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(MatriculacionSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -734,6 +776,7 @@ def matriculacion_list_create(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
+@get_condicional(Matriculacion, Alumno, Gestion)
 def matriculacion_detail(request, pk):
     """CRUD individual de matriculaciones"""
     try:
@@ -787,45 +830,57 @@ def matriculacion_detail(request, pk):
 @permission_classes([IsDirector])
 def matricular_masivo(request):
     """Matricular múltiples alumnos a una gestión"""
-    gestion_id = request.data.get('gestion_id')
-    alumnos_ids = request.data.get('alumnos_ids', [])
-    fecha_matriculacion = request.data.get('fecha_matriculacion')
-
-    if not gestion_id or not alumnos_ids:
-        return Response(
-            {'error': 'gestion_id y alumnos_ids son requeridos'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    entrada = MatriculacionMasivaSerializer(data=request.data)
+    if not entrada.is_valid():
+        return Response(entrada.errors, status=status.HTTP_400_BAD_REQUEST)
+    datos = entrada.validated_data
 
     try:
-        gestion = Gestion.objects.get(pk=gestion_id)
+        gestion = Gestion.objects.get(pk=datos['gestion_id'])
     except Gestion.DoesNotExist:
         return Response(
             {'error': 'Gestión no encontrada'},
             status=status.HTTP_404_NOT_FOUND
         )
 
-    matriculaciones_creadas = []
-    errores = []
+    fecha_matriculacion = datos.get('fecha_matriculacion') or timezone.now().date()
+
+    # Alumnos y matriculaciones existentes en una consulta cada uno
+    alumnos = Alumno.objects.filter(
+        pk__in=datos['alumnos_ids']
+    ).only('matricula', 'nombres', 'apellidos').in_bulk()
+
+    ya_matriculados = set(
+        Matriculacion.objects.filter(
+            gestion=gestion, alumno_id__in=alumnos.keys()
+        ).values_list('alumno_id', flat=True)
+    )
 
-    for alumno_id in alumnos_ids:
-        try:
-            alumno = Alumno.objects.get(pk=alumno_id)
+    por_matricular = {}
+    errores = []
 
-            # Verificar si ya está matriculado
-            if Matriculacion.objects.filter(alumno=alumno, gestion=gestion).exists():
-                errores.append(f'Alumno {alumno.matricula} ya está matriculado')
-                continue
+    for alumno_id in datos['alumnos_ids']:
+        alumno = alumnos.get(alumno_id)
 
-            matriculacion = Matriculacion.objects.create(
+        if alumno is None:
+            errores.append(f'Alumno con ID {alumno_id} no encontrado')
+        elif alumno.pk in ya_matriculados or alumno.pk in por_matricular:
+            errores.append(f'Alumno {alumno.matricula} ya está matriculado')
+        else:
+            por_matricular[alumno.pk] = Matriculacion(
                 alumno=alumno,
                 gestion=gestion,
-                fecha_matriculacion=fecha_matriculacion or timezone.now().date()
+                fecha_matriculacion=fecha_matriculacion
             )
-            matriculaciones_creadas.append(matriculacion)
 
-        except Alumno.DoesNotExist:
-            errores.append(f'Alumno con ID {alumno_id} no encontrado')
+    # RETURNING: solo las filas que insertó esta petición; las que otra
+    # matriculó mientras tanto quedan como conflicto
+    with transaction.atomic():
+        matriculaciones_creadas = insertar_nuevos(por_matricular.values(), clave=('alumno', 'gestion'))
+
+    for matriculacion in por_matricular.values():
+        if matriculacion.pk is None:
+            errores.append(f'Alumno {matriculacion.alumno.matricula} ya está matriculado')
 
     registrar_accion_bitacora(
         request.user,
@@ -833,14 +888,44 @@ def matricular_masivo(request):
         request
     )
 
+    # Serializar desde memoria (alumno y gestión ya cargados)
     return Response({
         'matriculaciones_creadas': len(matriculaciones_creadas),
         'errores': errores,
-        'matriculaciones': MatriculacionSerializer(matriculaciones_creadas, many=True).data
+        'matriculaciones': serializar_lista(MatriculacionSerializer, matriculaciones_creadas)
     })
 
+@api_view(['GET'])
+@permission_classes([IsDirector])
+def exportar_matriculaciones(request):
+    """Exportar a CSV las matriculaciones de una gestión (?gestion=<id>)"""
+    try:
+        gestion = Gestion.objects.get(pk=request.GET.get('gestion'))
+    except (Gestion.DoesNotExist, ValueError, TypeError):
+        return Response(
+            {'error': 'Gestión no encontrada'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    queryset = Matriculacion.objects.filter(gestion=gestion).order_by(
+        'alumno__grupo__nivel__numero', 'alumno__grupo__letra', 'alumno__apellidos', 'alumno__nombres'
+    ).values_list(
+        'alumno__matricula', 'alumno__apellidos', 'alumno__nombres', 'alumno__usuario__email',
+        'alumno__grupo__nivel__numero', 'alumno__grupo__letra',
+        'fecha_matriculacion', 'activa', 'observaciones'
+    )
+
+    return respuesta_csv(
+        request,
+        f'matriculaciones_{gestion.anio}.csv',
+        ['matricula', 'apellidos', 'nombres', 'email', 'nivel', 'grupo',
+         'fecha_matriculacion', 'activa', 'observaciones'],
+        queryset
+    )
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsDirector])
+@get_condicional(Horario, ProfesorMateria, Profesor, Materia, Grupo, Nivel, Aula, Trimestre)
 def horario_list_create(request):
     """
     GET: Listar horarios
@@ -870,17 +955,19 @@ def horario_list_create(request):
         if dia_semana:
             queryset = queryset.filter(dia_semana=dia_semana)
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, HorarioSerializer)
+        queryset = podar_queryset(queryset, HorarioSerializer, campos, expandir)
+
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
-        serializer = HorarioSerializer(page_obj.object_list, many=True)
-
         return Response({
             'count': paginator.count,
             'total_pages': paginator.num_pages,
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(HorarioSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -910,6 +997,7 @@ def horario_list_create(request):
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
+@get_condicional(Horario, ProfesorMateria, Profesor, Materia, Grupo, Nivel, Aula, Trimestre)
 def horario_detail(request, pk):
     """CRUD individual de horarios"""
     try:
@@ -1021,6 +1109,7 @@ def validar_conflictos_horario(data, excluir_id=None):
 
 @api_view(['GET'])
 @permission_classes([IsDirector])
+@get_condicional(Horario, ProfesorMateria, Profesor, Materia, Grupo, Nivel, Aula, Trimestre)
 def horario_vista_semanal(request):
     """Vista de horarios en formato de grid semanal"""
     trimestre_id = request.GET.get('trimestre')
@@ -1,3 +1,27 @@
-from django.test import TestCase
+from django.test import TestCase, RequestFactory
+from authentication.models import Usuario
+from .models import Bitacora
+from .utils import registrar_accion_bitacora
 
-# Create your tests here.
+
+class RegistrarAccionBitacoraTests(TestCase):
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user('bitacora@colegio.bo', 'clave')
+        self.request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+
+    def test_registra_accion_e_ip(self):
+        registrar_accion_bitacora(self.usuario, 'LOGIN', self.request)
+        registro = Bitacora.objects.get()
+        self.assertEqual((registro.usuario, registro.tipo_accion, registro.ip), (self.usuario, 'LOGIN', '10.0.0.1'))
+
+    def test_recorta_tipo_accion_largo_con_aviso(self):
+        # 'IMPORTAR_ALUMNOS: trabajo 12345' supera los 30 caracteres de la columna
+        with self.assertLogs('audit.utils', 'WARNING') as registro:
+            registrar_accion_bitacora(self.usuario, 'IMPORTAR_ALUMNOS: trabajo 1234567890', self.request)
+        self.assertEqual(Bitacora.objects.get().tipo_accion, 'IMPORTAR_ALUMNOS: trabajo 1234')
+        self.assertIn('IMPORTAR_ALUMNOS: trabajo 1234567890', registro.output[0])
+
+    def test_sin_aviso_si_entra(self):
+        with self.assertNoLogs('audit.utils'):
+            registrar_accion_bitacora(self.usuario, 'LOGOUT', self.request)
@@ -1,5 +1,8 @@
+import logging
 from .models import Bitacora
 
+logger = logging.getLogger(__name__)
+
 
 def registrar_accion_bitacora(usuario, tipo_accion, request):
     """
@@ -13,10 +16,16 @@ def registrar_accion_bitacora(usuario, tipo_accion, request):
     # Obtener IP del cliente
     ip = get_client_ip(request)
 
+    # Una acción con nombres largos no debe hacer fallar la vista: se recorta
+    # al largo de la columna, dejando el texto completo en el log
+    largo = Bitacora._meta.get_field('tipo_accion').max_length
+    if len(tipo_accion) > largo:
+        logger.warning('Acción de bitácora recortada a %s caracteres: %r (usuario %s)', largo, tipo_accion, usuario.pk)
+
     # Crear registro en bitácora
     Bitacora.objects.create(
         usuario=usuario,
-        tipo_accion=tipo_accion,
+        tipo_accion=tipo_accion[:largo],
         ip=ip
     )
 
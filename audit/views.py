@@ -1,4 +1,6 @@
 from .models import Bitacora
+from shared.routers import lectura_en_replica
+from shared.asincrono import api_async, en_paralelo, respuesta_api
 from rest_framework import status
 from django.core.paginator import Paginator
 from .serializers import BitacoraSerializer
@@ -49,15 +51,15 @@ def bitacora_list(request):
         'results': serializer.data
     }, status=status.HTTP_200_OK)
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def bitacora_stats(request):
+@api_async(IsAuthenticated)
+@lectura_en_replica
+async def bitacora_stats(request):
     """
     Estadísticas de la bitácora
     Solo directores pueden acceder
     """
     if request.user.tipo_usuario != 'director':
-        return Response(
+        return respuesta_api(
             {'error': 'No tienes permisos para acceder a las estadísticas'},
             status=status.HTTP_403_FORBIDDEN
         )
@@ -65,30 +67,25 @@ def bitacora_stats(request):
     from django.db.models import Count
     from datetime import datetime, timedelta
 
-    # Estadísticas generales
-    total_acciones = Bitacora.objects.count()
-
-    # Acciones por tipo
-    acciones_por_tipo = Bitacora.objects.values('tipo_accion').annotate(
-        count=Count('tipo_accion')
-    ).order_by('-count')
-
     # Acciones en los últimos 7 días
     fecha_limite = datetime.now() - timedelta(days=7)
-    acciones_ultimos_7_dias = Bitacora.objects.filter(
-        fecha_hora__gte=fecha_limite
-    ).count()
 
-    # Usuarios más activos
-    usuarios_activos = Bitacora.objects.values(
-        'usuario__email', 'usuario__tipo_usuario'
-    ).annotate(
-        count=Count('usuario')
-    ).order_by('-count')[:10]
+    stats = await en_paralelo(
+        # Estadísticas generales
+        total_acciones=Bitacora.objects.count,
+        # Acciones por tipo
+        acciones_por_tipo=lambda: list(Bitacora.objects.values('tipo_accion').annotate(
+            count=Count('tipo_accion')
+        ).order_by('-count')),
+        acciones_ultimos_7_dias=Bitacora.objects.filter(
+            fecha_hora__gte=fecha_limite
+        ).count,
+        # Usuarios más activos
+        usuarios_mas_activos=lambda: list(Bitacora.objects.values(
+            'usuario__email', 'usuario__tipo_usuario'
+        ).annotate(
+            count=Count('usuario')
+        ).order_by('-count')[:10]),
+    )
 
-    return Response({
-        'total_acciones': total_acciones,
-        'acciones_por_tipo': list(acciones_por_tipo),
-        'acciones_ultimos_7_dias': acciones_ultimos_7_dias,
-        'usuarios_mas_activos': list(usuarios_activos)
-    }, status=status.HTTP_200_OK)
+    return respuesta_api(stats, status=status.HTTP_200_OK)
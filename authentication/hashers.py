@@ -0,0 +1,32 @@
+from django.conf import settings
+from shared.procesos import mapear_en_procesos
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, make_password
+
+
+class PBKDF2RapidoPasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 con pocas iteraciones para tests y datos de prueba sembrados.
+    Usa un nombre de algoritmo propio para que las contraseñas se re-hasheen
+    al perfil seguro en el primer login. No usar en producción.
+    """
+    algorithm = 'pbkdf2_sha256_rapido'
+    iterations = 1000
+
+
+def hashear_passwords(passwords, procesos=None):
+    """
+    Hashea una lista de contraseñas con el hasher activo (PASSWORD_HASHERS).
+
+    El hashing es CPU-bound, así que con más de un proceso se reparte en un
+    pool de procesos en lugar de hilos.
+
+    Args:
+        passwords: Lista de contraseñas en texto plano
+        procesos: Procesos del pool (por defecto PASSWORD_HASH_PROCESOS)
+
+    Returns:
+        Lista de hashes en el mismo orden
+    """
+    procesos = procesos or settings.PASSWORD_HASH_PROCESOS
+    chunksize = max(1, len(passwords) // (procesos * 4))
+    return list(mapear_en_procesos(make_password, passwords, procesos, chunksize))
@@ -0,0 +1,241 @@
+import io
+import csv
+import zipfile
+from datetime import datetime
+from itertools import islice, chain
+from academic.models import Grupo
+from django.db import transaction, IntegrityError
+from shared.diferido import importar_diferido
+from shared.trabajos import ErrorTrabajo
+from .hashers import hashear_passwords
+from .models import Usuario, Alumno, TipoUsuario
+from .serializers import AlumnoImportacionSerializer
+
+try:
+    # Solo la importación de XLSX lo usa: se carga con el primer archivo
+    openpyxl = importar_diferido('openpyxl')
+except ImportError:
+    openpyxl = None
+
+
+class XLSXNoDisponible(Exception):
+    """openpyxl no está instalado (o no carga): no se pueden leer archivos XLSX"""
+
+    def __init__(self):
+        super().__init__('El servidor no admite archivos XLSX (falta openpyxl); suba el archivo como CSV')
+
+
+# Errores de un archivo ilegible: mal codificado, CSV roto, XLSX corrupto o
+# XLSX sin openpyxl en el servidor
+ERRORES_LECTURA = (ValueError, UnicodeDecodeError, csv.Error, zipfile.BadZipFile, XLSXNoDisponible)
+
+
+def leer_filas(archivo, nombre):
+    """
+    Lee un archivo CSV o XLSX fila a fila sin cargarlo completo en memoria.
+
+    Args:
+        archivo: Archivo binario (subido o abierto con 'rb')
+        nombre: Nombre del archivo, para distinguir el formato por extensión
+
+    Returns:
+        Generador de diccionarios {columna: valor}
+    """
+    if nombre.lower().endswith('.xlsx'):
+        return _leer_xlsx(archivo)
+    return _leer_csv(archivo)
+
+
+def _encabezado(columnas):
+    return [str(columna or '').strip().lower() for columna in columnas]
+
+
+def _leer_csv(archivo):
+    texto = io.TextIOWrapper(getattr(archivo, 'file', archivo), encoding='utf-8-sig', newline='')
+    primera = texto.readline()
+    if not primera:
+        return
+
+    # Excel en español exporta con ';'
+    delimitador = ';' if primera.count(';') > primera.count(',') else ','
+    lector = csv.reader(chain([primera], texto), delimiter=delimitador)
+    encabezado = _encabezado(next(lector))
+
+    for valores in lector:
+        if any(valor.strip() for valor in valores):
+            yield dict(zip(encabezado, (valor.strip() for valor in valores)))
+
+
+def _leer_xlsx(archivo):
+    if openpyxl is None:
+        raise XLSXNoDisponible()
+    try:
+        # Acá se ejecuta el import diferido: un openpyxl roto falla recién ahora
+        load_workbook = openpyxl.load_workbook
+    except ImportError as e:
+        raise XLSXNoDisponible() from e
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezado = _encabezado(next(filas, ()))
+
+        for valores in filas:
+            if all(valor is None for valor in valores):
+                continue
+            yield {
+                columna: _valor_celda(valor)
+                for columna, valor in zip(encabezado, valores)
+            }
+    finally:
+        libro.close()
+
+
+def _valor_celda(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        return valor.date()
+    return valor
+
+
+def importar_alumnos(filas, tamano_lote=500, procesos=None):
+    """
+    Crea alumnos (usuario + perfil) a partir de filas ya leídas.
+
+    Primero se lee y valida todo el archivo; recién después se insertan las
+    filas válidas por lotes con bulk_create, cada lote en su propia
+    transacción. Así un error de lectura a mitad del archivo (ver
+    ERRORES_LECTURA) se propaga sin haber guardado nada. Una fila inválida no
+    detiene la importación: se reporta con su número de fila (la 1 es el
+    encabezado).
+
+    Args:
+        filas: Iterable de diccionarios (ver leer_filas)
+        tamano_lote: Filas por lote
+        procesos: Procesos para hashear contraseñas (ver hashear_passwords)
+
+    Returns:
+        Diccionario con filas procesadas, alumnos creados y errores por fila
+    """
+    # Grupos por (nivel, letra) en una sola consulta
+    grupos = {
+        (grupo.nivel.numero, grupo.letra): grupo
+        for grupo in Grupo.objects.select_related('nivel')
+    }
+
+    resultado = {'procesadas': 0, 'creados': 0, 'errores': []}
+    vistos = {'email': set(), 'matricula': set()}
+    numeradas = enumerate(filas, start=2)
+    validas = []
+
+    while lote := list(islice(numeradas, tamano_lote)):
+        resultado['procesadas'] += len(lote)
+        validas.extend(_validar_lote(lote, grupos, vistos, resultado['errores']))
+
+    for inicio in range(0, len(validas), tamano_lote):
+        resultado['creados'] += _insertar_lote(
+            validas[inicio:inicio + tamano_lote], resultado['errores'], procesos
+        )
+
+    resultado['errores'].sort(key=lambda error: error['fila'])
+    return resultado
+
+
+def _validar_lote(lote, grupos, vistos, errores):
+    validas = []
+
+    for numero, fila in lote:
+        serializer = AlumnoImportacionSerializer(data=fila)
+        if not serializer.is_valid():
+            errores.append({'fila': numero, 'errores': serializer.errors})
+            continue
+
+        datos = serializer.validated_data
+        datos['email'] = Usuario.objects.normalize_email(datos['email'])
+        datos['letra'] = datos['letra'].upper()
+        datos['grupo'] = grupos.get((datos.pop('nivel'), datos.pop('letra')))
+
+        if datos['grupo'] is None:
+            errores.append({'fila': numero, 'errores': {'grupo': ['El grupo no existe']}})
+            continue
+
+        repetidos = {
+            campo: ['Repetido en el archivo']
+            for campo in vistos if datos[campo] in vistos[campo]
+        }
+        if repetidos:
+            errores.append({'fila': numero, 'errores': repetidos})
+            continue
+
+        for campo in vistos:
+            vistos[campo].add(datos[campo])
+        validas.append((numero, datos))
+
+    # Unicidad contra la base: una consulta por campo y lote
+    emails_existentes = set(Usuario.objects.filter(
+        email__in=[datos['email'] for _, datos in validas]
+    ).values_list('email', flat=True))
+    matriculas_existentes = set(Alumno.objects.filter(
+        matricula__in=[datos['matricula'] for _, datos in validas]
+    ).values_list('matricula', flat=True))
+
+    nuevas = []
+    for numero, datos in validas:
+        existentes = {}
+        if datos['email'] in emails_existentes:
+            existentes['email'] = ['Ya existe un usuario con este email']
+        if datos['matricula'] in matriculas_existentes:
+            existentes['matricula'] = ['Ya existe un alumno con esta matrícula']
+
+        if existentes:
+            errores.append({'fila': numero, 'errores': existentes})
+        else:
+            nuevas.append((numero, datos))
+
+    return nuevas
+
+
+def _insertar_lote(nuevas, errores, procesos):
+    if not nuevas:
+        return 0
+
+    hashes = hashear_passwords([datos.pop('password') for _, datos in nuevas], procesos)
+
+    try:
+        with transaction.atomic():
+            usuarios = Usuario.objects.bulk_create([
+                Usuario(email=datos.pop('email'), password=hash_password, tipo_usuario=TipoUsuario.ALUMNO)
+                for (_, datos), hash_password in zip(nuevas, hashes)
+            ])
+
+            alumnos = []
+            for usuario, (_, datos) in zip(usuarios, nuevas):
+                alumno = Alumno(usuario=usuario, **datos)
+                # bulk_create no pasa por save()
+                alumno.busqueda = alumno.texto_busqueda()
+                alumnos.append(alumno)
+
+            Alumno.objects.bulk_create(alumnos)
+    except IntegrityError:
+        # Otro proceso insertó los mismos datos entre la validación y el insert
+        for numero, _ in nuevas:
+            errores.append({'fila': numero, 'errores': {'non_field_errors': ['Conflicto al guardar, reintente la fila']}})
+        return 0
+
+    return len(alumnos)
+
+
+def trabajo_importar_alumnos(trabajo):
+    """
+    Trabajo 'importar_alumnos' (ver shared.trabajos): importa el archivo
+    subido en trabajo.entrada.
+
+    Returns:
+        El resultado de importar_alumnos
+    """
+    try:
+        with trabajo.entrada.open('rb') as archivo:
+            return importar_alumnos(leer_filas(archivo, trabajo.entrada.name))
+    except ERRORES_LECTURA as e:
+        raise ErrorTrabajo(f'No se pudo leer el archivo: {e}')
@@ -0,0 +1,89 @@
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.utils import timezone
+from shared.periodico import TareaPeriodica
+from django.db.models import Case, When, Value, DateTimeField
+
+logger = logging.getLogger(__name__)
+
+# Logins pendientes de persistir: {usuario_id: fecha_hora}
+_pendientes = {}
+_lock = threading.Lock()
+
+
+def registrar_login(usuario_id, fecha_hora=None):
+    """
+    Registra un login en memoria sin tocar la base de datos.
+
+    Un hilo en segundo plano escribe los logins acumulados en un único
+    UPDATE cada LAST_LOGIN_FLUSH_INTERVAL segundos, o antes si se superan
+    LAST_LOGIN_FLUSH_MAX usuarios pendientes. Si el mismo usuario entra
+    varias veces dentro del intervalo, solo se guarda el último acceso.
+    """
+    with _lock:
+        _pendientes[usuario_id] = fecha_hora or timezone.now()
+        lleno = len(_pendientes) >= settings.LAST_LOGIN_FLUSH_MAX
+
+    _escritor.iniciar()
+    if lleno:
+        _escritor.despertar()
+
+
+def flush_last_login():
+    """
+    Persiste los logins pendientes con un único UPDATE.
+
+    Returns:
+        Cantidad de usuarios actualizados
+    """
+    global _pendientes
+    from .models import Usuario
+
+    with _lock:
+        pendientes, _pendientes = _pendientes, {}
+
+    if not pendientes:
+        return 0
+
+    try:
+        return Usuario.objects.filter(pk__in=pendientes.keys()).update(
+            last_login=Case(
+                *[When(pk=usuario_id, then=Value(fecha_hora)) for usuario_id, fecha_hora in pendientes.items()],
+                output_field=DateTimeField()
+            )
+        )
+    except Exception:
+        # Devolver los pendientes para reintentar en el próximo flush
+        with _lock:
+            for usuario_id, fecha_hora in pendientes.items():
+                _pendientes.setdefault(usuario_id, fecha_hora)
+        raise
+
+
+def _flush_al_salir():
+    try:
+        flush_last_login()
+    except Exception:
+        logger.exception('No se pudieron guardar los last_login pendientes al salir')
+
+
+def activar_flush_al_salir():
+    """
+    Guarda los logins pendientes al terminar el proceso. Lo llaman los puntos
+    de entrada del servidor (wsgi.py, asgi.py), no el import del módulo: un
+    comando o el runner de tests no escriben al salir, cuando la base de
+    pruebas ya no existe. Bajo gunicorn, worker_exit ya lo hizo antes.
+    """
+    global _flush_registrado
+    with _lock:
+        if not _flush_registrado:
+            atexit.register(_flush_al_salir)
+            _flush_registrado = True
+
+
+_flush_registrado = False
+
+# Si el UPDATE falla, los pendientes se conservan para la próxima vuelta
+_escritor = TareaPeriodica('last-login', flush_last_login, lambda: settings.LAST_LOGIN_FLUSH_INTERVAL)
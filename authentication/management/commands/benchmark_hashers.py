@@ -0,0 +1,52 @@
+import statistics
+from time import perf_counter
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Mide la latencia de hash y verificación de contraseñas para cada perfil de hasher'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--muestras', type=int, default=10, help='Repeticiones por medición')
+        parser.add_argument('--perfil', action='append', help='Perfil a medir (por defecto todos)')
+
+    def handle(self, *args, **options):
+        perfiles = options['perfil'] or list(settings.PASSWORD_HASHER_PROFILES)
+        muestras = max(1, options['muestras'])
+
+        desconocidos = set(perfiles) - set(settings.PASSWORD_HASHER_PROFILES)
+        if desconocidos:
+            raise CommandError(f"Perfiles desconocidos: {', '.join(sorted(desconocidos))}")
+
+        self.stdout.write(f"Perfil activo: {settings.PASSWORD_HASHER_PROFILE}")
+        self.stdout.write(f"{'perfil':<10} {'algoritmo':<24} {'hash ms (med/p95)':>20} {'verify ms (med/p95)':>22}")
+
+        for perfil in perfiles:
+            hasher = import_string(settings.PASSWORD_HASHER_PROFILES[perfil][0])()
+            password = 'alumno123'
+
+            tiempos_hash = []
+            encoded = None
+            for _ in range(muestras):
+                inicio = perf_counter()
+                encoded = hasher.encode(password, hasher.salt())
+                tiempos_hash.append((perf_counter() - inicio) * 1000)
+
+            tiempos_verify = []
+            for _ in range(muestras):
+                inicio = perf_counter()
+                hasher.verify(password, encoded)
+                tiempos_verify.append((perf_counter() - inicio) * 1000)
+
+            self.stdout.write(
+                f"{perfil:<10} {hasher.algorithm:<24} "
+                f"{self._resumen(tiempos_hash):>20} {self._resumen(tiempos_verify):>22}"
+            )
+
+    @staticmethod
+    def _resumen(tiempos):
+        tiempos = sorted(tiempos)
+        p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+        return f"{statistics.median(tiempos):.2f} / {p95:.2f}"
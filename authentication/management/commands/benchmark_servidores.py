@@ -0,0 +1,117 @@
+import os
+import sys
+import socket
+import statistics
+import subprocess
+from contextlib import contextmanager
+from time import perf_counter, sleep
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.models import Usuario
+
+SERVIDORES = ['wsgi', 'asgi']
+
+RUTAS = [
+    '/api/auth/dashboard/director/',
+    '/api/academic/stats/',
+    '/api/audit/bitacora/stats/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara latencia (p50/p95) y peticiones por segundo de gunicorn en modo '
+        'WSGI contra workers de uvicorn (ASGI) sobre los dashboards de estadísticas'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', required=True, help='Director con el que autenticar las peticiones')
+        parser.add_argument('--concurrencia', type=int, action='append', help='Clientes simultáneos (repetible; por defecto 1, 8 y 32)')
+        parser.add_argument('--peticiones', type=int, default=200, help='Peticiones por ruta y nivel de concurrencia')
+        parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn por servidor')
+        parser.add_argument('--puerto', type=int, default=8765, help='Puerto local de los servidores')
+        parser.add_argument('--ruta', action='append', help='Ruta a medir (repetible; por defecto los dashboards)')
+
+    def handle(self, *args, **options):
+        usuario = Usuario.objects.filter(email=options['email']).first()
+        if usuario is None:
+            raise CommandError(f"No existe el usuario {options['email']}")
+
+        # Access token sin pasar por el login: no se mide el hash de la contraseña
+        token = str(AccessToken.for_user(usuario))
+        niveles = options['concurrencia'] or [1, 8, 32]
+        peticiones = max(1, options['peticiones'])
+        rutas = options['ruta'] or RUTAS
+
+        self.stdout.write(
+            f"{'servidor':<8} {'ruta':<32} {'conc':>5} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>8} {'errores':>8}"
+        )
+        for nombre in SERVIDORES:
+            with self._servidor(nombre, options['workers'], options['puerto']) as base:
+                for ruta in rutas:
+                    # Calentamiento: conexiones a la base e imports perezosos
+                    self._peticion(base + ruta, token)
+                    for concurrencia in niveles:
+                        latencias, errores, duracion = self._carga(base + ruta, token, concurrencia, peticiones)
+                        self._reportar(nombre, ruta, concurrencia, latencias, errores, duracion)
+
+    @contextmanager
+    def _servidor(self, nombre, workers, puerto):
+        # Mismo perfil que en producción (gunicorn.conf.py), cambiando solo el servidor
+        proceso = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+             '-b', f'127.0.0.1:{puerto}', '-w', str(workers), '--log-level', 'warning'],
+            env={**os.environ, 'GUNICORN_SERVIDOR': nombre},
+        )
+        try:
+            self._esperar_puerto(proceso, puerto)
+            yield f'http://127.0.0.1:{puerto}'
+        finally:
+            proceso.terminate()
+            proceso.wait(timeout=30)
+
+    @staticmethod
+    def _esperar_puerto(proceso, puerto, espera=30):
+        limite = perf_counter() + espera
+        while perf_counter() < limite:
+            if proceso.poll() is not None:
+                raise CommandError(f'gunicorn terminó con código {proceso.returncode}')
+            try:
+                with socket.create_connection(('127.0.0.1', puerto), timeout=0.5):
+                    return
+            except OSError:
+                sleep(0.2)
+        raise CommandError(f'gunicorn no respondió en el puerto {puerto}')
+
+    @staticmethod
+    def _peticion(url, token):
+        inicio = perf_counter()
+        try:
+            with urlopen(Request(url, headers={'Authorization': f'Bearer {token}'}), timeout=60) as respuesta:
+                respuesta.read()
+                correcta = respuesta.status == 200
+        except (HTTPError, OSError):
+            correcta = False
+        return (perf_counter() - inicio) * 1000, correcta
+
+    def _carga(self, url, token, concurrencia, peticiones):
+        inicio = perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+            resultados = list(pool.map(lambda _: self._peticion(url, token), range(peticiones)))
+        duracion = perf_counter() - inicio
+        latencias = [latencia for latencia, correcta in resultados if correcta]
+        return latencias, len(resultados) - len(latencias), duracion
+
+    def _reportar(self, nombre, ruta, concurrencia, latencias, errores, duracion):
+        if len(latencias) < 2:
+            self.stdout.write(self.style.WARNING(f'{nombre:<8} {ruta:<32} {concurrencia:>5} sin respuestas válidas'))
+            return
+        cuantiles = statistics.quantiles(latencias, n=100)
+        self.stdout.write(
+            f'{nombre:<8} {ruta:<32} {concurrencia:>5} {cuantiles[49]:>8.1f} {cuantiles[94]:>8.1f} '
+            f'{len(latencias) / duracion:>8.1f} {errores:>8}'
+        )
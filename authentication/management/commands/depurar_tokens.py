@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from authentication.tokens import depurar_tokens_expirados
+
+
+class Command(BaseCommand):
+    help = 'Elimina por lotes los refresh tokens expirados (outstanding y blacklist)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Tokens por lote')
+        parser.add_argument('--pausa', type=float, default=0, help='Segundos de espera entre lotes')
+
+    def handle(self, *args, **options):
+        eliminados = depurar_tokens_expirados(
+            tamano_lote=options['lote'],
+            pausa=options['pausa']
+        )
+        self.stdout.write(self.style.SUCCESS(f'{eliminados} tokens expirados eliminados'))
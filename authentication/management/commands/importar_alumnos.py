@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from authentication.importacion import ERRORES_LECTURA, leer_filas, importar_alumnos
+
+
+class Command(BaseCommand):
+    help = 'Importa alumnos desde un archivo CSV o XLSX por lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo CSV o XLSX')
+        parser.add_argument('--lote', type=int, default=500, help='Filas por lote')
+        parser.add_argument(
+            '--procesos', type=int, default=None,
+            help='Procesos para hashear contraseñas (por defecto PASSWORD_HASH_PROCESOS)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], 'rb') as archivo:
+                resultado = importar_alumnos(
+                    leer_filas(archivo, options['archivo']),
+                    tamano_lote=options['lote'],
+                    procesos=options['procesos']
+                )
+        except (OSError, *ERRORES_LECTURA) as e:
+            raise CommandError(f'No se pudo leer el archivo: {e}')
+
+        for error in resultado['errores']:
+            detalle = '; '.join(
+                f"{campo}: {' '.join(str(mensaje) for mensaje in mensajes)}"
+                for campo, mensajes in error['errores'].items()
+            )
+            self.stdout.write(self.style.WARNING(f"Fila {error['fila']}: {detalle}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['creados']} alumnos creados de {resultado['procesadas']} filas "
+            f"({len(resultado['errores'])} con errores)"
+        ))
@@ -0,0 +1,45 @@
+from datetime import timedelta
+from audit.models import Bitacora
+from django.utils import timezone
+from authentication.models import Usuario
+from django.core.management.base import BaseCommand
+from authentication.last_login import flush_last_login
+from django.db.models import OuterRef, Subquery, Max, Q, F
+
+
+class Command(BaseCommand):
+    help = (
+        'Sincroniza usuarios.last_login con los LOGIN registrados en bitácora '
+        'usando un único UPDATE. Pensado para ejecutarse periódicamente (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horas', type=int, default=24,
+            help='Ventana de bitácora a revisar en horas (0 = toda la bitácora)'
+        )
+
+    def handle(self, *args, **options):
+        # Logins acumulados en este proceso (si los hubiera)
+        flush_last_login()
+
+        logins = Bitacora.objects.filter(tipo_accion='LOGIN')
+        if options['horas']:
+            logins = logins.filter(fecha_hora__gte=timezone.now() - timedelta(hours=options['horas']))
+
+        ultimo_login = Subquery(
+            logins.filter(usuario=OuterRef('pk'))
+            .order_by()
+            .values('usuario')
+            .annotate(ultimo=Max('fecha_hora'))
+            .values('ultimo')
+        )
+
+        actualizados = Usuario.objects.annotate(
+            ultimo_login=ultimo_login
+        ).filter(
+            Q(last_login__isnull=True) | Q(last_login__lt=F('ultimo_login')),
+            ultimo_login__isnull=False
+        ).update(last_login=ultimo_login)
+
+        self.stdout.write(self.style.SUCCESS(f'{actualizados} usuarios actualizados'))
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        # Índice para la depuración de tokens expirados (depurar_tokens)
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_at_idx '
+                'ON token_blacklist_outstandingtoken (expires_at);',
+            reverse_sql='DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_at_idx;',
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-19 11:53
+
+from django.db import migrations, models
+from shared.busqueda import normalizar_texto
+
+
+def poblar_busqueda(apps, schema_editor):
+    for nombre_modelo, campo_id in (('Alumno', 'matricula'), ('Profesor', 'cedula_identidad')):
+        Modelo = apps.get_model('authentication', nombre_modelo)
+        lote = []
+        for perfil in Modelo.objects.select_related('usuario').iterator(chunk_size=500):
+            perfil.busqueda = normalizar_texto(
+                f"{perfil.nombres} {perfil.apellidos} {perfil.usuario.email} {getattr(perfil, campo_id)}"
+            )
+            lote.append(perfil)
+            if len(lote) >= 500:
+                Modelo.objects.bulk_update(lote, ['busqueda'])
+                lote = []
+        if lote:
+            Modelo.objects.bulk_update(lote, ['busqueda'])
+
+
+def crear_indices_trigram(apps, schema_editor):
+    # Solo PostgreSQL con pg_trgm disponible; sin índice la búsqueda sigue funcionando
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        cursor.execute('CREATE INDEX IF NOT EXISTS alumnos_busqueda_trgm ON alumnos USING gin (busqueda gin_trgm_ops)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS profesores_busqueda_trgm ON profesores USING gin (busqueda gin_trgm_ops)')
+
+
+def eliminar_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP INDEX IF EXISTS alumnos_busqueda_trgm')
+        cursor.execute('DROP INDEX IF EXISTS profesores_busqueda_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_outstandingtoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumno',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profesor',
+            name='busqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(poblar_busqueda, migrations.RunPython.noop),
+        migrations.RunPython(crear_indices_trigram, eliminar_indices_trigram),
+    ]
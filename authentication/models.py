@@ -1,4 +1,5 @@
 from django.db import models
+from shared.busqueda import normalizar_texto
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 
@@ -83,10 +84,23 @@ class Profesor(models.Model):
     direccion = models.CharField(max_length=60, blank=True)
     especialidad = models.CharField(max_length=20, blank=True)
     fecha_contratacion = models.DateField()
+    # Texto normalizado para búsqueda (nombres, apellidos, email, CI). Lo recalculan save() y
+    # los cambios del usuario (signals); tras un update() masivo, recalcular_busqueda
+    busqueda = models.TextField(blank=True, default='', editable=False)
     
     class Meta:
         db_table = 'profesores'
 
+    def texto_busqueda(self):
+        email = self.usuario.email if self.usuario_id else ''
+        return normalizar_texto(f"{self.nombres} {self.apellidos} {email} {self.cedula_identidad}")
+
+    def save(self, *args, **kwargs):
+        self.busqueda = self.texto_busqueda()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'busqueda'}
+        super().save(*args, **kwargs)
+
 class Alumno(models.Model):
     usuario = models.OneToOneField(
         Usuario,
@@ -105,6 +119,19 @@ class Alumno(models.Model):
     nombre_tutor = models.CharField(max_length=50, blank=True)
     telefono_tutor = models.CharField(max_length=10, blank=True)
     grupo = models.ForeignKey('academic.Grupo', on_delete=models.PROTECT)
+    # Texto normalizado para búsqueda (nombres, apellidos, email, matrícula). Lo recalculan save() y
+    # los cambios del usuario (signals); tras un update() masivo, recalcular_busqueda
+    busqueda = models.TextField(blank=True, default='', editable=False)
     
     class Meta:
-        db_table = 'alumnos'
\ No newline at end of file
+        db_table = 'alumnos'
+
+    def texto_busqueda(self):
+        email = self.usuario.email if self.usuario_id else ''
+        return normalizar_texto(f"{self.nombres} {self.apellidos} {email} {self.matricula}")
+
+    def save(self, *args, **kwargs):
+        self.busqueda = self.texto_busqueda()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'busqueda'}
+        super().save(*args, **kwargs)
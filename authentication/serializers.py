@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from .tokens import RefreshTokenCacheado
 from .models import Usuario, Director, Profesor, Alumno
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
@@ -10,6 +11,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['id'] = self.user.id
         return data
 
+class TokenRefreshCacheadoSerializer(TokenRefreshSerializer):
+    """Rotación de refresh tokens con verificación de blacklist cacheada"""
+    token_class = RefreshTokenCacheado
+
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField()
@@ -148,6 +153,7 @@ class ProfesorListSerializer(serializers.ModelSerializer):
             'usuario', 'email', 'nombre_completo', 'cedula_identidad',
             'telefono', 'especialidad', 'fecha_contratacion', 'activo'
         ]
+        fuentes = {'nombre_completo': ['nombres', 'apellidos']}
 
     def get_nombre_completo(self, obj):
         return f"{obj.nombres} {obj.apellidos}"
@@ -222,6 +228,10 @@ class AlumnoListSerializer(serializers.ModelSerializer):
             'usuario', 'email', 'nombre_completo', 'matricula',
             'grupo', 'grupo_completo', 'telefono', 'activo'
         ]
+        fuentes = {
+            'nombre_completo': ['nombres', 'apellidos'],
+            'grupo_completo': ['grupo__nivel__numero', 'grupo__letra'],
+        }
 
     def get_nombre_completo(self, obj):
         return f"{obj.nombres} {obj.apellidos}"
@@ -231,6 +241,26 @@ class AlumnoListSerializer(serializers.ModelSerializer):
             return f"{obj.grupo.nivel.numero}° {obj.grupo.letra}"
         return None
 
+class AlumnoImportacionSerializer(serializers.Serializer):
+    """
+    Valida una fila de importación masiva de alumnos.
+    Sin validadores de unicidad ni PK: esas comprobaciones se hacen por lote
+    (ver authentication.importacion) para no consultar la base por fila.
+    """
+    email = serializers.EmailField()
+    password = serializers.CharField()
+    matricula = serializers.CharField(max_length=12)
+    nombres = serializers.CharField(max_length=100)
+    apellidos = serializers.CharField(max_length=100)
+    fecha_nacimiento = serializers.DateField()
+    genero = serializers.CharField(max_length=1)
+    telefono = serializers.CharField(max_length=10, required=False, allow_blank=True)
+    direccion = serializers.CharField(max_length=60, required=False, allow_blank=True)
+    nombre_tutor = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    telefono_tutor = serializers.CharField(max_length=10, required=False, allow_blank=True)
+    nivel = serializers.IntegerField(min_value=1, max_value=6)
+    letra = serializers.CharField(max_length=1)
+
 class DirectorSerializer(serializers.ModelSerializer):
     """Serializer para directores (para completitud)"""
     usuario = UsuarioSerializer()
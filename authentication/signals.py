@@ -1,14 +1,32 @@
-from django.utils import timezone
+from functools import partial
 from audit.models import Bitacora
+from django.db import transaction
 from django.dispatch import receiver
+from .last_login import registrar_login
 from django.db.models.signals import post_save
+from shared.busqueda import recalcular_busqueda
+from .models import Usuario, Alumno, Profesor
 
 @receiver(post_save, sender=Bitacora)
 def update_last_login_on_login_action(sender, instance, created, **kwargs):
     """
-    Actualiza last_login cuando se registra un LOGIN en bitácora
+    Encola la actualización de last_login cuando se registra un LOGIN en bitácora.
+    La escritura en usuarios se hace por lotes (ver authentication.last_login);
+    solo al confirmarse la transacción: un LOGIN revertido no cuenta
     """
     if created and instance.tipo_accion == 'LOGIN':
-        usuario = instance.usuario
-        usuario.last_login = timezone.now()
-        usuario.save(update_fields=['last_login'])
+        transaction.on_commit(
+            partial(registrar_login, instance.usuario_id, instance.fecha_hora), using=kwargs.get('using')
+        )
+
+
+@receiver(post_save, sender=Usuario)
+def actualizar_busqueda_perfil(sender, instance, created, update_fields=None, **kwargs):
+    """
+    El email forma parte del texto de búsqueda de alumnos y profesores:
+    se recalcula en cualquier guardado del usuario que pueda cambiarlo
+    """
+    if created or (update_fields is not None and 'email' not in update_fields):
+        return
+    for Modelo in (Alumno, Profesor):
+        recalcular_busqueda(Modelo.objects.filter(usuario=instance).select_related('usuario'))
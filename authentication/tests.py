@@ -1,3 +1,540 @@
-from django.test import TestCase
+import io
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
+from decouple import config
+from django.core.management import call_command
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.core.cache import cache
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from audit.models import Bitacora
+from shared.models import Trabajo, EstadoTrabajo
+from shared.trabajos import encolar, ejecutar, tomar_siguiente
+from academic.models import Nivel, Grupo
+from shared.busqueda import filtrar_por_texto, normalizar_texto, recalcular_busqueda
+from shared.pruebas import ParidadSerializacionMixin
+from . import last_login
+from .tokens import RefreshTokenCacheado, depurar_tokens_expirados
+from .models import Usuario, Profesor, Alumno
+from .importacion import importar_alumnos, leer_filas
+from .serializers import AlumnoListSerializer, ProfesorListSerializer
 
-# Create your tests here.
+
+class SerializacionRapidaTests(ParidadSerializacionMixin, TestCase):
+    """La serialización de listados debe coincidir con la de los serializers DRF"""
+
+    @classmethod
+    def setUpTestData(cls):
+        grupo = Grupo.objects.create(nivel=Nivel.objects.create(numero=2, nombre='Segundo'), letra='B')
+
+        for numero in range(3):
+            usuario = Usuario.objects.create_user(
+                f'profesor{numero}@colegio.bo', 'clave', tipo_usuario='profesor', activo=numero != 1
+            )
+            Profesor.objects.create(
+                usuario=usuario, nombres='Ana', apellidos=f'Pérez {numero}', cedula_identidad=f'CI{numero}',
+                fecha_nacimiento=date(1980, 1, 1), genero='F', fecha_contratacion=date(2020, 2, 1),
+                telefono='70000000' if numero else '', especialidad='Física'
+            )
+
+            usuario = Usuario.objects.create_user(
+                f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno', activo=numero != 2
+            )
+            Alumno.objects.create(
+                usuario=usuario, matricula=f'2025{numero:03d}', nombres='José', apellidos=f'Núñez {numero}',
+                fecha_nacimiento=date(2012, 5, 6), genero='M', grupo=grupo
+            )
+
+    def test_alumnos(self):
+        self.assertParidad(AlumnoListSerializer, Alumno.objects.select_related('usuario', 'grupo__nivel'))
+
+    def test_profesores(self):
+        self.assertParidad(ProfesorListSerializer, Profesor.objects.select_related('usuario'))
+
+
+# Sin hilo escritor: los tests deciden cuándo se escribe
+@mock.patch.object(last_login._escritor, 'iniciar')
+class LastLoginTests(TestCase):
+    def setUp(self):
+        last_login._escritor.detener()
+        last_login._pendientes.clear()
+        self.usuario = Usuario.objects.create_user('login@colegio.bo', 'clave')
+        self.otro = Usuario.objects.create_user('otro@colegio.bo', 'clave')
+
+    def tearDown(self):
+        last_login._escritor.detener()
+        last_login._pendientes.clear()
+
+    def test_solo_logins_confirmados(self, iniciar_escritor):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Bitacora.objects.create(usuario=self.usuario, tipo_accion='LOGIN', ip='127.0.0.1')
+                transaction.set_rollback(True)
+        self.assertEqual(last_login._pendientes, {})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            registro = Bitacora.objects.create(usuario=self.otro, tipo_accion='LOGIN', ip='127.0.0.1')
+            self.assertEqual(last_login._pendientes, {})
+        self.assertEqual(last_login._pendientes, {self.otro.pk: registro.fecha_hora})
+
+    def test_flush_al_salir_solo_desde_el_servidor(self, iniciar_escritor):
+        with mock.patch.object(last_login, '_flush_registrado', False), mock.patch('atexit.register') as registrar:
+            last_login.activar_flush_al_salir()
+            last_login.activar_flush_al_salir()
+        registrar.assert_called_once_with(last_login._flush_al_salir)
+
+    def test_mismo_usuario_se_agrupa(self, iniciar_escritor):
+        primero = datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)
+        ultimo = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+        with self.assertNumQueries(0):
+            last_login.registrar_login(self.usuario.pk, primero)
+            last_login.registrar_login(self.usuario.pk, ultimo)
+        self.assertEqual(last_login._pendientes, {self.usuario.pk: ultimo})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(last_login.flush_last_login(), 1)
+        self.usuario.refresh_from_db()
+        self.assertEqual(self.usuario.last_login, ultimo)
+        self.assertEqual(last_login._pendientes, {})
+
+    @override_settings(LAST_LOGIN_FLUSH_MAX=2)
+    def test_lleno_despierta_al_escritor(self, iniciar_escritor):
+        # El login nunca escribe: solo avisa al hilo escritor
+        with self.assertNumQueries(0), mock.patch.object(last_login._escritor, 'despertar') as despertar:
+            last_login.registrar_login(self.usuario.pk)
+            despertar.assert_not_called()
+            last_login.registrar_login(self.otro.pk)
+            despertar.assert_called_once()
+        iniciar_escritor.assert_called()
+
+        self.assertEqual(last_login.flush_last_login(), 2)
+        self.assertEqual(Usuario.objects.filter(last_login__isnull=False).count(), 2)
+
+    def test_error_conserva_pendientes(self, iniciar_escritor):
+        last_login.registrar_login(self.usuario.pk)
+        with mock.patch.object(Usuario.objects, 'filter', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                last_login.flush_last_login()
+        self.assertIn(self.usuario.pk, last_login._pendientes)
+
+    def test_comando_sincroniza_desde_bitacora(self, iniciar_escritor):
+        Bitacora.objects.create(usuario=self.usuario, tipo_accion='LOGIN', ip='127.0.0.1')
+        Bitacora.objects.create(usuario=self.otro, tipo_accion='LOGOUT', ip='127.0.0.1')
+        # Perdidos en memoria (p. ej. un worker que murió sin escribirlos)
+        last_login._pendientes.clear()
+
+        call_command('sincronizar_last_login', stdout=io.StringIO())
+
+        self.usuario.refresh_from_db()
+        self.otro.refresh_from_db()
+        self.assertEqual(self.usuario.last_login, Bitacora.objects.get(tipo_accion='LOGIN').fecha_hora)
+        self.assertIsNone(self.otro.last_login)
+
+
+class NormalizarTextoTests(SimpleTestCase):
+    def test_acentos_y_mayusculas(self):
+        self.assertEqual(normalizar_texto('Núñez Güemes'), 'nunez guemes')
+        self.assertEqual(normalizar_texto('ÁÉÍÓÚ àèìòù Ç'), 'aeiou aeiou c')
+        self.assertEqual(normalizar_texto('JOSÉ'), normalizar_texto('jose'))
+
+    def test_vacio(self):
+        self.assertEqual(normalizar_texto(None), '')
+        self.assertEqual(normalizar_texto(''), '')
+
+
+class BusquedaPersonasTests(TestCase):
+    def setUp(self):
+        grupo = Grupo.objects.create(nivel=Nivel.objects.create(numero=4, nombre='Cuarto'), letra='A')
+        for numero, (nombres, apellidos) in enumerate([('José', 'Núñez Peña'), ('María', 'Gómez'), ('Josefa', 'Rojas')]):
+            usuario = Usuario.objects.create_user(f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno')
+            Alumno.objects.create(
+                usuario=usuario, matricula=f'2024{numero:03d}', nombres=nombres, apellidos=apellidos,
+                fecha_nacimiento=date(2010, 1, 1), genero='M', grupo=grupo
+            )
+
+    def buscar(self, texto):
+        return sorted(filtrar_por_texto(Alumno.objects.all(), texto).values_list('matricula', flat=True))
+
+    def test_sin_acentos_ni_mayusculas(self):
+        self.assertEqual(self.buscar('NUNEZ'), ['2024000'])
+        self.assertEqual(self.buscar('peña'), ['2024000'])
+        self.assertEqual(self.buscar('gómez'), ['2024001'])
+
+    def test_palabras_en_cualquier_orden(self):
+        self.assertEqual(self.buscar('jose'), ['2024000', '2024002'])
+        self.assertEqual(self.buscar('núñez josé'), ['2024000'])
+        self.assertEqual(self.buscar('jose gomez'), [])
+        self.assertEqual(self.buscar('2024001'), ['2024001'])
+
+    def test_cambio_de_email_en_el_usuario(self):
+        usuario = Usuario.objects.get(email='alumno1@colegio.bo')
+        usuario.email = 'maria.gomez@colegio.bo'
+        usuario.save()
+        self.assertEqual(self.buscar('maria.gomez'), ['2024001'])
+
+        # Un guardado que no toca el email no recalcula nada
+        with self.assertNumQueries(1):
+            usuario.save(update_fields=['activo'])
+
+    def test_recalcular_tras_update_masivo(self):
+        Alumno.objects.filter(matricula='2024002').update(apellidos='Álvarez')
+        self.assertEqual(self.buscar('alvarez'), [])
+        self.assertEqual(recalcular_busqueda(Alumno.objects.select_related('usuario')), 1)
+        self.assertEqual(self.buscar('alvarez'), ['2024002'])
+
+
+@mock.patch.object(last_login._escritor, 'iniciar')
+class TokensTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.usuario = Usuario.objects.create_user('token@colegio.bo', 'clave')
+
+    def _outstanding(self, jti, expira):
+        return OutstandingToken.objects.create(
+            user=self.usuario, jti=jti, token=jti, created_at=expira - timedelta(days=7), expires_at=expira
+        )
+
+    def test_depurar_tokens_expirados(self, iniciar_escritor):
+        ahora = datetime.now(timezone.utc)
+        for numero in range(3):
+            token = self._outstanding(f'vencido{numero}', ahora - timedelta(hours=numero + 1))
+        BlacklistedToken.objects.create(token=token)
+        self._outstanding('vigente', ahora + timedelta(days=1))
+
+        # Lotes de 2: el tercero queda para una segunda vuelta
+        self.assertEqual(depurar_tokens_expirados(tamano_lote=2), 3)
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['vigente'])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+        salida = io.StringIO()
+        call_command('depurar_tokens', stdout=salida)
+        self.assertIn('0 tokens expirados', salida.getvalue())
+
+    def test_blacklist_cacheada(self, iniciar_escritor):
+        token = RefreshTokenCacheado.for_user(self.usuario)
+        token.blacklist()
+
+        # La blacklist recién hecha ya está en caché: no se consulta la base
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            RefreshTokenCacheado(str(token))
+
+        cache.clear()
+        with self.assertNumQueries(1), self.assertRaises(TokenError):
+            RefreshTokenCacheado(str(token))
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            RefreshTokenCacheado(str(token))
+
+    def test_negativo_solo_con_timeout(self, iniciar_escritor):
+        texto = str(RefreshTokenCacheado.for_user(self.usuario))
+
+        with override_settings(JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT=0):
+            for _ in range(2):
+                with self.assertNumQueries(1):
+                    RefreshTokenCacheado(texto)
+
+        with override_settings(JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT=30):
+            with self.assertNumQueries(1):
+                RefreshTokenCacheado(texto)
+            with self.assertNumQueries(0):
+                RefreshTokenCacheado(texto)
+
+    def test_emitir_token_inicia_la_depuracion(self, iniciar_escritor):
+        with mock.patch('authentication.tokens._depuracion') as depuracion:
+            with override_settings(JWT_DEPURACION_INTERVALO=0):
+                RefreshTokenCacheado.for_user(self.usuario)
+            depuracion.iniciar.assert_not_called()
+            RefreshTokenCacheado.for_user(self.usuario)
+            depuracion.iniciar.assert_called_once()
+
+    def test_un_worker_depura_por_intervalo(self, iniciar_escritor):
+        from authentication.tokens import _depurar_si_corresponde
+        with mock.patch('authentication.tokens.depurar_tokens_expirados') as depurar:
+            _depurar_si_corresponde()
+            _depurar_si_corresponde()
+        depurar.assert_called_once()
+
+
+def _perfil(nombre):
+    # El perfil pedido primero y el resto registrados, como en settings
+    return settings.PASSWORD_HASHER_PROFILES[nombre] + [
+        hasher for perfil, hashers in settings.PASSWORD_HASHER_PROFILES.items() if perfil != nombre
+        for hasher in hashers
+    ]
+
+
+@mock.patch.object(last_login._escritor, 'iniciar')
+class PerfilesHasherTests(TestCase):
+    def test_login_rehashea_al_perfil_activo(self, iniciar_escritor):
+        with override_settings(PASSWORD_HASHERS=_perfil('rapido')):
+            usuario = Usuario.objects.create_user('perfil@colegio.bo', 'clave-inicial')
+        self.assertTrue(usuario.password.startswith('pbkdf2_sha256_rapido$'))
+
+        with override_settings(PASSWORD_HASHERS=_perfil('seguro')):
+            url = reverse('login')
+            respuesta = self.client.post(url, {'email': usuario.email, 'password': 'incorrecta'})
+            self.assertEqual(respuesta.status_code, 400)
+            usuario.refresh_from_db()
+            self.assertTrue(usuario.password.startswith('pbkdf2_sha256_rapido$'))
+
+            respuesta = self.client.post(url, {'email': usuario.email, 'password': 'clave-inicial'})
+            self.assertEqual(respuesta.status_code, 200)
+            usuario.refresh_from_db()
+            self.assertTrue(usuario.password.startswith('pbkdf2_sha256$'))
+            self.assertTrue(usuario.check_password('clave-inicial'))
+
+
+ENCABEZADO_IMPORTACION = 'email,password,matricula,nombres,apellidos,fecha_nacimiento,genero,nivel,letra\n'
+
+
+def _fila_importacion(numero, nivel=1, email=None):
+    email = email or f'alumno{numero}@colegio.bo'
+    return f'{email},clave,M{numero:05},Luis,Quispe,2010-05-01,M,{nivel},A\n'
+
+
+def _csv(*filas):
+    return io.BytesIO((ENCABEZADO_IMPORTACION + ''.join(filas)).encode())
+
+
+@override_settings(PASSWORD_HASH_PROCESOS=1)
+class ImportacionAlumnosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Grupo.objects.create(nivel=Nivel.objects.create(numero=1, nombre='1° Secundaria'), letra='A')
+
+    def _importar(self, archivo, **kwargs):
+        return importar_alumnos(leer_filas(archivo, 'alumnos.csv'), **kwargs)
+
+    def test_filas_validas(self):
+        resultado = self._importar(_csv(*(_fila_importacion(numero) for numero in range(5))), tamano_lote=2)
+
+        self.assertEqual(resultado, {'procesadas': 5, 'creados': 5, 'errores': []})
+        alumno = Alumno.objects.select_related('usuario').get(matricula='M00003')
+        self.assertEqual(alumno.usuario.tipo_usuario, 'alumno')
+        self.assertTrue(alumno.usuario.check_password('clave'))
+        self.assertIn('quispe', alumno.busqueda)
+
+    def test_filas_invalidas(self):
+        resultado = self._importar(_csv(
+            _fila_importacion(1),
+            _fila_importacion(2, email='sin-arroba'),
+            _fila_importacion(3, nivel=5),
+        ))
+
+        self.assertEqual(resultado['creados'], 1)
+        self.assertEqual([error['fila'] for error in resultado['errores']], [3, 4])
+        self.assertIn('email', resultado['errores'][0]['errores'])
+        self.assertEqual(resultado['errores'][1]['errores'], {'grupo': ['El grupo no existe']})
+
+    def test_filas_repetidas(self):
+        self._importar(_csv(_fila_importacion(1)))
+
+        resultado = self._importar(_csv(
+            _fila_importacion(1),
+            _fila_importacion(2),
+            _fila_importacion(2, email='otro@colegio.bo'),
+        ))
+
+        self.assertEqual(resultado['creados'], 1)
+        self.assertEqual(resultado['errores'], [
+            {'fila': 2, 'errores': {
+                'email': ['Ya existe un usuario con este email'],
+                'matricula': ['Ya existe un alumno con esta matrícula'],
+            }},
+            {'fila': 4, 'errores': {'matricula': ['Repetido en el archivo']}},
+        ])
+
+    def test_codificacion_invalida_no_guarda_nada(self):
+        # Varios lotes válidos antes del byte inválido, más allá del primer
+        # bloque que decodifica TextIOWrapper
+        archivo = _csv(*(_fila_importacion(numero) for numero in range(300)))
+        archivo.seek(0, io.SEEK_END)
+        archivo.write(b'\xff\xfe,roto\n')
+        archivo.seek(0)
+
+        with self.assertRaises(UnicodeDecodeError):
+            self._importar(archivo, tamano_lote=50)
+        self.assertFalse(Alumno.objects.exists())
+        self.assertFalse(Usuario.objects.exists())
+
+
+def _trabajo_roto(trabajo):
+    raise RuntimeError('roto')
+
+
+@override_settings(PASSWORD_HASH_PROCESOS=1)
+class TrabajosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Grupo.objects.create(nivel=Nivel.objects.create(numero=1, nombre='1° Secundaria'), letra='A')
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=media.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.director)
+
+    def _subir(self, contenido):
+        return self.client.post(reverse('alumno-importar'), {
+            'archivo': SimpleUploadedFile('alumnos.csv', contenido, content_type='text/csv')
+        })
+
+    def test_importacion_en_segundo_plano(self):
+        respuesta = self._subir((ENCABEZADO_IMPORTACION + _fila_importacion(1)).encode())
+
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertEqual(respuesta.json()['estado'], EstadoTrabajo.PENDIENTE)
+        self.assertFalse(Alumno.objects.exists())
+        self.assertTrue(Bitacora.objects.filter(tipo_accion__startswith='IMPORTAR_ALUMNOS').exists())
+
+        # close_old_connections cerraría la conexión de la transacción del test
+        with mock.patch('shared.management.commands.procesar_trabajos.close_old_connections'):
+            call_command('procesar_trabajos', '--una-vez', stdout=io.StringIO())
+
+        trabajo = Trabajo.objects.get(pk=respuesta.json()['id'])
+        self.assertEqual(trabajo.estado, EstadoTrabajo.TERMINADO)
+        self.assertFalse(trabajo.entrada)
+        self.assertTrue(Alumno.objects.filter(matricula='M00001').exists())
+
+        detalle = self.client.get(reverse('trabajo-detail', kwargs={'pk': trabajo.pk})).json()
+        self.assertEqual(detalle['resultado'], {'procesadas': 1, 'creados': 1, 'errores': []})
+        self.assertIsNone(detalle['descarga'])
+        self.assertEqual(self.client.get(reverse('trabajo-archivo', kwargs={'pk': trabajo.pk})).status_code, 404)
+
+    def test_archivo_ilegible(self):
+        respuesta = self._subir((ENCABEZADO_IMPORTACION + _fila_importacion(1)).encode() + b'\xff\n')
+
+        trabajo = ejecutar(tomar_siguiente())
+
+        self.assertEqual(trabajo.pk, respuesta.json()['id'])
+        self.assertEqual(trabajo.estado, EstadoTrabajo.FALLIDO)
+        self.assertIn('No se pudo leer el archivo', trabajo.error)
+        self.assertFalse(Alumno.objects.exists())
+
+    def test_xlsx_sin_openpyxl(self):
+        self.client.post(reverse('alumno-importar'), {'archivo': SimpleUploadedFile('alumnos.xlsx', b'PK')})
+        self.client.post(reverse('alumno-importar'), {'archivo': SimpleUploadedFile('alumnos.xlsx', b'PK')})
+
+        roto = mock.Mock(spec=[])
+        type(roto).load_workbook = mock.PropertyMock(side_effect=ImportError('et_xmlfile'))
+        for openpyxl in (None, roto):
+            with mock.patch('authentication.importacion.openpyxl', openpyxl):
+                trabajo = ejecutar(tomar_siguiente())
+            self.assertEqual(trabajo.estado, EstadoTrabajo.FALLIDO)
+            self.assertIn('no admite archivos XLSX', trabajo.error)
+
+    def test_tomar_siguiente_y_errores(self):
+        primero = encolar('importar_alumnos', self.director)
+        encolar('importar_alumnos', self.director)
+
+        trabajo = tomar_siguiente()
+        self.assertEqual(trabajo.pk, primero.pk)
+        self.assertEqual(trabajo.estado, EstadoTrabajo.EN_CURSO)
+        self.assertNotEqual(tomar_siguiente().pk, primero.pk)
+        self.assertIsNone(tomar_siguiente())
+
+        with self.assertRaises(ValueError):
+            encolar('desconocido')
+
+        with mock.patch.dict('shared.trabajos.TIPOS', {'importar_alumnos': 'authentication.tests._trabajo_roto'}), \
+                self.assertLogs('shared.trabajos', 'ERROR'):
+            ejecutar(trabajo)
+        self.assertEqual(trabajo.estado, EstadoTrabajo.FALLIDO)
+        self.assertEqual(trabajo.error, 'Error interno al procesar el trabajo')
+
+    def test_descarga(self):
+        trabajo = encolar('importar_alumnos', self.director)
+        trabajo.archivo.save('resultado.txt', io.BytesIO(b'listo'))
+
+        detalle = self.client.get(reverse('trabajo-detail', kwargs={'pk': trabajo.pk})).json()
+        self.assertEqual(detalle['descarga']['nombre'], 'resultado.txt')
+
+        respuesta = self.client.get(detalle['descarga']['url'])
+        self.assertEqual(b''.join(respuesta.streaming_content), b'listo')
+        self.assertEqual(self.client.get(reverse('trabajo-detail', kwargs={'pk': 0})).status_code, 404)
+
+
+@override_settings(CONSULTAS_PARALELAS=0)
+class DashboardDirectorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+        niveles = [Nivel.objects.create(numero=numero, nombre=f'{numero}° Secundaria') for numero in (1, 2)]
+        for numero, nivel in enumerate([niveles[0], niveles[0], niveles[1]]):
+            Alumno.objects.create(
+                usuario=Usuario.objects.create_user(f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno'),
+                matricula=f'M{numero}', nombres='Luis', apellidos='Quispe', fecha_nacimiento=date(2010, 1, 1),
+                genero='M', grupo=Grupo.objects.get_or_create(nivel=nivel, letra='A')[0]
+            )
+
+    def test_distribucion_por_nivel(self):
+        # Alumno no tiene campo id (su pk es usuario): contarlo por 'id' fallaba con FieldError
+        respuesta = self.client.get(
+            reverse('dashboard-director'), HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.director)}'
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual(datos['distribucion_por_nivel'], [
+            {'grupo__nivel__numero': 1, 'grupo__nivel__nombre': '1° Secundaria', 'total_alumnos': 2},
+            {'grupo__nivel__numero': 2, 'grupo__nivel__nombre': '2° Secundaria', 'total_alumnos': 1},
+        ])
+        self.assertEqual(datos['estadisticas']['total_alumnos'], 3)
+        self.assertIn('No hay gestión académica activa', datos['alertas'])
+
+
+# Se ejecuta en un intérprete nuevo: en el del test Django ya está cargado
+_MEDIR_ARRANQUE = """
+import json, sys, time
+inicio = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+from shared.diferido import esta_cargado
+print(json.dumps({
+    'ms': (time.perf_counter() - inicio) * 1000,
+    'cargados': [nombre for nombre in sys.argv[1:] if esta_cargado(nombre)],
+}))
+"""
+
+
+class ArranqueTests(SimpleTestCase):
+    """django.setup() + carga de URLs: lo que paga cada worker y cada comando"""
+
+    # Holgado: detecta una librería pesada cargada al arrancar (segundos), no
+    # variaciones de la máquina. 0 desactiva la medición (CI muy lentos)
+    PRESUPUESTO_MS = config('PRESUPUESTO_ARRANQUE_MS', default=5000, cast=int)
+    PESADOS = ['numpy', 'pandas', 'scipy', 'sklearn', 'mlxtend', 'joblib', 'matplotlib', 'openpyxl']
+
+    def _arrancar(self):
+        proceso = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-c', _MEDIR_ARRANQUE, *self.PESADOS],
+            capture_output=True, text=True, env=os.environ.copy(), timeout=60
+        )
+        self.assertEqual(proceso.returncode, 0, proceso.stderr)
+        return json.loads(proceso.stdout.splitlines()[-1])
+
+    def test_sin_librerias_pesadas(self):
+        self.assertEqual(self._arrancar()['cargados'], [])
+
+    def test_presupuesto(self):
+        if not self.PRESUPUESTO_MS:
+            self.skipTest('PRESUPUESTO_ARRANQUE_MS=0')
+        # El mejor de tres: el primero suele incluir la caché de disco fría
+        ms = min(self._arrancar()['ms'] for _ in range(3))
+        self.assertLess(ms, self.PRESUPUESTO_MS, f'Arranque de {ms:.0f} ms (presupuesto {self.PRESUPUESTO_MS} ms)')
@@ -0,0 +1,113 @@
+from time import sleep
+from django.conf import settings
+from django.db import transaction
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from shared.periodico import TareaPeriodica
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+
+
+def _clave_cache(jti):
+    return f'jwt_blacklist:{jti}'
+
+
+def _segundos_hasta(exp):
+    return max(1, int((datetime_from_epoch(exp) - aware_utcnow()).total_seconds()))
+
+
+class RefreshTokenCacheado(RefreshToken):
+    """
+    RefreshToken que cachea la consulta a la blacklist.
+
+    Un token en blacklist lo está hasta que expira, así que el resultado
+    positivo se cachea hasta su expiración. El negativo solo se cachea durante
+    JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT segundos, lo cual únicamente es seguro
+    con una caché compartida entre workers (ver CACHES).
+
+    Emitir un token pone en marcha la depuración periódica de los expirados.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        if settings.JWT_DEPURACION_INTERVALO:
+            _depuracion.iniciar()
+        return super().for_user(user)
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        clave = _clave_cache(jti)
+
+        en_blacklist = cache.get(clave)
+        if en_blacklist is None:
+            en_blacklist = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            if en_blacklist:
+                cache.set(clave, True, _segundos_hasta(self.payload['exp']))
+            elif settings.JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT:
+                cache.set(clave, False, settings.JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT)
+
+        if en_blacklist:
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        resultado = super().blacklist()
+        cache.set(
+            _clave_cache(self.payload[api_settings.JTI_CLAIM]),
+            True,
+            _segundos_hasta(self.payload['exp'])
+        )
+        return resultado
+
+
+def depurar_tokens_expirados(tamano_lote=1000, pausa=0):
+    """
+    Elimina por lotes los tokens expirados de la lista de outstanding
+    (y en cascada su registro en blacklist).
+
+    Cada lote se borra en su propia transacción para no mantener locks
+    largos. Pensado para ejecutarse desde cron o cualquier scheduler,
+    directamente o mediante el comando depurar_tokens.
+
+    Args:
+        tamano_lote: Cantidad de tokens por lote
+        pausa: Segundos de espera entre lotes
+
+    Returns:
+        Cantidad de tokens eliminados
+    """
+    ahora = aware_utcnow()
+    eliminados = 0
+
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=ahora)
+            .order_by()
+            .values_list('id', flat=True)[:tamano_lote]
+        )
+        if not ids:
+            break
+
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+
+        eliminados += len(ids)
+        if pausa:
+            sleep(pausa)
+
+    return eliminados
+
+
+def _depurar_si_corresponde():
+    # La caché (compartida con REDIS_URL) reparte el turno: un solo worker
+    # depura por intervalo
+    if cache.add('jwt_depuracion', True, settings.JWT_DEPURACION_INTERVALO):
+        depurar_tokens_expirados()
+
+
+_depuracion = TareaPeriodica(
+    'depurar-tokens', _depurar_si_corresponde, lambda: settings.JWT_DEPURACION_INTERVALO
+)
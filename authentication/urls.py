@@ -1,15 +1,19 @@
 from . import views
 from django.urls import path
+from .serializers import TokenRefreshCacheadoSerializer
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('refresh/', TokenRefreshView.as_view(serializer_class=TokenRefreshCacheadoSerializer), name='token-refresh'),
     path('activity/', views.user_activity, name='user-activity'),
 
     path('profesores/', views.profesor_list_create, name='profesor-list-create'),
     path('profesores/<int:pk>/', views.profesor_detail, name='profesor-detail'),
 
     path('alumnos/', views.alumno_list_create, name='alumno-list-create'),
+    path('alumnos/importar/', views.alumno_importar, name='alumno-importar'),
     path('alumnos/<int:pk>/', views.alumno_detail, name='alumno-detail'),
 
     path('dashboard/director/', views.dashboard_director, name='dashboard-director'),
@@ -5,11 +5,18 @@ from datetime import timedelta
 from rest_framework import status
 from django.utils import timezone
 from shared.permissions import IsDirector
+from shared.serializacion import serializar_lista
+from shared.campos import campos_solicitados, podar_queryset
+from shared.routers import lectura_en_replica
+from shared.asincrono import api_async, en_paralelo, respuesta_api
+from shared.busqueda import filtrar_por_texto
 from django.core.paginator import Paginator
 from rest_framework.response import Response
 from .models import Usuario, Profesor, Alumno
+from .tokens import RefreshTokenCacheado
+from shared.trabajos import encolar
+from shared.serializers import TrabajoSerializer
 from audit.utils import registrar_accion_bitacora
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -29,7 +36,7 @@ def login_view(request):
 
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = RefreshTokenCacheado.for_user(user)
 
         registrar_accion_bitacora(user, 'LOGIN', request)
 
@@ -69,7 +76,7 @@ def logout_view(request):
 
         # Invalidar refresh token (blacklist)
         try:
-            token = RefreshToken(refresh_token)
+            token = RefreshTokenCacheado(refresh_token)
             token.blacklist()
         except TokenError:
             pass  # Token ya inválido o no existe
@@ -96,6 +103,7 @@ def logout_view(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@lectura_en_replica
 def user_activity(request):
     """
     Ver actividad de usuarios (solo directores)
@@ -171,12 +179,8 @@ def profesor_list_create(request):
         queryset = Profesor.objects.all().select_related('usuario').order_by('-created_at')
 
         if search:
-            queryset = queryset.filter(
-                Q(nombres__icontains=search) |
-                Q(apellidos__icontains=search) |
-                Q(usuario__email__icontains=search) |
-                Q(cedula_identidad__icontains=search)
-            )
+            # Nombres, apellidos, email y CI (sin distinguir acentos)
+            queryset = filtrar_por_texto(queryset, search)
 
         if especialidad:
             queryset = queryset.filter(especialidad__icontains=especialidad)
@@ -185,6 +189,10 @@ def profesor_list_create(request):
             activo_bool = activo.lower() == 'true'
             queryset = queryset.filter(usuario__activo=activo_bool)
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, ProfesorListSerializer)
+        queryset = podar_queryset(queryset, ProfesorListSerializer, campos, expandir)
+
         # Paginar
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
@@ -196,15 +204,13 @@ def profesor_list_create(request):
         )
 
         # Serializar
-        serializer = ProfesorListSerializer(page_obj.object_list, many=True)
-
         return Response({
             'count': paginator.count,
             'total_pages': paginator.num_pages,
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(ProfesorListSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -346,12 +352,8 @@ def alumno_list_create(request):
         ).order_by('-created_at')
 
         if search:
-            queryset = queryset.filter(
-                Q(nombres__icontains=search) |
-                Q(apellidos__icontains=search) |
-                Q(usuario__email__icontains=search) |
-                Q(matricula__icontains=search)
-            )
+            # Nombres, apellidos, email y matrícula (sin distinguir acentos)
+            queryset = filtrar_por_texto(queryset, search)
 
         if grupo:
             queryset = queryset.filter(grupo_id=grupo)
@@ -363,20 +365,22 @@ def alumno_list_create(request):
             activo_bool = activo.lower() == 'true'
             queryset = queryset.filter(usuario__activo=activo_bool)
 
+        # Campos pedidos (?fields= / ?expand=)
+        campos, expandir = campos_solicitados(request, AlumnoListSerializer)
+        queryset = podar_queryset(queryset, AlumnoListSerializer, campos, expandir)
+
         # Paginar
         paginator = Paginator(queryset, page_size)
         page_obj = paginator.get_page(page)
 
         # Serializar
-        serializer = AlumnoListSerializer(page_obj.object_list, many=True)
-
         return Response({
             'count': paginator.count,
             'total_pages': paginator.num_pages,
             'current_page': page_obj.number,
             'next': page_obj.has_next(),
             'previous': page_obj.has_previous(),
-            'results': serializer.data
+            'results': serializar_lista(AlumnoListSerializer, page_obj.object_list, campos, expandir)
         })
 
     elif request.method == 'POST':
@@ -398,6 +402,35 @@ def alumno_list_create(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsDirector])
+def alumno_importar(request):
+    """
+    Importación masiva de alumnos desde un archivo CSV o XLSX (campo 'archivo').
+    Columnas: email, password, matricula, nombres, apellidos, fecha_nacimiento,
+    genero, telefono, direccion, nombre_tutor, telefono_tutor, nivel, letra
+
+    La importación corre en segundo plano (procesar_trabajos): responde 202 con
+    el trabajo, cuyo resultado se consulta en /api/trabajos/<id>/.
+    """
+    archivo = request.FILES.get('archivo')
+    if not archivo:
+        return Response(
+            {'error': 'Debe adjuntar un archivo CSV o XLSX en el campo archivo'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    trabajo = encolar('importar_alumnos', request.user, entrada=archivo)
+
+    registrar_accion_bitacora(
+        request.user,
+        f'IMPORTAR_ALUMNOS: trabajo {trabajo.pk}',
+        request
+    )
+
+    return Response(TrabajoSerializer(trabajo).data, status=status.HTTP_202_ACCEPTED)
+
+
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsDirector])
 def alumno_detail(request, pk):
@@ -460,63 +493,93 @@ def alumno_detail(request, pk):
 
 
 # Vista de estadísticas básicas
-@api_view(['GET'])
-@permission_classes([IsDirector])
-def dashboard_director(request):
-    """Dashboard completo para directores"""
+@api_async(IsDirector)
+@lectura_en_replica
+async def dashboard_director(request):
+    """
+    Dashboard completo para directores.
+    Las consultas independientes se ejecutan en paralelo (ver shared.asincrono).
+    """
     from academic.models import Materia, Aula, Gestion, Trimestre, Horario, Matriculacion
     from datetime import date
+    from django.db.models import Count
+    from authentication.serializers import ProfesorListSerializer, AlumnoListSerializer
+
+    datos = await en_paralelo(
+        # Estadísticas básicas
+        total_profesores=Profesor.objects.count,
+        profesores_activos=Profesor.objects.filter(usuario__activo=True).count,
+        total_alumnos=Alumno.objects.count,
+        alumnos_activos=Alumno.objects.filter(usuario__activo=True).count,
+        total_materias=Materia.objects.count,
+        total_aulas=Aula.objects.count,
+        usuarios_total=Usuario.objects.count,
+        usuarios_activos=Usuario.objects.filter(activo=True).count,
+        # Gestión académica actual
+        gestion_activa=Gestion.objects.filter(activa=True).first,
+        # Estadísticas adicionales
+        materias_sin_profesor=Materia.objects.filter(profesormateria__isnull=True).count,
+        profesores_sin_materia=Profesor.objects.filter(profesormateria__isnull=True).count,
+        aulas_sin_horario=Aula.objects.filter(horario__isnull=True).count,
+        alumnos_sin_matricular=Alumno.objects.filter(matriculacion__isnull=True).count,
+        # Datos para gráficos
+        ultimos_profesores=lambda: ProfesorListSerializer(
+            Profesor.objects.select_related('usuario').order_by('-created_at')[:5], many=True
+        ).data,
+        ultimos_alumnos=lambda: AlumnoListSerializer(
+            Alumno.objects.select_related('usuario').order_by('-created_at')[:5], many=True
+        ).data,
+        # Distribución de alumnos por nivel
+        distribucion_por_nivel=lambda: list(Alumno.objects.values(
+            'grupo__nivel__numero', 'grupo__nivel__nombre'
+        ).annotate(
+            total_alumnos=Count('usuario')
+        ).order_by('grupo__nivel__numero')),
+    )
 
-    # Estadísticas básicas (ya existentes)
     stats = {
-        'total_profesores': Profesor.objects.count(),
-        'profesores_activos': Profesor.objects.filter(usuario__activo=True).count(),
-        'total_alumnos': Alumno.objects.count(),
-        'alumnos_activos': Alumno.objects.filter(usuario__activo=True).count(),
-        'total_materias': Materia.objects.count(),
-        'total_aulas': Aula.objects.count(),
-        'usuarios_total': Usuario.objects.count(),
-        'usuarios_activos': Usuario.objects.filter(activo=True).count(),
+        clave: datos[clave] for clave in (
+            'total_profesores', 'profesores_activos', 'total_alumnos', 'alumnos_activos',
+            'total_materias', 'total_aulas', 'usuarios_total', 'usuarios_activos'
+        )
     }
 
-    # ===== NUEVAS ESTADÍSTICAS =====
-
-    # Gestión académica actual
-    gestion_activa = Gestion.objects.filter(activa=True).first()
+    gestion_activa = datos['gestion_activa']
     if gestion_activa:
+        def trimestre_actual():
+            # Trimestre actual (basado en fecha) y sus horarios
+            hoy = date.today()
+            trimestre = Trimestre.objects.filter(
+                gestion=gestion_activa, fecha_inicio__lte=hoy, fecha_fin__gte=hoy
+            ).first()
+            if trimestre is None:
+                return None, None
+            return trimestre, Horario.objects.filter(trimestre=trimestre).count()
+
+        gestion = await en_paralelo(
+            total_matriculaciones=Matriculacion.objects.filter(gestion=gestion_activa, activa=True).count,
+            trimestres_gestion=Trimestre.objects.filter(gestion=gestion_activa).count,
+            trimestre_actual=trimestre_actual,
+        )
+
         stats.update({
             'gestion_activa': {
                 'id': gestion_activa.id,
                 'anio': gestion_activa.anio,
                 'nombre': gestion_activa.nombre
             },
-            'total_matriculaciones': Matriculacion.objects.filter(
-                gestion=gestion_activa, activa=True
-            ).count(),
-            'trimestres_gestion': Trimestre.objects.filter(
-                gestion=gestion_activa
-            ).count()
+            'total_matriculaciones': gestion['total_matriculaciones'],
+            'trimestres_gestion': gestion['trimestres_gestion'],
         })
 
-        # Trimestre actual (basado en fecha)
-        hoy = date.today()
-        trimestre_actual = Trimestre.objects.filter(
-            gestion=gestion_activa,
-            fecha_inicio__lte=hoy,
-            fecha_fin__gte=hoy
-        ).first()
-
-        if trimestre_actual:
+        trimestre, horarios_activos = gestion['trimestre_actual']
+        if trimestre:
             stats['trimestre_actual'] = {
-                'id': trimestre_actual.id,
-                'numero': trimestre_actual.numero,
-                'nombre': trimestre_actual.nombre
+                'id': trimestre.id,
+                'numero': trimestre.numero,
+                'nombre': trimestre.nombre
             }
-
-            # Horarios del trimestre actual
-            stats['horarios_activos'] = Horario.objects.filter(
-                trimestre=trimestre_actual
-            ).count()
+            stats['horarios_activos'] = horarios_activos
     else:
         stats.update({
             'gestion_activa': None,
@@ -526,41 +589,19 @@ def dashboard_director(request):
             'horarios_activos': 0
         })
 
-    # Estadísticas adicionales
+    # Sin gestión activa, aulas sin horario y alumnos sin matricular son todos
     stats.update({
-        'materias_sin_profesor': Materia.objects.filter(
-            profesormateria__isnull=True
-        ).count(),
-        'profesores_sin_materia': Profesor.objects.filter(
-            profesormateria__isnull=True
-        ).count(),
-        'aulas_sin_horario': Aula.objects.filter(
-            horario__isnull=True
-        ).count() if gestion_activa else Aula.objects.count(),
-        'alumnos_sin_matricular': Alumno.objects.filter(
-            matriculacion__isnull=True
-        ).count() if gestion_activa else Alumno.objects.count()
+        'materias_sin_profesor': datos['materias_sin_profesor'],
+        'profesores_sin_materia': datos['profesores_sin_materia'],
+        'aulas_sin_horario': datos['aulas_sin_horario'] if gestion_activa else stats['total_aulas'],
+        'alumnos_sin_matricular': datos['alumnos_sin_matricular'] if gestion_activa else stats['total_alumnos'],
     })
 
-    # Datos para gráficos
-    ultimos_profesores = Profesor.objects.select_related('usuario').order_by('-created_at')[:5]
-    ultimos_alumnos = Alumno.objects.select_related('usuario').order_by('-created_at')[:5]
-
-    # Distribución de alumnos por nivel
-    from django.db.models import Count
-    from authentication.serializers import ProfesorListSerializer, AlumnoListSerializer
-
-    distribucion_niveles = Alumno.objects.values(
-        'grupo__nivel__numero', 'grupo__nivel__nombre'
-    ).annotate(
-        total_alumnos=Count('id')
-    ).order_by('grupo__nivel__numero')
-
-    return Response({
+    return respuesta_api({
         'estadisticas': stats,
-        'ultimos_profesores': ProfesorListSerializer(ultimos_profesores, many=True).data,
-        'ultimos_alumnos': AlumnoListSerializer(ultimos_alumnos, many=True).data,
-        'distribucion_por_nivel': list(distribucion_niveles),
+        'ultimos_profesores': datos['ultimos_profesores'],
+        'ultimos_alumnos': datos['ultimos_alumnos'],
+        'distribucion_por_nivel': datos['distribucion_por_nivel'],
         'alertas': [
             f"{stats['materias_sin_profesor']} materias sin profesor asignado" if stats[
                                                                                       'materias_sin_profesor'] > 0 else None,
@@ -10,7 +10,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from authentication.last_login import activar_flush_al_salir
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_colegio.settings')
+# También con uvicorn directo (sin gunicorn.conf.py): bajo ASGI los
+# settings usan CONN_MAX_AGE = 0
+os.environ.setdefault('GUNICORN_SERVIDOR', 'asgi')
 
 application = get_asgi_application()
+
+# Los logins pendientes se guardan al salir del servidor (runserver, uvicorn)
+activar_flush_al_salir()
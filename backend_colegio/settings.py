@@ -16,6 +16,7 @@ from decouple import config
 from dotenv import load_dotenv
 from datetime import timedelta
 from urllib.parse import urlparse
+from django.core.exceptions import ImproperlyConfigured
 
 load_dotenv()
 
@@ -63,6 +64,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero para medir toda la petición; inactivo salvo con PERFIL_SQL
+    'shared.perfilado.PerfiladoSQLMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -90,6 +93,20 @@ TEMPLATES = [
     },
 ]
 
+# Serialización JSON de la API: 'orjson' (rápido, con fallback a la librería
+# estándar si orjson no está instalado) o 'json' (renderer y parser de DRF)
+API_JSON_BACKENDS = {
+    'orjson': ('shared.renderers.ORJSONRenderer', 'shared.parsers.ORJSONParser'),
+    'json': ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser'),
+}
+
+API_JSON_BACKEND = config('API_JSON_BACKEND', default='orjson')
+
+if API_JSON_BACKEND not in API_JSON_BACKENDS:
+    raise ImproperlyConfigured(
+        f"API_JSON_BACKEND debe ser uno de: {', '.join(API_JSON_BACKENDS)}"
+    )
+
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -99,7 +116,12 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        API_JSON_BACKENDS[API_JSON_BACKEND][0],
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        API_JSON_BACKENDS[API_JSON_BACKEND][1],
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
@@ -112,6 +134,36 @@ SIMPLE_JWT = {
     'UPDATE_LAST_LOGIN': False,
 }
 
+# Caché (Redis opcional; sin REDIS_URL cada proceso usa su propia caché en memoria)
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Segundos que se cachea "token no está en blacklist"; solo es seguro con caché compartida
+JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT = config(
+    'JWT_BLACKLIST_CACHE_NEGATIVE_TIMEOUT', default=30 if REDIS_URL else 0, cast=int
+)
+
+# Segundos entre depuraciones de refresh tokens expirados en segundo plano
+# (0 = solo con el comando depurar_tokens, p. ej. desde cron)
+JWT_DEPURACION_INTERVALO = config('JWT_DEPURACION_INTERVALO', default=6 * 60 * 60, cast=int)
+
+# last_login se actualiza por lotes a partir de la bitácora (ver authentication.last_login)
+LAST_LOGIN_FLUSH_INTERVAL = config('LAST_LOGIN_FLUSH_INTERVAL', default=30, cast=int)  # segundos
+LAST_LOGIN_FLUSH_MAX = config('LAST_LOGIN_FLUSH_MAX', default=200, cast=int)  # usuarios pendientes
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -124,21 +176,159 @@ WSGI_APPLICATION = 'backend_colegio.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-tmpPostgres = urlparse(os.getenv("DATABASE_URL"))
-
-DATABASES = {
-    'default': {
+# Conexiones persistentes: cada worker reutiliza su conexión hasta DB_CONN_MAX_AGE
+# segundos (0 = una por petición) y la verifica antes de usarla tras un corte.
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+# Bajo ASGI cada petición usa un hilo distinto y sus conexiones no se
+# reutilizan: persistirlas solo las acumula, así que se ignora DB_CONN_MAX_AGE
+# (Django recomienda 0). asgi.py lo completa (sin pisarlo) también sin gunicorn.
+SERVIDOR_ASGI = config('GUNICORN_SERVIDOR', default='wsgi') == 'asgi'
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+DB_CONNECT_TIMEOUT = config('DB_CONNECT_TIMEOUT', default=10, cast=int)  # segundos
+
+# Pool de conexiones de psycopg 3 (psycopg[pool]); reemplaza a DB_CONN_MAX_AGE
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)  # segundos esperando conexión libre
+
+# Detrás de pgbouncer en modo transaction: sin cursores del servidor (no
+# sobreviven entre transacciones) y sin pool propio (el pool es pgbouncer).
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
+
+if DB_POOL and DB_PGBOUNCER:
+    raise ImproperlyConfigured('DB_POOL y DB_PGBOUNCER son excluyentes: pgbouncer ya es el pool')
+
+
+def _base_de_datos(url):
+    """Configuración de una base a partir de su URL y de las opciones DB_*"""
+    url = urlparse(url)
+    if url.scheme == 'sqlite':
+        # Solo para pruebas locales (ej: réplica de prueba): sqlite:///ruta/archivo.db
+        return {'ENGINE': 'django.db.backends.sqlite3', 'NAME': url.path}
+
+    base = {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': tmpPostgres.path.replace('/', ''),
-        'USER': tmpPostgres.username,
-        'PASSWORD': tmpPostgres.password,
-        'HOST': tmpPostgres.hostname,
-        'PORT': 5432,
+        'NAME': url.path.replace('/', ''),
+        'USER': url.username,
+        'PASSWORD': url.password,
+        'HOST': url.hostname,
+        'PORT': url.port or 5432,
+        'CONN_MAX_AGE': 0 if SERVIDOR_ASGI else DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {'connect_timeout': DB_CONNECT_TIMEOUT},
     }
+
+    if DB_POOL:
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured('DB_POOL requiere psycopg 3 con pool: pip install "psycopg[pool]"')
+        # Django no admite conexiones persistentes junto con el pool
+        base['CONN_MAX_AGE'] = 0
+        base['OPTIONS']['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+
+    return base
+
+
+DATABASES = {
+    'default': _base_de_datos(os.getenv("DATABASE_URL")),
 }
 
+# Réplica de lectura opcional para vistas @lectura_en_replica (ver shared.routers).
+# Si no responde o su retraso supera REPLICA_MAX_LAG, se lee de la primaria.
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+REPLICA_MAX_LAG = config('REPLICA_MAX_LAG', default=10, cast=float)  # segundos
+REPLICA_CHECK_INTERVAL = config('REPLICA_CHECK_INTERVAL', default=5, cast=int)  # segundos entre mediciones
+REPLICA_CONNECT_TIMEOUT = config('REPLICA_CONNECT_TIMEOUT', default=2, cast=int)  # segundos
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = _base_de_datos(DATABASE_REPLICA_URL)
+    if 'OPTIONS' in DATABASES['replica']:
+        # Una réplica caída no debe demorar la petición que la detecta
+        DATABASES['replica']['OPTIONS']['connect_timeout'] = REPLICA_CONNECT_TIMEOUT
+    # En tests la réplica es la misma base que la primaria
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['shared.routers.ReplicaRouter']
+
 AUTH_USER_MODEL = 'authentication.Usuario'  # ¡Muy importante!
 
+# Perfiles de hashing de contraseñas
+# El primer hasher del perfil activo se usa para contraseñas nuevas; las
+# guardadas con otro hasher se re-hashean al perfil activo en el siguiente login.
+# 'seguro' es el hasher por defecto de Django (PBKDF2-SHA256 con las iteraciones
+# que fija cada versión), sin ajustes propios; 'rapido' lo debilita a propósito.
+PASSWORD_HASHER_PROFILES = {
+    'seguro': ['django.contrib.auth.hashers.PBKDF2PasswordHasher'],  # producción
+    'rapido': ['authentication.hashers.PBKDF2RapidoPasswordHasher'],  # tests y seeding masivo
+}
+
+PASSWORD_HASHER_PROFILE = config('PASSWORD_HASHER_PROFILE', default='seguro')
+
+if PASSWORD_HASHER_PROFILE not in PASSWORD_HASHER_PROFILES:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER_PROFILE debe ser uno de: {', '.join(PASSWORD_HASHER_PROFILES)}"
+    )
+
+PASSWORD_HASHERS = list(dict.fromkeys(
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+    + [hasher for perfil in PASSWORD_HASHER_PROFILES.values() for hasher in perfil]
+    + [
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ]
+))
+
+# Procesos usados para hashear contraseñas en importaciones masivas
+PASSWORD_HASH_PROCESOS = config('PASSWORD_HASH_PROCESOS', default=os.cpu_count() or 1, cast=int)
+
+# Trabajos en segundo plano (shared.trabajos): segundos entre consultas del
+# proceso procesar_trabajos cuando no hay pendientes
+TRABAJOS_INTERVALO = config('TRABAJOS_INTERVALO', default=2, cast=float)
+
+# Procesos usados para renderizar boletines
+BOLETINES_PROCESOS = config('BOLETINES_PROCESOS', default=os.cpu_count() or 1, cast=int)
+
+# Procesos que siembran asistencias y notas en generar_datos_sinteticos
+DATOS_SINTETICOS_PROCESOS = config('DATOS_SINTETICOS_PROCESOS', default=os.cpu_count() or 1, cast=int)
+
+# Gráficos: procesos del pool de renderizado (0 = renderizar en el mismo proceso)
+# y segundos que se conserva cada imagen en caché
+GRAFICOS_PROCESOS = config('GRAFICOS_PROCESOS', default=2, cast=int)
+GRAFICOS_CACHE_TIMEOUT = config('GRAFICOS_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Consultas simultáneas de las vistas asíncronas (dashboard, estadísticas):
+# hilos del pool de shared.asincrono, cada uno con su conexión por worker
+# (0 = una tras otra en el hilo de la petición)
+CONSULTAS_PARALELAS = config('CONSULTAS_PARALELAS', default=4, cast=int)
+
+# Perfil SQL por petición (shared.perfilado): consultas, tiempo de base y
+# consultas repetidas (N+1) en el log shared.perfilado
+PERFIL_SQL = config('PERFIL_SQL', default=False, cast=bool)
+# Fracción de peticiones perfiladas (1 = todas)
+PERFIL_SQL_MUESTREO = config('PERFIL_SQL_MUESTREO', default=1.0, cast=float)
+# Peticiones más lentas (ms) se registran con todo su SQL
+PERFIL_SQL_LENTA_MS = config('PERFIL_SQL_LENTA_MS', default=500, cast=int)
+# Veces que debe repetirse un mismo SQL para considerarlo un N+1
+PERFIL_SQL_DUPLICADAS = config('PERFIL_SQL_DUPLICADAS', default=5, cast=int)
+# Cabeceras X-DB-Queries, X-DB-Time y X-DB-Duplicates en las respuestas
+PERFIL_SQL_CABECERAS = config('PERFIL_SQL_CABECERAS', default=False, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'consola': {'class': 'logging.StreamHandler'}},
+    'loggers': {
+        'shared.perfilado': {'handlers': ['consola'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -173,6 +363,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Archivos de los trabajos en segundo plano (entradas subidas y resultados).
+# Web y procesar_trabajos deben ver la misma carpeta.
+MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -25,4 +25,5 @@ urlpatterns = [
     path('api/evaluations/', include('evaluations.urls')),
     path('api/predictions/', include('predictions.urls')),
     path('api/audit/', include('audit.urls')),
+    path('api/trabajos/', include('shared.urls')),
 ]
@@ -10,7 +10,11 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from authentication.last_login import activar_flush_al_salir
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_colegio.settings')
 
 application = get_wsgi_application()
+
+# Los logins pendientes se guardan al salir del servidor (runserver, uvicorn)
+activar_flush_al_salir()
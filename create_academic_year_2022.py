@@ -44,37 +44,8 @@ NUEVAS_MATERIAS = [
     ('MUS', 'Música', 'Educación Musical', 2)
 ]
 
-# Perfiles de estudiantes para ML
-STUDENT_PROFILES = {
-    'excelente': {
-        'peso': 15,
-        'nota_base': (85, 98),
-        'asistencia_rate': 0.96,
-        'participacion_freq': 0.85,
-        'tendencia': 'estable'
-    },
-    'bueno': {
-        'peso': 35,
-        'nota_base': (70, 84),
-        'asistencia_rate': 0.90,
-        'participacion_freq': 0.65,
-        'tendencia': 'mejora'
-    },
-    'regular': {
-        'peso': 35,
-        'nota_base': (55, 69),
-        'asistencia_rate': 0.78,
-        'participacion_freq': 0.45,
-        'tendencia': 'irregular'
-    },
-    'bajo': {
-        'peso': 15,
-        'nota_base': (25, 54),
-        'asistencia_rate': 0.65,
-        'participacion_freq': 0.25,
-        'tendencia': 'declive'
-    }
-}
+# Perfiles de estudiantes compartidos con generar_datos_sinteticos
+from evaluations.sintetico import STUDENT_PROFILES
 
 def main():
     """Función principal"""
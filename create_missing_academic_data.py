@@ -34,33 +34,8 @@ random.seed(2022)
 # Configuración
 YEAR = 2022
 
-# Perfiles de estudiantes (mismo que el script anterior)
-STUDENT_PROFILES = {
-    'excelente': {
-        'nota_base': (85, 98),
-        'asistencia_rate': 0.96,
-        'participacion_freq': 0.85,
-        'tarea_bonus': 10  # Bonus en tareas
-    },
-    'bueno': {
-        'nota_base': (70, 84),
-        'asistencia_rate': 0.90,
-        'participacion_freq': 0.65,
-        'tarea_bonus': 5
-    },
-    'regular': {
-        'nota_base': (55, 69),
-        'asistencia_rate': 0.78,
-        'participacion_freq': 0.45,
-        'tarea_bonus': 0
-    },
-    'bajo': {
-        'nota_base': (25, 54),
-        'asistencia_rate': 0.65,
-        'participacion_freq': 0.25,
-        'tarea_bonus': -5  # Penalización en tareas
-    }
-}
+# Perfiles de estudiantes compartidos con generar_datos_sinteticos
+from evaluations.sintetico import STUDENT_PROFILES
 
 
 def main():
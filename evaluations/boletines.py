@@ -0,0 +1,185 @@
+import tempfile
+import zipfile
+from collections import defaultdict
+from django.db.models import Avg, Count
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from django.utils.text import slugify
+from django.template.loader import render_to_string
+from academic.models import Gestion, Grupo, Trimestre, Matriculacion
+from shared.procesos import mapear_en_procesos
+from shared.trabajos import ErrorTrabajo
+from .models import HistoricoTrimestral, HistoricoAnual, Asistencia, Participacion, EstadoAsistencia, EstadoMateria
+
+
+def datos_boletines(gestion, grupo=None, trimestre=None):
+    """
+    Reúne los datos de los boletines con una consulta por tabla.
+
+    Args:
+        gestion: Gestion de los boletines
+        grupo: Grupo opcional (por defecto, todo el colegio)
+        trimestre: Trimestre opcional; muestra las notas hasta ese trimestre y
+            la asistencia y participación de ese trimestre
+
+    Returns:
+        Lista de contextos (diccionarios serializables con pickle), uno por alumno
+    """
+    matriculaciones = Matriculacion.objects.filter(gestion=gestion, activa=True)
+    if grupo is not None:
+        matriculaciones = matriculaciones.filter(alumno__grupo=grupo)
+    alumnos_ids = matriculaciones.values('alumno_id')
+
+    historico_trimestral = HistoricoTrimestral.objects.filter(
+        trimestre__gestion=gestion, alumno_id__in=alumnos_ids
+    )
+    asistencias = Asistencia.objects.filter(matriculacion__in=matriculaciones)
+    participaciones = Participacion.objects.filter(matriculacion__in=matriculaciones)
+    if trimestre is not None:
+        historico_trimestral = historico_trimestral.filter(trimestre__numero__lte=trimestre.numero)
+        asistencias = asistencias.filter(horario__trimestre=trimestre)
+        participaciones = participaciones.filter(horario__trimestre=trimestre)
+
+    materias = defaultdict(dict)
+    for fila in historico_trimestral.values(
+        'alumno_id', 'materia__codigo', 'materia__nombre', 'trimestre__numero', 'promedio_trimestre'
+    ):
+        materia = materias[fila['alumno_id']].setdefault(fila['materia__codigo'], {
+            'codigo': fila['materia__codigo'], 'nombre': fila['materia__nombre'], 'trimestres': {}
+        })
+        materia['trimestres'][fila['trimestre__numero']] = fila['promedio_trimestre']
+
+    # El cierre anual solo se muestra en el boletín final
+    if trimestre is None:
+        for fila in HistoricoAnual.objects.filter(gestion=gestion, alumno_id__in=alumnos_ids).values(
+            'alumno_id', 'materia__codigo', 'materia__nombre', 'promedio_anual', 'estado_materia'
+        ):
+            materia = materias[fila['alumno_id']].setdefault(fila['materia__codigo'], {
+                'codigo': fila['materia__codigo'], 'nombre': fila['materia__nombre'], 'trimestres': {}
+            })
+            materia['promedio_anual'] = fila['promedio_anual']
+            materia['estado'] = EstadoMateria(fila['estado_materia']).label
+            materia['reprobado'] = fila['estado_materia'] == EstadoMateria.REPROBADO
+
+    asistencia = defaultdict(dict)
+    for fila in asistencias.values('matriculacion__alumno_id', 'estado').annotate(cantidad=Count('id')).order_by():
+        asistencia[fila['matriculacion__alumno_id']][fila['estado']] = fila['cantidad']
+
+    participacion = {
+        fila['matriculacion__alumno_id']: fila
+        for fila in participaciones.values('matriculacion__alumno_id').annotate(
+            cantidad=Count('id'), promedio=Avg('valor')
+        ).order_by()
+    }
+
+    numeros_trimestre = [1, 2, 3] if trimestre is None else list(range(1, trimestre.numero + 1))
+    fecha_emision = timezone.localdate()
+    contextos = []
+
+    for alumno in matriculaciones.order_by(
+        'alumno__grupo__nivel__numero', 'alumno__grupo__letra', 'alumno__apellidos', 'alumno__nombres'
+    ).values(
+        'alumno_id', 'alumno__matricula', 'alumno__nombres', 'alumno__apellidos',
+        'alumno__grupo__nivel__numero', 'alumno__grupo__letra'
+    ):
+        alumno_id = alumno['alumno_id']
+        conteo = asistencia.get(alumno_id, {})
+        total = sum(conteo.values())
+        presentes = conteo.get(EstadoAsistencia.PRESENTE, 0) + conteo.get(EstadoAsistencia.TARDANZA, 0)
+
+        contextos.append({
+            'gestion': {'anio': gestion.anio, 'nombre': gestion.nombre},
+            'trimestre': trimestre.nombre if trimestre is not None else None,
+            'numeros_trimestre': numeros_trimestre,
+            'alumno': {
+                'matricula': alumno['alumno__matricula'],
+                'nombres': alumno['alumno__nombres'],
+                'apellidos': alumno['alumno__apellidos'],
+                'grupo': f"{alumno['alumno__grupo__nivel__numero']}{alumno['alumno__grupo__letra']}",
+            },
+            'materias': [
+                {**materia, 'notas': [materia['trimestres'].get(numero) for numero in numeros_trimestre]}
+                for _, materia in sorted(materias.get(alumno_id, {}).items())
+            ],
+            'asistencia': {
+                'estados': [(etiqueta, conteo.get(valor, 0)) for valor, etiqueta in EstadoAsistencia.choices],
+                'total': total,
+                'porcentaje': round(presentes * 100 / total, 2) if total else None,
+            },
+            'participacion': participacion.get(alumno_id, {'cantidad': 0, 'promedio': None}),
+            'fecha_emision': fecha_emision,
+        })
+
+    return contextos
+
+
+def renderizar_boletin(contexto):
+    """
+    Renderiza el boletín HTML de un alumno. Se ejecuta en los workers del pool.
+
+    Returns:
+        Tupla (ruta dentro del zip, contenido HTML)
+    """
+    alumno = contexto['alumno']
+    ruta = f"{alumno['grupo']}/{alumno['matricula']}_{slugify(alumno['apellidos'])}.html"
+    return ruta, render_to_string('evaluations/boletin.html', contexto)
+
+
+def generar_boletines(destino, gestion, grupo=None, trimestre=None, procesos=None):
+    """
+    Genera los boletines en un archivo zip.
+
+    El renderizado se reparte en un pool de procesos y cada boletín se
+    escribe en el zip en cuanto está listo, sin acumularlos en memoria.
+
+    Args:
+        destino: Ruta o archivo binario donde escribir el zip
+        gestion, grupo, trimestre: Ver datos_boletines
+        procesos: Procesos del pool (por defecto BOLETINES_PROCESOS)
+
+    Returns:
+        Cantidad de boletines generados
+    """
+    contextos = datos_boletines(gestion, grupo, trimestre)
+    procesos = procesos or settings.BOLETINES_PROCESOS
+    chunksize = max(1, len(contextos) // (procesos * 4))
+
+    with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as archivo:
+        for ruta, html in mapear_en_procesos(renderizar_boletin, contextos, procesos, chunksize):
+            archivo.writestr(ruta, html)
+
+    return len(contextos)
+
+
+def nombre_zip(gestion, grupo=None):
+    sufijo = f'_{grupo.nivel.numero}{grupo.letra}' if grupo is not None else ''
+    return f'boletines_{gestion.anio}{sufijo}.zip'
+
+
+def trabajo_boletines(trabajo):
+    """
+    Trabajo 'boletines' (ver shared.trabajos): genera el zip en trabajo.archivo.
+    Parámetros: gestion (id), grupo (id, opcional), trimestre (número, opcional).
+
+    Returns:
+        Diccionario con la cantidad de boletines generados
+    """
+    parametros = trabajo.parametros
+    try:
+        gestion = Gestion.objects.get(pk=parametros['gestion'])
+        grupo = None
+        if parametros.get('grupo'):
+            grupo = Grupo.objects.select_related('nivel').get(pk=parametros['grupo'])
+        trimestre = None
+        if parametros.get('trimestre'):
+            trimestre = Trimestre.objects.get(gestion=gestion, numero=parametros['trimestre'])
+    except (Gestion.DoesNotExist, Grupo.DoesNotExist, Trimestre.DoesNotExist):
+        raise ErrorTrabajo('La gestión, el grupo o el trimestre ya no existen')
+
+    with tempfile.TemporaryFile() as archivo:
+        generados = generar_boletines(archivo, gestion, grupo, trimestre)
+        archivo.seek(0)
+        trabajo.archivo.save(nombre_zip(gestion, grupo), File(archivo), save=False)
+
+    return {'generados': generados}
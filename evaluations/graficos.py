@@ -0,0 +1,230 @@
+import io
+import json
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, F, Value, Subquery, OuterRef, IntegerField
+from django.db.models.functions import Floor, Least, TruncWeek
+from predictions.models import PrediccionRendimiento
+from shared.procesos import inicializar_django
+from shared.diferido import importar_diferido
+from shared.condicional import version_datos
+from .models import NotaExamen, Asistencia, HistoricoTrimestral, EstadoAsistencia
+
+# matplotlib se carga con el primer gráfico, no al arrancar cada worker
+figure = importar_diferido('matplotlib.figure')
+backend_agg = importar_diferido('matplotlib.backends.backend_agg')
+
+FORMATOS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+logger = logging.getLogger(__name__)
+
+# Segundos que se considera en curso un renderizado: evita encargar el mismo
+# gráfico dos veces, y si el pool lo pierde se vuelve a encargar al vencer
+RENDER_EN_CURSO = 60
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_graficos():
+    # 'spawn' evita heredar hilos y conexiones del proceso del servidor
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.GRAFICOS_PROCESOS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=inicializar_django
+            )
+        return _pool
+
+
+def renderizar(tipo, datos, formato):
+    """
+    Dibuja un gráfico con el backend Agg y devuelve la imagen en bytes.
+    Función pura (sin acceso a la base) para poder ejecutarse en el pool.
+    """
+    figura = figure.Figure(figsize=(8, 4.5), dpi=100)
+    backend_agg.FigureCanvasAgg(figura)
+    ejes = figura.add_subplot()
+
+    if tipo == 'distribucion_notas':
+        etiquetas = [f'{inicio}-{inicio + 9}' for inicio in range(0, 90, 10)] + ['90-100']
+        ejes.bar(etiquetas, datos['conteos'], color='#4c72b0')
+        ejes.set_xlabel('Nota')
+        ejes.set_ylabel('Cantidad de notas')
+    elif tipo == 'tendencia_asistencia':
+        ejes.plot(datos['semanas'], datos['porcentajes'], marker='o', markersize=3, color='#55a868')
+        ejes.set_ylim(0, 100)
+        ejes.set_xlabel('Semana')
+        ejes.set_ylabel('% asistencia')
+        figura.autofmt_xdate()
+    elif tipo == 'prediccion_vs_real':
+        ejes.scatter(datos['predichas'], datos['reales'], alpha=0.6, color='#c44e52')
+        ejes.plot([0, 100], [0, 100], linestyle='--', color='#888888')
+        ejes.set_xlim(0, 100)
+        ejes.set_ylim(0, 100)
+        ejes.set_xlabel('Nota predicha')
+        ejes.set_ylabel('Nota real')
+    else:
+        raise ValueError(f'Tipo de gráfico desconocido: {tipo}')
+
+    ejes.set_title(datos['titulo'])
+    ejes.grid(alpha=0.3)
+
+    buffer = io.BytesIO()
+    figura.savefig(buffer, format=formato, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _descartar_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def _encargar_render(clave, tipo, datos, formato):
+    """
+    Encarga el renderizado al pool sin esperarlo: al terminar, un callback
+    guarda la imagen en caché y la petición siguiente la encuentra ahí.
+    """
+    def guardar(futuro):
+        try:
+            cache.set(f'grafico:{clave}', futuro.result(), settings.GRAFICOS_CACHE_TIMEOUT)
+        except BrokenProcessPool:
+            # Un worker murió: el próximo encargo crea un pool nuevo
+            _descartar_pool()
+            logger.exception('Se perdió el pool de gráficos')
+        except Exception:
+            logger.exception('No se pudo renderizar el gráfico %s', tipo)
+        finally:
+            cache.delete(f'grafico-en-curso:{clave}')
+
+    try:
+        futuro = _pool_graficos().submit(renderizar, tipo, datos, formato)
+    except BrokenProcessPool:
+        # Se rompió después del último encargo: uno nuevo
+        _descartar_pool()
+        futuro = _pool_graficos().submit(renderizar, tipo, datos, formato)
+    futuro.add_done_callback(guardar)
+
+
+def _obtener_grafico(tipo, parametros, formato, version, obtener_datos):
+    """
+    Devuelve (clave, imagen) usando la caché direccionada por contenido.
+
+    La clave es el hash del tipo, los parámetros y la versión de los datos,
+    así que cualquier cambio en los datos produce otra clave y una imagen
+    cacheada nunca queda desactualizada.
+
+    Si la imagen no está en caché y hay pool (GRAFICOS_PROCESOS > 0), se
+    encarga el renderizado y se devuelve None en lugar de la imagen: la
+    petición no queda esperando al pool.
+    """
+    clave = hashlib.sha256(
+        json.dumps([tipo, parametros, formato, version], default=str, sort_keys=True).encode()
+    ).hexdigest()
+
+    imagen = cache.get(f'grafico:{clave}')
+    if imagen is not None:
+        return clave, imagen
+
+    if settings.GRAFICOS_PROCESOS <= 0:
+        imagen = renderizar(tipo, obtener_datos(), formato)
+        cache.set(f'grafico:{clave}', imagen, settings.GRAFICOS_CACHE_TIMEOUT)
+        return clave, imagen
+
+    # Un solo encargo por clave entre todos los workers que comparten la caché
+    if cache.add(f'grafico-en-curso:{clave}', True, RENDER_EN_CURSO):
+        _encargar_render(clave, tipo, obtener_datos(), formato)
+    return clave, None
+
+
+def _versiones(*objetos):
+    # Los títulos usan sus nombres: renombrarlos también cambia la clave
+    return [(objeto._meta.label, objeto.pk, objeto.updated_at) for objeto in objetos if objeto is not None]
+
+
+def grafico_distribucion_notas(gestion, materia, formato='png'):
+    """Histograma de notas de exámenes de una materia en una gestión"""
+    notas = NotaExamen.objects.filter(
+        matriculacion__gestion=gestion, examen__profesor_materia__materia=materia
+    )
+
+    def datos():
+        conteos = [0] * 10
+        for fila in notas.annotate(
+            rango=Least(Floor(F('nota') / 10), Value(9), output_field=IntegerField())
+        ).values('rango').annotate(cantidad=Count('id')).order_by():
+            conteos[int(fila['rango'])] = fila['cantidad']
+        return {'titulo': f'Distribución de notas - {materia.nombre} {gestion.anio}', 'conteos': conteos}
+
+    return _obtener_grafico(
+        'distribucion_notas', [gestion.pk, materia.pk], formato,
+        [version_datos(notas), _versiones(gestion, materia)], datos
+    )
+
+
+def grafico_tendencia_asistencia(gestion, grupo, formato='png'):
+    """Porcentaje semanal de asistencia (presentes y tardanzas) de un grupo"""
+    asistencias = Asistencia.objects.filter(
+        matriculacion__gestion=gestion, horario__grupo=grupo
+    )
+
+    def datos():
+        semanas = asistencias.annotate(semana=TruncWeek('fecha')).values('semana').annotate(
+            total=Count('id'),
+            presentes=Count('id', filter=Q(estado__in=[EstadoAsistencia.PRESENTE, EstadoAsistencia.TARDANZA]))
+        ).order_by('semana')
+        return {
+            'titulo': f'Asistencia semanal - {grupo.nivel.numero}{grupo.letra} {gestion.anio}',
+            'semanas': [fila['semana'] for fila in semanas],
+            'porcentajes': [round(fila['presentes'] * 100 / fila['total'], 1) for fila in semanas],
+        }
+
+    return _obtener_grafico(
+        'tendencia_asistencia', [gestion.pk, grupo.pk], formato,
+        [version_datos(asistencias), _versiones(gestion, grupo, grupo.nivel)], datos
+    )
+
+
+def grafico_prediccion_vs_real(gestion, materia=None, formato='png'):
+    """Dispersión de notas predichas contra el promedio trimestral real"""
+    predicciones = PrediccionRendimiento.objects.filter(gestion=gestion, trimestre__isnull=False)
+    historico = HistoricoTrimestral.objects.filter(trimestre__gestion=gestion)
+    if materia is not None:
+        predicciones = predicciones.filter(materia=materia)
+        historico = historico.filter(materia=materia)
+
+    def datos():
+        pares = predicciones.annotate(
+            real=Subquery(
+                HistoricoTrimestral.objects.filter(
+                    alumno_id=OuterRef('alumno_id'),
+                    trimestre_id=OuterRef('trimestre_id'),
+                    materia_id=OuterRef('materia_id')
+                ).values('promedio_trimestre')[:1]
+            )
+        ).filter(real__isnull=False).values_list('nota_predicha', 'real')
+
+        predichas, reales = [], []
+        for predicha, real in pares:
+            predichas.append(float(predicha))
+            reales.append(float(real))
+
+        titulo = f'Predicción vs. real - {materia.nombre if materia else "todas las materias"} {gestion.anio}'
+        return {'titulo': titulo, 'predichas': predichas, 'reales': reales}
+
+    return _obtener_grafico(
+        'prediccion_vs_real', [gestion.pk, materia.pk if materia else None], formato,
+        [version_datos(predicciones, historico), _versiones(gestion, materia)], datos
+    )
@@ -0,0 +1,52 @@
+import re
+from time import perf_counter
+from django.core.management.base import BaseCommand, CommandError
+from academic.models import Gestion, Grupo, Trimestre
+from evaluations.boletines import generar_boletines, nombre_zip
+
+
+class Command(BaseCommand):
+    help = 'Genera los boletines HTML de una gestión (todo el colegio o un grupo) en un archivo zip'
+
+    def add_arguments(self, parser):
+        parser.add_argument('gestion', type=int, help='Año de la gestión')
+        parser.add_argument('--grupo', help='Grupo como nivel y letra, p. ej. 3A (por defecto todos)')
+        parser.add_argument('--trimestre', type=int, help='Número de trimestre (por defecto boletín anual)')
+        parser.add_argument('--salida', help='Ruta del zip (por defecto boletines_<gestion>.zip)')
+        parser.add_argument(
+            '--procesos', type=int, default=None,
+            help='Procesos de renderizado (por defecto BOLETINES_PROCESOS)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            gestion = Gestion.objects.get(anio=options['gestion'])
+        except Gestion.DoesNotExist:
+            raise CommandError('Gestión no encontrada')
+
+        grupo = None
+        if options['grupo']:
+            coincidencia = re.fullmatch(r'(\d)([A-Za-z])', options['grupo'])
+            if not coincidencia:
+                raise CommandError('El grupo debe tener la forma nivel y letra, p. ej. 3A')
+            try:
+                grupo = Grupo.objects.get(
+                    nivel__numero=coincidencia.group(1), letra=coincidencia.group(2).upper()
+                )
+            except Grupo.DoesNotExist:
+                raise CommandError('Grupo no encontrado')
+
+        trimestre = None
+        if options['trimestre']:
+            try:
+                trimestre = Trimestre.objects.get(gestion=gestion, numero=options['trimestre'])
+            except Trimestre.DoesNotExist:
+                raise CommandError('Trimestre no encontrado')
+
+        salida = options['salida'] or nombre_zip(gestion, grupo)
+        inicio = perf_counter()
+        generados = generar_boletines(salida, gestion, grupo, trimestre, options['procesos'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{generados} boletines generados en {salida} ({perf_counter() - inicio:.1f} s)'
+        ))
@@ -0,0 +1,83 @@
+from time import perf_counter
+from django.conf import settings
+from django.db import connection, connections
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from shared.procesos import mapear_en_procesos
+from evaluations.sintetico import (
+    PASSWORD, asegurar_estructura, colegio_generado, dominio, preparar_colegio, sembrar_fragmento
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera datos sintéticos deterministas para pruebas de carga: colegios con sus '
+        'profesores, alumnos, horarios, notas, asistencias y participaciones (PostgreSQL COPY)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--colegios', type=int, default=1, help='Colegios a generar (cada uno con su propio personal y alumnos)')
+        parser.add_argument('--alumnos', type=int, default=240, help='Alumnos por colegio')
+        parser.add_argument('--anios', type=int, default=1, help='Gestiones consecutivas a generar')
+        parser.add_argument('--desde', type=int, default=2022, help='Año de la primera gestión')
+        parser.add_argument(
+            '--dias', type=int, default=None,
+            help='Días de clase con asistencia por gestión (por defecto todos los días hábiles)'
+        )
+        parser.add_argument('--semilla', type=int, default=2022, help='Semilla: mismos parámetros, mismos datos')
+        parser.add_argument(
+            '--procesos', type=int, default=None,
+            help='Procesos que siembran notas y asistencias (por defecto DATOS_SINTETICOS_PROCESOS)'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('El generador escribe con COPY y requiere PostgreSQL')
+        if options['colegios'] < 1 or options['alumnos'] < 1 or options['anios'] < 1:
+            raise CommandError('--colegios, --alumnos y --anios deben ser al menos 1')
+        procesos = options['procesos'] or settings.DATOS_SINTETICOS_PROCESOS
+
+        inicio = perf_counter()
+        estructura = asegurar_estructura(options['desde'], options['anios'])
+        # Un solo hash para todos los usuarios: el costo del hasher no escala con el volumen
+        clave = make_password(PASSWORD)
+        totales = {}
+        fragmentos = []
+
+        def sumar(conteos):
+            for tabla, cantidad in conteos.items():
+                totales[tabla] = totales.get(tabla, 0) + cantidad
+
+        # Fase 1 (este proceso): estructura de cada colegio, confirmada para
+        # que los workers vean sus matriculaciones, horarios y evaluaciones
+        for colegio in range(1, options['colegios'] + 1):
+            if colegio_generado(colegio):
+                self.stdout.write(self.style.WARNING(f'Colegio {colegio} ya existe ({dominio(colegio)}), se omite'))
+                continue
+            conteos, nuevos = preparar_colegio(
+                colegio, estructura, options['alumnos'], options['dias'], options['semilla'], clave
+            )
+            sumar(conteos)
+            fragmentos.extend(nuevos)
+        self.stdout.write(f'Estructura: {sum(totales.values())} filas en {perf_counter() - inicio:.1f} s')
+
+        # Fase 2 (pool): un fragmento por trimestre, cada uno con su COPY y su
+        # transacción. Los workers (fork) no deben heredar la conexión abierta
+        connections.close_all()
+        parcial = perf_counter()
+        filas_estructura = sum(totales.values())
+        for conteos in mapear_en_procesos(sembrar_fragmento, fragmentos, procesos):
+            sumar(conteos)
+        self.stdout.write(
+            f'Notas y asistencias: {sum(totales.values()) - filas_estructura} filas en '
+            f'{perf_counter() - parcial:.1f} s ({min(procesos, len(fragmentos))} procesos, {len(fragmentos)} fragmentos)'
+        )
+
+        duracion = perf_counter() - inicio
+        for tabla, cantidad in sorted(totales.items()):
+            self.stdout.write(f'  {tabla:<22} {cantidad:>12}')
+        filas = sum(totales.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'{filas} filas en {duracion:.1f} s ({filas / duracion:.0f} filas/s). '
+            f'Usuarios: <rol><n>@{dominio(1)} ... con contraseña {PASSWORD}'
+        ))
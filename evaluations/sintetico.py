@@ -0,0 +1,497 @@
+import random
+from datetime import date, time, timedelta
+from django.db import transaction
+from django.utils import timezone
+from authentication.models import Usuario, Director, Profesor, Alumno
+from academic.models import (
+    Nivel, Grupo, Aula, Materia, ProfesorMateria, Gestion, Trimestre, Horario, Matriculacion
+)
+from shared.busqueda import normalizar_texto
+from shared.copia import copiar, copiar_lineas, reservar_ids, texto_copy
+from .models import Examen, NotaExamen, Tarea, NotaTarea, Asistencia, Participacion, EstadoAsistencia
+
+# Perfiles de rendimiento de los alumnos (los usan también los scripts create_*)
+STUDENT_PROFILES = {
+    'excelente': {
+        'peso': 15,
+        'nota_base': (85, 98),
+        'asistencia_rate': 0.96,
+        'participacion_freq': 0.85,
+        'tendencia': 'estable',
+        'tarea_bonus': 10,
+        'participacion': (4, 5, 'Excelente'),
+    },
+    'bueno': {
+        'peso': 35,
+        'nota_base': (70, 84),
+        'asistencia_rate': 0.90,
+        'participacion_freq': 0.65,
+        'tendencia': 'mejora',
+        'tarea_bonus': 5,
+        'participacion': (3, 4, 'Buena'),
+    },
+    'regular': {
+        'peso': 35,
+        'nota_base': (55, 69),
+        'asistencia_rate': 0.78,
+        'participacion_freq': 0.45,
+        'tendencia': 'irregular',
+        'tarea_bonus': 0,
+        'participacion': (2, 3, 'Regular'),
+    },
+    'bajo': {
+        'peso': 15,
+        'nota_base': (25, 54),
+        'asistencia_rate': 0.65,
+        'participacion_freq': 0.25,
+        'tendencia': 'declive',
+        'tarea_bonus': -5,
+        'participacion': (1, 2, 'Básica'),
+    },
+}
+
+# Puntos que gana (o pierde) la nota base en cada trimestre según la tendencia
+AJUSTE_TENDENCIA = {'estable': 0, 'mejora': 3, 'irregular': 0, 'declive': -3}
+
+MATERIAS = [
+    ('MAT', 'Matemáticas', 'Álgebra y geometría', 5),
+    ('FIS', 'Física', 'Ciencias Físicas', 4),
+    ('QUI', 'Química', 'Ciencias Químicas', 4),
+    ('LIT', 'Lenguaje', 'Lengua y Literatura', 5),
+    ('HIS', 'Historia', 'Historia Universal', 3),
+    ('BIO', 'Biología', 'Ciencias Naturales', 4),
+    ('GEO', 'Geografía', 'Geografía Bolivia', 3),
+    ('EDF', 'Ed. Física', 'Deportes', 2),
+    ('ING', 'Inglés', 'Idioma Extranjero', 3),
+    ('ART', 'Artes', 'Expresión Artística', 2),
+    ('MUS', 'Música', 'Educación Musical', 2),
+]
+
+# Dos periodos diarios por grupo, de lunes a viernes
+PERIODOS = [(time(8, 0), time(8, 50)), (time(9, 0), time(9, 50))]
+
+EXAMENES_POR_TRIMESTRE = 2
+TAREAS_POR_TRIMESTRE = 2
+
+# Fracción de participacion_freq que participa en una clase dada
+PARTICIPACION_POR_CLASE = 0.2
+
+PASSWORD = 'sintetico123'
+
+NOMBRES = {
+    'M': ['Juan', 'Carlos', 'Luis', 'Jorge', 'Miguel', 'Diego', 'Andrés', 'Mateo', 'Sebastián', 'Gabriel'],
+    'F': ['María', 'Ana', 'Lucía', 'Camila', 'Valeria', 'Sofía', 'Daniela', 'Paola', 'Carla', 'Fernanda'],
+}
+APELLIDOS = [
+    'Quispe', 'Mamani', 'Flores', 'Rojas', 'Vargas', 'Gutiérrez', 'Choque', 'Fernández',
+    'Morales', 'Mendoza', 'Torrez', 'Vaca', 'Suárez', 'Justiniano', 'Rivero', 'Peña',
+]
+ZONAS = ['Equipetrol', 'Plan 3000', 'Villa 1ro de Mayo', 'Las Palmas', 'Urbarí', 'El Bajío', 'Sirari']
+
+
+def _rng(semilla, *claves):
+    # Un generador por entidad, derivado de claves estables (no de los pk):
+    # el resultado no depende del orden ni de la base en que se genere
+    return random.Random(':'.join(map(str, (semilla, *claves))))
+
+
+def dominio(colegio):
+    return f'c{colegio:03d}.sintetico.bo'
+
+
+def colegio_generado(colegio):
+    return Usuario.objects.filter(email__endswith=f'@{dominio(colegio)}').exists()
+
+
+def _persona(rng):
+    genero = rng.choice('MF')
+    nombres = rng.choice(NOMBRES[genero])
+    apellidos = f'{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}'
+    return genero, nombres, apellidos
+
+
+def _fechas_trimestre(trimestre):
+    dia = trimestre.fecha_inicio
+    while dia <= trimestre.fecha_fin:
+        if dia.isoweekday() <= 5:
+            yield dia
+        dia += timedelta(days=1)
+
+
+def fechas_de_clase(trimestres, dias=None):
+    """
+    Días hábiles de cada trimestre con asistencia registrada. Con `dias`
+    se toman esa cantidad por gestión, repartidos uniformemente.
+
+    Returns:
+        Diccionario número de trimestre -> lista de fechas
+    """
+    todas = [(trimestre.numero, dia) for trimestre in trimestres for dia in _fechas_trimestre(trimestre)]
+    if dias is not None and dias < len(todas):
+        todas = [todas[indice * len(todas) // dias] for indice in range(max(0, dias))]
+    fechas = {trimestre.numero: [] for trimestre in trimestres}
+    for numero, dia in todas:
+        fechas[numero].append(dia)
+    return fechas
+
+
+def asegurar_estructura(desde, anios):
+    """
+    Niveles, grupos, materias y gestiones con sus trimestres, comunes a
+    todos los colegios sintéticos. Reutiliza lo que ya existe.
+
+    Returns:
+        Diccionario con grupos, materias y gestiones [(gestion, trimestres)]
+    """
+    for numero in range(1, 7):
+        nivel, _ = Nivel.objects.get_or_create(
+            numero=numero, defaults={'nombre': f'{numero}° Secundaria', 'descripcion': f'Nivel {numero}'}
+        )
+        for letra in 'AB':
+            Grupo.objects.get_or_create(nivel=nivel, letra=letra, defaults={'capacidad_maxima': 40})
+
+    materias = []
+    for codigo, nombre, descripcion, horas in MATERIAS:
+        materia, _ = Materia.objects.get_or_create(
+            codigo=codigo, defaults={'nombre': nombre, 'descripcion': descripcion, 'horas_semanales': horas}
+        )
+        materias.append(materia)
+
+    gestiones = []
+    for anio in range(desde, desde + anios):
+        gestion, _ = Gestion.objects.get_or_create(
+            anio=anio, defaults={
+                'nombre': f'Gestión Académica {anio}',
+                'fecha_inicio': date(anio, 2, 1), 'fecha_fin': date(anio, 11, 30),
+            }
+        )
+        limites = [
+            (date(anio, 2, 1), date(anio, 5, 15)),
+            (date(anio, 5, 16), date(anio, 8, 31)),
+            (date(anio, 9, 1), date(anio, 11, 30)),
+        ]
+        trimestres = [
+            Trimestre.objects.get_or_create(
+                gestion=gestion, numero=numero, defaults={
+                    'nombre': f'Trimestre {numero} {anio}', 'fecha_inicio': inicio, 'fecha_fin': fin
+                }
+            )[0]
+            for numero, (inicio, fin) in enumerate(limites, 1)
+        ]
+        gestiones.append((gestion, trimestres))
+
+    grupos = list(Grupo.objects.select_related('nivel').order_by('nivel__numero', 'letra'))
+    return {'grupos': grupos, 'materias': materias, 'gestiones': gestiones}
+
+
+def _crear_director(colegio, clave, rng):
+    usuario = Usuario.objects.create(email=f'director@{dominio(colegio)}', password=clave, tipo_usuario='director')
+    genero, nombres, apellidos = _persona(rng)
+    return Director.objects.create(
+        usuario=usuario, nombres=nombres, apellidos=apellidos, cedula_identidad=f'S{colegio:03d}-D',
+        fecha_nacimiento=date(rng.randint(1965, 1985), rng.randint(1, 12), rng.randint(1, 28)), genero=genero,
+        telefono=f'7{rng.randint(1000000, 9999999)}', direccion=f'{rng.choice(ZONAS)} #{rng.randint(1, 999)}',
+    )
+
+
+def _crear_profesores(colegio, materias, clave, rng):
+    usuarios = Usuario.objects.bulk_create(
+        Usuario(email=f'profesor{numero}@{dominio(colegio)}', password=clave, tipo_usuario='profesor')
+        for numero in range(1, len(materias) + 1)
+    )
+    profesores = []
+    for numero, (usuario, materia) in enumerate(zip(usuarios, materias), 1):
+        genero, nombres, apellidos = _persona(rng)
+        profesor = Profesor(
+            usuario=usuario, nombres=nombres, apellidos=apellidos,
+            cedula_identidad=f'S{colegio:03d}-{numero:02d}',
+            fecha_nacimiento=date(rng.randint(1965, 1995), rng.randint(1, 12), rng.randint(1, 28)),
+            genero=genero, telefono=f'7{rng.randint(1000000, 9999999)}',
+            direccion=f'{rng.choice(ZONAS)} #{rng.randint(1, 999)}',
+            especialidad=materia.nombre[:20],
+            fecha_contratacion=date(rng.randint(2005, 2020), rng.randint(1, 12), 1),
+        )
+        profesor.busqueda = profesor.texto_busqueda()
+        profesores.append(profesor)
+    Profesor.objects.bulk_create(profesores)
+    return ProfesorMateria.objects.bulk_create(
+        ProfesorMateria(profesor=profesor, materia=materia) for profesor, materia in zip(profesores, materias)
+    )
+
+
+def _crear_alumnos(colegio, grupos, cantidad, desde, clave, ahora, rng):
+    """Alumnos del colegio por COPY, repartidos en bloques entre los grupos"""
+    ids = reservar_ids(Usuario, cantidad)
+    usuarios, alumnos, creados = [], [], []
+    for numero, usuario_id in enumerate(ids):
+        grupo = grupos[numero * len(grupos) // cantidad]
+        perfil = rng.choices(list(STUDENT_PROFILES), weights=[p['peso'] for p in STUDENT_PROFILES.values()])[0]
+        genero, nombres, apellidos = _persona(rng)
+        email = f'alumno{numero + 1}@{dominio(colegio)}'
+        matricula = f'S{colegio:03d}{numero + 1:05d}'
+        usuarios.append((clave, None, False, usuario_id, ahora, ahora, email, 'alumno', True, False, True))
+        alumnos.append((
+            usuario_id, ahora, ahora, matricula, nombres, apellidos,
+            date(desde - 12 - grupo.nivel.numero, rng.randint(1, 12), rng.randint(1, 28)), genero,
+            f'6{rng.randint(1000000, 9999999)}', f'{rng.choice(ZONAS)} #{rng.randint(1, 999)}',
+            f'{rng.choice(NOMBRES[rng.choice("MF")])} {apellidos.split()[0]}', f'7{rng.randint(1000000, 9999999)}',
+            grupo.id, normalizar_texto(f'{nombres} {apellidos} {email} {matricula}'),
+        ))
+        creados.append((usuario_id, grupo, perfil))
+
+    copiar(Usuario, [
+        'password', 'last_login', 'is_superuser', 'id', 'created_at', 'updated_at',
+        'email', 'tipo_usuario', 'activo', 'is_staff', 'is_active',
+    ], usuarios)
+    copiar(Alumno, [
+        'usuario', 'created_at', 'updated_at', 'matricula', 'nombres', 'apellidos', 'fecha_nacimiento',
+        'genero', 'telefono', 'direccion', 'nombre_tutor', 'telefono_tutor', 'grupo', 'busqueda',
+    ], alumnos)
+    return creados
+
+
+def _matricular(gestion, alumnos, ahora):
+    """
+    Returns:
+        Diccionario grupo_id -> [(matriculacion_id, perfil)]
+    """
+    ids = reservar_ids(Matriculacion, len(alumnos))
+    filas = []
+    por_grupo = {}
+    for matriculacion_id, (alumno_id, grupo, perfil) in zip(ids, alumnos):
+        filas.append((
+            matriculacion_id, ahora, ahora, alumno_id, gestion.id,
+            gestion.fecha_inicio - timedelta(days=15), True, f'Perfil: {perfil}',
+        ))
+        por_grupo.setdefault(grupo.id, []).append((matriculacion_id, perfil))
+    copiar(Matriculacion, [
+        'id', 'created_at', 'updated_at', 'alumno', 'gestion', 'fecha_matriculacion', 'activa', 'observaciones',
+    ], filas)
+    return por_grupo
+
+
+def _crear_horarios(trimestre, grupos, aulas, asignaciones):
+    # Cada grupo rota las asignaciones desde un desplazamiento distinto y
+    # tiene su propia aula: no se repiten profesor ni aula en la misma franja
+    horarios = []
+    franjas = [(dia, inicio, fin) for dia in range(1, 6) for inicio, fin in PERIODOS]
+    for indice, (grupo, aula) in enumerate(zip(grupos, aulas)):
+        for franja, (dia, inicio, fin) in enumerate(franjas):
+            horarios.append(Horario(
+                profesor_materia=asignaciones[(franja + indice) % len(asignaciones)], grupo=grupo, aula=aula,
+                trimestre=trimestre, dia_semana=dia, hora_inicio=inicio, hora_fin=fin,
+            ))
+    return Horario.objects.bulk_create(horarios)
+
+
+def _crear_evaluaciones(trimestre, asignaciones, rng):
+    """
+    Returns:
+        (exámenes, tareas) como diccionarios profesor_materia_id -> lista
+    """
+    dias = (trimestre.fecha_fin - trimestre.fecha_inicio).days
+    examenes, tareas = [], []
+    for asignacion in asignaciones:
+        codigo = asignacion.materia.codigo
+        for numero in range(1, EXAMENES_POR_TRIMESTRE + 1):
+            examenes.append(Examen(
+                profesor_materia=asignacion, trimestre=trimestre, numero_parcial=numero,
+                titulo=f'Parcial {numero} {codigo} T{trimestre.numero}', descripcion=f'Evaluación {numero}',
+                fecha_examen=trimestre.fecha_inicio + timedelta(days=dias * numero // (EXAMENES_POR_TRIMESTRE + 1)),
+                ponderacion=rng.choice([20, 25, 30]),
+            ))
+        for numero in range(1, TAREAS_POR_TRIMESTRE + 1):
+            asignada = trimestre.fecha_inicio + timedelta(days=rng.randint(1, max(1, dias - 10)))
+            tareas.append(Tarea(
+                profesor_materia=asignacion, trimestre=trimestre,
+                titulo=f'Tarea {numero} {codigo} T{trimestre.numero}', descripcion=f'Actividad {numero}',
+                fecha_asignacion=asignada,
+                fecha_entrega=min(asignada + timedelta(days=rng.randint(7, 14)), trimestre.fecha_fin),
+                ponderacion=rng.choice([15, 20, 25]),
+            ))
+    por_asignacion = ({}, {})
+    for indice, creados in enumerate((Examen.objects.bulk_create(examenes), Tarea.objects.bulk_create(tareas))):
+        for objeto in creados:
+            por_asignacion[indice].setdefault(objeto.profesor_materia_id, []).append(objeto.id)
+    return por_asignacion
+
+
+def _nota(perfil, numero_trimestre, rng, bonus=0):
+    datos = STUDENT_PROFILES[perfil]
+    nota = rng.uniform(*datos['nota_base']) + AJUSTE_TENDENCIA[datos['tendencia']] * (numero_trimestre - 2)
+    ruido = 8 if datos['tendencia'] == 'irregular' else 3
+    return max(0, min(100, nota + bonus + rng.uniform(-ruido, ruido)))
+
+
+def _lineas_notas(matriculados, asignaciones, examenes, tareas, numero_trimestre, marca, rng):
+    notas_examen, notas_tarea = [], []
+    for matriculacion_id, perfil in matriculados:
+        entrega = 0.75 if perfil == 'bajo' else 0.90
+        for asignacion_id in asignaciones:
+            for examen_id in examenes[asignacion_id]:
+                nota = _nota(perfil, numero_trimestre, rng)
+                notas_examen.append(
+                    f'{marca}\t{marca}\t{matriculacion_id}\t{examen_id}\t{nota:.2f}\tT{numero_trimestre}\t{marca}'
+                )
+            for tarea_id in tareas[asignacion_id]:
+                if rng.random() < entrega:
+                    nota = _nota(perfil, numero_trimestre, rng, STUDENT_PROFILES[perfil]['tarea_bonus'])
+                    notas_tarea.append(
+                        f'{marca}\t{marca}\t{matriculacion_id}\t{tarea_id}\t{nota:.2f}\tEntregada\t{marca}'
+                    )
+                else:
+                    notas_tarea.append(f'{marca}\t{marca}\t{matriculacion_id}\t{tarea_id}\t0.00\tNo entregada\t{marca}')
+    return notas_examen, notas_tarea
+
+
+def _lineas_clases(matriculados, horarios_por_dia, fechas, marca, rng, participaciones):
+    """
+    Asistencia de cada alumno a cada clase del grupo; las participaciones
+    se agregan a la lista recibida mientras se recorren las mismas clases.
+    """
+    presente = EstadoAsistencia.PRESENTE.value
+    tardanza = EstadoAsistencia.TARDANZA.value
+    justificada = EstadoAsistencia.JUSTIFICADA.value
+    falta = EstadoAsistencia.FALTA.value
+    alumnos = [
+        (matriculacion_id, STUDENT_PROFILES[perfil]['asistencia_rate'],
+         STUDENT_PROFILES[perfil]['participacion_freq'] * PARTICIPACION_POR_CLASE,
+         STUDENT_PROFILES[perfil]['participacion'])
+        for matriculacion_id, perfil in matriculados
+    ]
+    aleatorio = rng.random
+    for fecha in fechas:
+        dia = fecha.isoformat()
+        for horario_id in horarios_por_dia.get(fecha.isoweekday(), ()):
+            for matriculacion_id, tasa, frecuencia, (minimo, maximo, descripcion) in alumnos:
+                valor = aleatorio()
+                if valor < tasa:
+                    estado = presente
+                elif valor < tasa + 0.05:
+                    estado = tardanza
+                elif valor < tasa + 0.08:
+                    estado = justificada
+                else:
+                    estado = falta
+                yield f'{marca}\t{marca}\t{matriculacion_id}\t{horario_id}\t{dia}\t{estado}'
+                if estado != falta and aleatorio() < frecuencia:
+                    participaciones.append(
+                        f'{marca}\t{marca}\t{matriculacion_id}\t{horario_id}\t{dia}\t{descripcion}\t'
+                        f'{rng.randint(minimo, maximo)}'
+                    )
+
+
+COLUMNAS_NOTA_EXAMEN = ['created_at', 'updated_at', 'matriculacion', 'examen', 'nota', 'observaciones', 'fecha_registro']
+COLUMNAS_NOTA_TAREA = ['created_at', 'updated_at', 'matriculacion', 'tarea', 'nota', 'observaciones', 'fecha_registro']
+COLUMNAS_ASISTENCIA = ['created_at', 'updated_at', 'matriculacion', 'horario', 'fecha', 'estado']
+COLUMNAS_PARTICIPACION = ['created_at', 'updated_at', 'matriculacion', 'horario', 'fecha', 'descripcion', 'valor']
+
+
+def preparar_colegio(colegio, estructura, alumnos, dias, semilla, clave):
+    """
+    Crea y confirma en una transacción la parte estructural de un colegio
+    sintético: director, profesores, aulas, alumnos y, por cada gestión,
+    matriculaciones, horarios y evaluaciones.
+
+    El esquema admite un solo juego de niveles (1 a 6) y grupos (A y B):
+    cada colegio tiene sus propios profesores, aulas, alumnos y horarios
+    dentro de esos mismos grupos, identificados por el dominio del email
+    (ver dominio()).
+
+    Returns:
+        (conteos, fragmentos): filas insertadas por tabla y un fragmento
+        por trimestre para sembrar_fragmento, con todo lo que necesita
+        como datos simples (se envían a otros procesos)
+    """
+    rng = _rng(semilla, 'colegio', colegio)
+    marca = texto_copy(timezone.now())
+    grupos = estructura['grupos']
+    conteos = {}
+    fragmentos = []
+
+    def sumar(modelo, cantidad):
+        tabla = modelo._meta.db_table
+        conteos[tabla] = conteos.get(tabla, 0) + cantidad
+
+    with transaction.atomic():
+        aulas = []
+        for numero in range(1, len(grupos) + 1):
+            aula = Aula(nombre=f'C{colegio:03d} Aula {numero:02d}', capacidad=40, descripcion=f'Colegio {colegio}')
+            aula.save()
+            aulas.append(aula)
+        _crear_director(colegio, clave, _rng(semilla, 'director', colegio))
+        asignaciones = _crear_profesores(colegio, estructura['materias'], clave, rng)
+        matriculables = _crear_alumnos(colegio, grupos, alumnos, estructura['gestiones'][0][0].anio, clave, marca, rng)
+        sumar(Aula, len(aulas))
+        sumar(Director, 1)
+        sumar(Profesor, len(asignaciones))
+        sumar(Alumno, len(matriculables))
+
+        for gestion, trimestres in estructura['gestiones']:
+            matriculados = _matricular(gestion, matriculables, marca)
+            sumar(Matriculacion, len(matriculables))
+            fechas = fechas_de_clase(trimestres, dias)
+
+            for trimestre in trimestres:
+                horarios = _crear_horarios(trimestre, grupos, aulas, asignaciones)
+                examenes, tareas = _crear_evaluaciones(trimestre, asignaciones, _rng(
+                    semilla, 'evaluaciones', colegio, gestion.anio, trimestre.numero
+                ))
+                sumar(Horario, len(horarios))
+                sumar(Examen, sum(map(len, examenes.values())))
+                sumar(Tarea, sum(map(len, tareas.values())))
+
+                por_grupo = []
+                for grupo in grupos:
+                    propios = [horario for horario in horarios if horario.grupo_id == grupo.id]
+                    horarios_por_dia = {}
+                    for horario in propios:
+                        horarios_por_dia.setdefault(horario.dia_semana, []).append(horario.id)
+                    por_grupo.append({
+                        'clave': (colegio, gestion.anio, trimestre.numero, grupo.nivel.numero, grupo.letra),
+                        'matriculados': matriculados.get(grupo.id, []),
+                        'horarios_por_dia': horarios_por_dia,
+                        'asignaciones': sorted({horario.profesor_materia_id for horario in propios}),
+                    })
+                fragmentos.append({
+                    'semilla': semilla, 'marca': marca, 'trimestre': trimestre.numero,
+                    'fechas': fechas[trimestre.numero], 'examenes': examenes, 'tareas': tareas,
+                    'grupos': por_grupo,
+                })
+    return conteos, fragmentos
+
+
+def sembrar_fragmento(fragmento):
+    """
+    Notas, asistencias y participaciones de un trimestre de un colegio, en
+    su propia transacción y con un COPY por tabla y grupo. Se ejecuta en
+    los workers del pool: los fragmentos son independientes entre sí y cada
+    grupo usa su propio generador, así que el resultado no depende de
+    cuántos procesos haya ni del orden en que terminen.
+
+    Returns:
+        Diccionario tabla -> filas insertadas
+    """
+    semilla, marca, numero = fragmento['semilla'], fragmento['marca'], fragmento['trimestre']
+    conteos = {}
+
+    def sumar(modelo, cantidad):
+        tabla = modelo._meta.db_table
+        conteos[tabla] = conteos.get(tabla, 0) + cantidad
+
+    with transaction.atomic():
+        for grupo in fragmento['grupos']:
+            notas_examen, notas_tarea = _lineas_notas(
+                grupo['matriculados'], grupo['asignaciones'], fragmento['examenes'], fragmento['tareas'],
+                numero, marca, _rng(semilla, 'notas', *grupo['clave'])
+            )
+            sumar(NotaExamen, copiar_lineas(NotaExamen, COLUMNAS_NOTA_EXAMEN, notas_examen))
+            sumar(NotaTarea, copiar_lineas(NotaTarea, COLUMNAS_NOTA_TAREA, notas_tarea))
+
+            participaciones = []
+            sumar(Asistencia, copiar_lineas(Asistencia, COLUMNAS_ASISTENCIA, _lineas_clases(
+                grupo['matriculados'], grupo['horarios_por_dia'], fragmento['fechas'], marca,
+                _rng(semilla, 'clases', *grupo['clave']), participaciones
+            )))
+            sumar(Participacion, copiar_lineas(Participacion, COLUMNAS_PARTICIPACION, participaciones))
+    return conteos
@@ -1,3 +1,330 @@
-from django.test import TestCase
+import io
+import tempfile
+import zipfile
+from datetime import date, time
+from decimal import Decimal
+from unittest import mock, skipUnless
+from concurrent.futures import ThreadPoolExecutor
+from django.urls import reverse
+from django.utils import timezone
+from django.http import StreamingHttpResponse
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.db import connection, transaction
+from rest_framework.test import APIClient
+from academic.models import Nivel, Grupo, Aula, Materia, ProfesorMateria, Gestion, Trimestre, Horario, Matriculacion
+from authentication.models import Usuario, Profesor, Alumno
+from shared.models import EstadoTrabajo
+from shared.trabajos import ejecutar, tomar_siguiente
+from .boletines import datos_boletines, generar_boletines, renderizar_boletin
+from .models import (
+    Asistencia, Examen, Tarea, NotaExamen, NotaTarea, Participacion, HistoricoTrimestral, HistoricoAnual,
+    EstadoAsistencia, EstadoMateria
+)
+from .sintetico import asegurar_estructura, colegio_generado, fechas_de_clase, preparar_colegio, sembrar_fragmento
 
-# Create your tests here.
+
+@skipUnless(connection.vendor == 'postgresql', 'usa COPY y SQL propio de PostgreSQL')
+class DatosSinteticosTests(TestCase):
+    def generar(self, invertir=False):
+        estructura = asegurar_estructura(2022, 1)
+        conteos, fragmentos = preparar_colegio(1, estructura, alumnos=24, dias=10, semilla=7, clave='!')
+        # El pool puede terminarlos en cualquier orden
+        for fragmento in (reversed(fragmentos) if invertir else fragmentos):
+            for tabla, cantidad in sembrar_fragmento(fragmento).items():
+                conteos[tabla] = conteos.get(tabla, 0) + cantidad
+        huella = (
+            list(Asistencia.objects.order_by('matriculacion__alumno__matricula', 'fecha', 'horario__hora_inicio')
+                 .values_list('matriculacion__alumno__matricula', 'fecha', 'estado')),
+            list(NotaExamen.objects.order_by('matriculacion__alumno__matricula', 'examen__titulo')
+                 .values_list('matriculacion__alumno__matricula', 'nota')),
+        )
+        return estructura, conteos, huella
+
+    def test_volumen_coherente(self):
+        estructura, conteos, _ = self.generar()
+        _, trimestres = estructura['gestiones'][0]
+        fechas = [fecha for lista in fechas_de_clase(trimestres, 10).values() for fecha in lista]
+
+        self.assertEqual(len(fechas), 10)
+        self.assertTrue(colegio_generado(1))
+        self.assertEqual(Matriculacion.objects.count(), 24)
+        # Cada alumno tiene tantas clases como periodos en los días elegidos
+        self.assertEqual(conteos['asistencias'], 24 * 10 * 2)
+
+    def test_determinista(self):
+        with transaction.atomic():
+            _, _, primera = self.generar(invertir=True)
+            transaction.set_rollback(True)
+        _, _, segunda = self.generar()
+
+        self.assertEqual(primera, segunda)
+
+
+class BoletinesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.grupo = Grupo.objects.create(nivel=Nivel.objects.create(numero=2, nombre='2° Secundaria'), letra='B')
+        cls.gestion = Gestion.objects.create(
+            anio=2024, nombre='Gestión 2024', fecha_inicio=date(2024, 2, 1), fecha_fin=date(2024, 11, 30)
+        )
+        cls.trimestres = [
+            Trimestre.objects.create(
+                gestion=cls.gestion, numero=numero, nombre=f'Trimestre {numero}',
+                fecha_inicio=date(2024, 3 * numero, 1), fecha_fin=date(2024, 3 * numero + 2, 28)
+            )
+            for numero in (1, 2, 3)
+        ]
+        materia = Materia.objects.create(codigo='MAT', nombre='Matemáticas', horas_semanales=4)
+        profesor = Profesor.objects.create(
+            usuario=Usuario.objects.create_user('profe@colegio.bo', 'clave', tipo_usuario='profesor'),
+            nombres='Ana', apellidos='Mamani', cedula_identidad='123', fecha_nacimiento=date(1980, 1, 1), genero='F',
+            fecha_contratacion=date(2020, 1, 1)
+        )
+        horario = Horario.objects.create(
+            profesor_materia=ProfesorMateria.objects.create(profesor=profesor, materia=materia),
+            grupo=cls.grupo, aula=Aula.objects.create(nombre='Aula 1', capacidad=30), trimestre=cls.trimestres[0],
+            dia_semana=1, hora_inicio=time(8), hora_fin=time(9)
+        )
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+
+        matriculaciones = []
+        for numero, apellidos in enumerate(['Quispe Ñuflo', 'Choque']):
+            alumno = Alumno.objects.create(
+                usuario=Usuario.objects.create_user(f'alumno{numero}@colegio.bo', 'clave', tipo_usuario='alumno'),
+                matricula=f'M{numero}', nombres='Luis', apellidos=apellidos,
+                fecha_nacimiento=date(2010, 1, 1), genero='M', grupo=cls.grupo
+            )
+            matriculaciones.append(Matriculacion.objects.create(
+                alumno=alumno, gestion=cls.gestion, fecha_matriculacion=date(2024, 2, 1)
+            ))
+        # Solo el primero tiene notas, asistencia y participación
+        matriculacion = matriculaciones[0]
+        cls.alumno = matriculacion.alumno
+
+        for trimestre, promedio in zip(cls.trimestres[:2], ('60.00', '45.00')):
+            HistoricoTrimestral.objects.create(
+                alumno=cls.alumno, trimestre=trimestre, materia=materia, promedio_trimestre=Decimal(promedio)
+            )
+        HistoricoAnual.objects.create(
+            alumno=cls.alumno, gestion=cls.gestion, materia=materia,
+            promedio_anual=Decimal('49.50'), estado_materia=EstadoMateria.REPROBADO
+        )
+        for dia, estado in ((4, EstadoAsistencia.PRESENTE), (11, EstadoAsistencia.TARDANZA), (18, EstadoAsistencia.FALTA)):
+            Asistencia.objects.create(matriculacion=matriculacion, horario=horario, fecha=date(2024, 3, dia), estado=estado)
+        Participacion.objects.create(
+            matriculacion=matriculacion, horario=horario, fecha=date(2024, 3, 4), descripcion='Exposición', valor=4
+        )
+
+    def _contexto(self, trimestre=None):
+        contextos = datos_boletines(self.gestion, self.grupo, trimestre)
+        return next(contexto for contexto in contextos if contexto['alumno']['matricula'] == 'M0')
+
+    def test_datos_anuales(self):
+        contextos = datos_boletines(self.gestion)
+        # Ordenados por apellido dentro del grupo
+        self.assertEqual([contexto['alumno']['matricula'] for contexto in contextos], ['M1', 'M0'])
+
+        contexto = self._contexto()
+        materia, = contexto['materias']
+        self.assertEqual(materia['notas'], [Decimal('60.00'), Decimal('45.00'), None])
+        self.assertEqual(materia['promedio_anual'], Decimal('49.50'))
+        self.assertTrue(materia['reprobado'])
+        self.assertEqual(contexto['asistencia']['total'], 3)
+        # Las tardanzas cuentan como asistencia
+        self.assertEqual(contexto['asistencia']['porcentaje'], 66.67)
+        self.assertEqual(contexto['participacion']['cantidad'], 1)
+        self.assertEqual(contexto['alumno']['grupo'], '2B')
+
+    def test_datos_trimestre(self):
+        contexto = self._contexto(self.trimestres[0])
+
+        materia, = contexto['materias']
+        self.assertEqual(contexto['numeros_trimestre'], [1])
+        self.assertEqual(materia['notas'], [Decimal('60.00')])
+        self.assertNotIn('promedio_anual', materia)
+
+    def test_renderizar(self):
+        ruta, html = renderizar_boletin(self._contexto())
+
+        self.assertEqual(ruta, '2B/M0_quispe-nuflo.html')
+        self.assertIn('Quispe Ñuflo, Luis', html)
+        self.assertIn('class="reprobado"', html)
+
+    def test_generar_zip(self):
+        archivo = io.BytesIO()
+        self.assertEqual(generar_boletines(archivo, self.gestion, procesos=1), 2)
+
+        with zipfile.ZipFile(archivo) as zip_boletines:
+            self.assertEqual(sorted(zip_boletines.namelist()), ['2B/M0_quispe-nuflo.html', '2B/M1_choque.html'])
+
+    def test_trabajo_boletines(self):
+        cliente = APIClient()
+        cliente.force_authenticate(self.director)
+
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media, BOLETINES_PROCESOS=1):
+            respuesta = cliente.post(reverse('boletines-grupo'), {'gestion': self.gestion.pk, 'grupo': self.grupo.pk})
+            self.assertEqual(respuesta.status_code, 202)
+
+            trabajo = ejecutar(tomar_siguiente())
+            self.assertEqual(trabajo.estado, EstadoTrabajo.TERMINADO)
+            self.assertEqual(trabajo.resultado, {'generados': 2})
+
+            detalle = cliente.get(reverse('trabajo-detail', kwargs={'pk': trabajo.pk})).json()
+            self.assertEqual(detalle['descarga']['nombre'], 'boletines_2024_2B.zip')
+            descarga = cliente.get(detalle['descarga']['url'])
+            with zipfile.ZipFile(io.BytesIO(b''.join(descarga.streaming_content))) as zip_boletines:
+                self.assertEqual(len(zip_boletines.namelist()), 2)
+
+        respuesta = cliente.post(reverse('boletines-grupo'), {'gestion': self.gestion.pk, 'trimestre': 9})
+        self.assertEqual(respuesta.status_code, 404)
+
+
+class ExportacionesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        grupo = Grupo.objects.create(nivel=Nivel.objects.create(numero=3, nombre='3° Secundaria'), letra='A')
+        cls.gestion = Gestion.objects.create(
+            anio=2024, nombre='Gestión 2024', fecha_inicio=date(2024, 2, 1), fecha_fin=date(2024, 11, 30)
+        )
+        trimestre = Trimestre.objects.create(
+            gestion=cls.gestion, numero=1, nombre='Trimestre 1', fecha_inicio=date(2024, 2, 1), fecha_fin=date(2024, 5, 31)
+        )
+        cls.profesor = Usuario.objects.create_user('profe@colegio.bo', 'clave', tipo_usuario='profesor')
+        profesor_materia = ProfesorMateria.objects.create(
+            profesor=Profesor.objects.create(
+                usuario=cls.profesor, nombres='Ana', apellidos='Mamani', cedula_identidad='123',
+                fecha_nacimiento=date(1980, 1, 1), genero='F', fecha_contratacion=date(2020, 1, 1)
+            ),
+            materia=Materia.objects.create(codigo='MAT', nombre='Matemáticas', horas_semanales=4)
+        )
+        horario = Horario.objects.create(
+            profesor_materia=profesor_materia, grupo=grupo, aula=Aula.objects.create(nombre='Aula 1', capacidad=30),
+            trimestre=trimestre, dia_semana=1, hora_inicio=time(8), hora_fin=time(9)
+        )
+        matriculacion = Matriculacion.objects.create(
+            alumno=Alumno.objects.create(
+                usuario=Usuario.objects.create_user('alumno@colegio.bo', 'clave', tipo_usuario='alumno'),
+                matricula='M0', nombres='José', apellidos='Núñez', fecha_nacimiento=date(2010, 1, 1),
+                genero='M', grupo=grupo
+            ),
+            gestion=cls.gestion, fecha_matriculacion=date(2024, 2, 1)
+        )
+        examen = Examen.objects.create(
+            profesor_materia=profesor_materia, trimestre=trimestre, numero_parcial=1, titulo='Primer parcial',
+            fecha_examen=date(2024, 3, 15), ponderacion=Decimal('30.00')
+        )
+        tarea = Tarea.objects.create(
+            profesor_materia=profesor_materia, trimestre=trimestre, titulo='Ejercicios', fecha_asignacion=date(2024, 3, 1),
+            fecha_entrega=date(2024, 3, 8), ponderacion=Decimal('10.00')
+        )
+        NotaExamen.objects.create(matriculacion=matriculacion, examen=examen, nota=Decimal('87.50'))
+        NotaTarea.objects.create(matriculacion=matriculacion, tarea=tarea, nota=Decimal('90.00'), observaciones='Completa')
+        Asistencia.objects.create(
+            matriculacion=matriculacion, horario=horario, fecha=date(2024, 3, 4), estado=EstadoAsistencia.TARDANZA
+        )
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.director)
+
+    def _filas(self, nombre):
+        respuesta = self.client.get(reverse(nombre) + f'?gestion={self.gestion.pk}')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIsInstance(respuesta, StreamingHttpResponse)
+        self.assertEqual(respuesta['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('_2024.csv', respuesta['Content-Disposition'])
+        return b''.join(respuesta.streaming_content).decode('utf-8-sig').splitlines()
+
+    def _registro(self, Modelo):
+        return timezone.localtime(Modelo.objects.get().fecha_registro).strftime('%Y-%m-%d %H:%M:%S')
+
+    def test_notas_examenes(self):
+        self.assertEqual(self._filas('exportar-notas-examenes')[:2], [
+            'matricula,apellidos,nombres,nivel,grupo,trimestre,materia,parcial,examen,fecha_examen,'
+            'ponderacion,nota,observaciones,fecha_registro',
+            f'M0,Núñez,José,3,A,1,MAT,1,Primer parcial,2024-03-15,30.00,87.50,,{self._registro(NotaExamen)}',
+        ])
+
+    def test_notas_tareas(self):
+        self.assertEqual(self._filas('exportar-notas-tareas')[:2], [
+            'matricula,apellidos,nombres,nivel,grupo,trimestre,materia,tarea,fecha_entrega,'
+            'ponderacion,nota,observaciones,fecha_registro',
+            f'M0,Núñez,José,3,A,1,MAT,Ejercicios,2024-03-08,10.00,90.00,Completa,{self._registro(NotaTarea)}',
+        ])
+
+    def test_asistencias(self):
+        self.assertEqual(self._filas('exportar-asistencias'), [
+            'matricula,apellidos,nombres,nivel,grupo,fecha,materia,hora_inicio,estado',
+            f'M0,Núñez,José,3,A,2024-03-04,MAT,08:00:00,{EstadoAsistencia.TARDANZA}',
+        ])
+
+    def test_solo_director_y_gestion_existente(self):
+        for nombre in ('exportar-notas-examenes', 'exportar-notas-tareas', 'exportar-asistencias'):
+            url = reverse(nombre)
+            for consulta in ('', '?gestion=999999', '?gestion=abc'):
+                self.assertEqual(self.client.get(url + consulta).status_code, 404, nombre + consulta)
+
+            self.client.force_authenticate(self.profesor)
+            self.assertEqual(self.client.get(url + f'?gestion={self.gestion.pk}').status_code, 403, nombre)
+            self.client.force_authenticate(self.director)
+
+
+class GraficosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.gestion = Gestion.objects.create(
+            anio=2024, nombre='Gestión 2024', fecha_inicio=date(2024, 2, 1), fecha_fin=date(2024, 11, 30)
+        )
+        cls.materia = Materia.objects.create(codigo='MAT', nombre='Matemáticas', horas_semanales=4)
+        cls.director = Usuario.objects.create_user('director@colegio.bo', 'clave', tipo_usuario='director')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.director)
+        self.url = reverse('grafico-notas') + f'?gestion={self.gestion.pk}&materia={self.materia.pk}'
+
+    @override_settings(GRAFICOS_PROCESOS=0)
+    def test_en_el_proceso(self):
+        respuesta = self.client.get(self.url)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['Content-Type'], 'image/png')
+
+        respuesta = self.client.get(self.url, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(respuesta.status_code, 304)
+
+        # El título lleva el nombre de la materia: renombrarla cambia la clave
+        self.materia.nombre = 'Matemática'
+        self.materia.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=respuesta['ETag']).status_code, 200)
+
+    @override_settings(GRAFICOS_PROCESOS=1)
+    def test_sin_esperar_al_pool(self):
+        pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch('evaluations.graficos._pool_graficos', return_value=pool):
+            respuesta = self.client.get(self.url)
+            self.assertEqual(respuesta.status_code, 202)
+            self.assertEqual(respuesta['Retry-After'], '1')
+
+            pool.shutdown(wait=True)
+            respuesta = self.client.get(self.url)
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertEqual(respuesta['Content-Type'], 'image/png')
+
+    @override_settings(GRAFICOS_PROCESOS=1)
+    def test_fallo_del_render(self):
+        pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch('evaluations.graficos._pool_graficos', return_value=pool), \
+                mock.patch('evaluations.graficos.renderizar', side_effect=ValueError('roto')), \
+                self.assertLogs('evaluations.graficos', 'ERROR'):
+            self.assertEqual(self.client.get(self.url).status_code, 202)
+            pool.shutdown(wait=True)
+
+        # Sin imagen y sin encargo pendiente: la próxima petición lo encarga de nuevo
+        pool = ThreadPoolExecutor(max_workers=1)
+        with mock.patch('evaluations.graficos._pool_graficos', return_value=pool) as pool_graficos:
+            self.assertEqual(self.client.get(self.url).status_code, 202)
+            pool.shutdown(wait=True)
+        pool_graficos.assert_called_once()
@@ -2,5 +2,16 @@ from . import views
 from django.urls import path
 
 urlpatterns = [
-    # URLs para academic - agregar después
-]
\ No newline at end of file
+    # Exportaciones CSV por gestión
+    path('exportar/notas-examenes/', views.exportar_notas_examenes, name='exportar-notas-examenes'),
+    path('exportar/notas-tareas/', views.exportar_notas_tareas, name='exportar-notas-tareas'),
+    path('exportar/asistencias/', views.exportar_asistencias, name='exportar-asistencias'),
+
+    # Boletines
+    path('boletines/', views.boletines_grupo, name='boletines-grupo'),
+
+    # Gráficos
+    path('graficos/notas/', views.grafico_notas, name='grafico-notas'),
+    path('graficos/asistencia/', views.grafico_asistencia, name='grafico-asistencia'),
+    path('graficos/predicciones/', views.grafico_predicciones, name='grafico-predicciones'),
+]
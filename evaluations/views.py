@@ -1,3 +1,257 @@
-from django.shortcuts import render
+from rest_framework import status
+from django.http import HttpResponse
+from academic.models import Gestion, Grupo, Trimestre, Materia
+from shared.permissions import IsDirector
+from rest_framework.response import Response
+from shared.exportacion import respuesta_csv
+from shared.routers import lectura_en_replica
+from shared.trabajos import encolar
+from shared.serializers import TrabajoSerializer
+from .graficos import (
+    FORMATOS, grafico_distribucion_notas, grafico_tendencia_asistencia, grafico_prediccion_vs_real
+)
+from .models import NotaExamen, NotaTarea, Asistencia
+from rest_framework.decorators import api_view, permission_classes
 
-# Create your views here.
\ No newline at end of file
+# Columnas del alumno comunes a todas las exportaciones
+COLUMNAS_ALUMNO = [
+    'matriculacion__alumno__matricula', 'matriculacion__alumno__apellidos', 'matriculacion__alumno__nombres',
+    'matriculacion__alumno__grupo__nivel__numero', 'matriculacion__alumno__grupo__letra',
+]
+ENCABEZADO_ALUMNO = ['matricula', 'apellidos', 'nombres', 'nivel', 'grupo']
+ORDEN_ALUMNO = [
+    'matriculacion__alumno__grupo__nivel__numero', 'matriculacion__alumno__grupo__letra',
+    'matriculacion__alumno__apellidos', 'matriculacion__alumno__nombres',
+]
+
+
+def _gestion_solicitada(request):
+    try:
+        return Gestion.objects.get(pk=request.GET.get('gestion'))
+    except (Gestion.DoesNotExist, ValueError, TypeError):
+        return None
+
+
+def _gestion_no_encontrada():
+    return Response(
+        {'error': 'Gestión no encontrada'},
+        status=status.HTTP_404_NOT_FOUND
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+def exportar_notas_examenes(request):
+    """Exportar a CSV las notas de exámenes de una gestión (?gestion=<id>)"""
+    gestion = _gestion_solicitada(request)
+    if gestion is None:
+        return _gestion_no_encontrada()
+
+    queryset = NotaExamen.objects.filter(
+        matriculacion__gestion=gestion
+    ).order_by(
+        *ORDEN_ALUMNO, 'examen__trimestre__numero', 'examen__profesor_materia__materia__codigo', 'examen__numero_parcial'
+    ).values_list(
+        *COLUMNAS_ALUMNO, 'examen__trimestre__numero', 'examen__profesor_materia__materia__codigo',
+        'examen__numero_parcial', 'examen__titulo', 'examen__fecha_examen', 'examen__ponderacion',
+        'nota', 'observaciones', 'fecha_registro'
+    )
+
+    return respuesta_csv(
+        request,
+        f'notas_examenes_{gestion.anio}.csv',
+        [*ENCABEZADO_ALUMNO, 'trimestre', 'materia', 'parcial', 'examen', 'fecha_examen',
+         'ponderacion', 'nota', 'observaciones', 'fecha_registro'],
+        queryset
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+def exportar_notas_tareas(request):
+    """Exportar a CSV las notas de tareas de una gestión (?gestion=<id>)"""
+    gestion = _gestion_solicitada(request)
+    if gestion is None:
+        return _gestion_no_encontrada()
+
+    queryset = NotaTarea.objects.filter(
+        matriculacion__gestion=gestion
+    ).order_by(
+        *ORDEN_ALUMNO, 'tarea__trimestre__numero', 'tarea__profesor_materia__materia__codigo', 'tarea__fecha_entrega'
+    ).values_list(
+        *COLUMNAS_ALUMNO, 'tarea__trimestre__numero', 'tarea__profesor_materia__materia__codigo',
+        'tarea__titulo', 'tarea__fecha_entrega', 'tarea__ponderacion',
+        'nota', 'observaciones', 'fecha_registro'
+    )
+
+    return respuesta_csv(
+        request,
+        f'notas_tareas_{gestion.anio}.csv',
+        [*ENCABEZADO_ALUMNO, 'trimestre', 'materia', 'tarea', 'fecha_entrega',
+         'ponderacion', 'nota', 'observaciones', 'fecha_registro'],
+        queryset
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+def exportar_asistencias(request):
+    """Exportar a CSV las asistencias de una gestión (?gestion=<id>)"""
+    gestion = _gestion_solicitada(request)
+    if gestion is None:
+        return _gestion_no_encontrada()
+
+    queryset = Asistencia.objects.filter(
+        matriculacion__gestion=gestion
+    ).order_by(
+        *ORDEN_ALUMNO, 'fecha', 'horario__hora_inicio'
+    ).values_list(
+        *COLUMNAS_ALUMNO, 'fecha', 'horario__profesor_materia__materia__codigo',
+        'horario__hora_inicio', 'estado'
+    )
+
+    return respuesta_csv(
+        request,
+        f'asistencias_{gestion.anio}.csv',
+        [*ENCABEZADO_ALUMNO, 'fecha', 'materia', 'hora_inicio', 'estado'],
+        queryset
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsDirector])
+def boletines_grupo(request):
+    """
+    Generar en un zip los boletines HTML de una gestión
+    ({"gestion": <id>[, "grupo": <id>][, "trimestre": <numero>]}).
+
+    Se generan en segundo plano (procesar_trabajos): responde 202 con el
+    trabajo; cuando termina, /api/trabajos/<id>/ trae el enlace de descarga.
+    """
+    try:
+        gestion = Gestion.objects.get(pk=request.data.get('gestion'))
+    except (Gestion.DoesNotExist, ValueError, TypeError):
+        return _gestion_no_encontrada()
+
+    grupo = None
+    if request.data.get('grupo'):
+        try:
+            grupo = Grupo.objects.get(pk=request.data['grupo'])
+        except (Grupo.DoesNotExist, ValueError, TypeError):
+            return Response(
+                {'error': 'Grupo no encontrado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    trimestre = None
+    if request.data.get('trimestre'):
+        try:
+            trimestre = Trimestre.objects.get(gestion=gestion, numero=request.data['trimestre'])
+        except (Trimestre.DoesNotExist, ValueError, TypeError):
+            return Response(
+                {'error': 'Trimestre no encontrado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    trabajo = encolar('boletines', request.user, parametros={
+        'gestion': gestion.pk,
+        'grupo': grupo.pk if grupo is not None else None,
+        'trimestre': trimestre.numero if trimestre is not None else None,
+    })
+    return Response(TrabajoSerializer(trabajo).data, status=status.HTTP_202_ACCEPTED)
+
+
+def _parametro_objeto(request, nombre, modelo, requerido=True):
+    """Obtiene el objeto indicado por ?<nombre>=<id>; None si no existe"""
+    valor = request.GET.get(nombre)
+    if not valor and not requerido:
+        return None
+    try:
+        return modelo.objects.get(pk=valor)
+    except (modelo.DoesNotExist, ValueError, TypeError):
+        return None
+
+
+def _respuesta_grafico(request, clave, imagen, formato):
+    # La clave cambia con los datos, así que sirve como ETag
+    etag = f'"{clave}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    elif imagen is None:
+        # Renderizándose en el pool: el cliente reintenta y la encuentra en caché
+        return Response({'estado': 'generando'}, status=status.HTTP_202_ACCEPTED, headers={'Retry-After': '1'})
+    else:
+        response = HttpResponse(imagen, content_type=FORMATOS[formato])
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _formato_invalido():
+    return Response(
+        {'error': f"formato debe ser uno de: {', '.join(FORMATOS)}"},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+@lectura_en_replica
+def grafico_notas(request):
+    """Histograma de notas de una materia (?gestion=<id>&materia=<id>[&formato=png|svg])"""
+    formato = request.GET.get('formato', 'png')
+    if formato not in FORMATOS:
+        return _formato_invalido()
+
+    gestion = _gestion_solicitada(request)
+    materia = _parametro_objeto(request, 'materia', Materia)
+    if gestion is None or materia is None:
+        return Response(
+            {'error': 'Gestión o materia no encontrada'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return _respuesta_grafico(request, *grafico_distribucion_notas(gestion, materia, formato), formato)
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+@lectura_en_replica
+def grafico_asistencia(request):
+    """Tendencia semanal de asistencia de un grupo (?gestion=<id>&grupo=<id>[&formato=png|svg])"""
+    formato = request.GET.get('formato', 'png')
+    if formato not in FORMATOS:
+        return _formato_invalido()
+
+    gestion = _gestion_solicitada(request)
+    grupo = _parametro_objeto(request, 'grupo', Grupo)
+    if gestion is None or grupo is None:
+        return Response(
+            {'error': 'Gestión o grupo no encontrado'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return _respuesta_grafico(request, *grafico_tendencia_asistencia(gestion, grupo, formato), formato)
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+@lectura_en_replica
+def grafico_predicciones(request):
+    """Predicción contra nota real (?gestion=<id>[&materia=<id>][&formato=png|svg])"""
+    formato = request.GET.get('formato', 'png')
+    if formato not in FORMATOS:
+        return _formato_invalido()
+
+    gestion = _gestion_solicitada(request)
+    if gestion is None:
+        return _gestion_no_encontrada()
+
+    materia = _parametro_objeto(request, 'materia', Materia, requerido=False)
+    if request.GET.get('materia') and materia is None:
+        return Response(
+            {'error': 'Materia no encontrada'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return _respuesta_grafico(request, *grafico_prediccion_vs_real(gestion, materia, formato), formato)
@@ -0,0 +1,86 @@
+"""
+Configuración de gunicorn (Procfile: gunicorn -c gunicorn.conf.py).
+
+Todo se ajusta con variables de entorno (ver .example.env):
+    GUNICORN_SERVIDOR       wsgi (workers con hilos) o asgi (workers de uvicorn)
+    GUNICORN_WORKERS        procesos (por defecto 2 x CPUs + 1)
+    GUNICORN_THREADS        hilos por worker en modo wsgi (1 = worker sync)
+    GUNICORN_PRELOAD        cargar Django en el proceso maestro antes del fork
+    GUNICORN_MAX_REQUESTS   peticiones antes de reciclar un worker (0 = nunca)
+    GUNICORN_MAX_REQUESTS_JITTER, GUNICORN_TIMEOUT, GUNICORN_KEEPALIVE
+
+Cada hilo (y cada hilo de shared.asincrono) abre su propia conexión a la
+base: workers x (threads + CONSULTAS_PARALELAS) no debe superar
+max_connections de PostgreSQL (o el pool de pgbouncer).
+"""
+import gc
+import os
+# Como módulo: un nombre global "config" se tomaría por un ajuste de gunicorn
+import decouple
+
+SERVIDOR = decouple.config('GUNICORN_SERVIDOR', default='wsgi')
+CPUS = os.cpu_count() or 1
+
+if SERVIDOR == 'asgi':
+    wsgi_app = 'backend_colegio.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif SERVIDOR == 'wsgi':
+    wsgi_app = 'backend_colegio.wsgi:application'
+    # Las vistas esperan sobre todo a la base: con hilos cada worker
+    # atiende varias peticiones sin multiplicar la memoria
+    threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)
+    worker_class = 'gthread' if threads > 1 else 'sync'
+else:
+    raise RuntimeError(f"GUNICORN_SERVIDOR debe ser 'wsgi' o 'asgi', no '{SERVIDOR}'")
+
+workers = decouple.config('GUNICORN_WORKERS', default=CPUS * 2 + 1, cast=int)
+
+# Django, DRF y las vistas se importan una sola vez en el maestro y los
+# workers comparten esas páginas de memoria (copy-on-write)
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+
+# Reciclar workers acota el crecimiento de memoria; el jitter evita que
+# todos se reinicien a la vez
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=max_requests // 10, cast=int)
+
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = timeout
+keepalive = decouple.config('GUNICORN_KEEPALIVE', default=5, cast=int)
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    # get_wsgi_application() solo configura Django: las URLs (y con ellas
+    # vistas, serializers y DRF) se cargan en la primera petición
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    server.log.info('Aplicación precargada en el maestro (pid %s)', os.getpid())
+
+
+def pre_fork(server, worker):
+    if not preload_app:
+        return
+    # El maestro no vuelve a consultar la base: cerrar sus conexiones antes
+    # del fork evita que un socket quede compartido con los workers
+    from django.db import connections
+    connections.close_all()
+    # Los objetos ya cargados pasan a la generación permanente del GC: las
+    # recolecciones del worker no escriben en ellos ni copian sus páginas
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        # Por si algo abrió una conexión entre pre_fork y el fork
+        from django.db import connections
+        connections.close_all()
+
+
+def worker_exit(server, worker):
+    # Antes que el atexit de last_login y con el log de gunicorn: si el
+    # UPDATE falla, el error queda registrado en vez de descartarse
+    if worker.booted:
+        from authentication.last_login import flush_last_login
+        flush_last_login()
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import contextvars
+from functools import wraps
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+_hilos = None
+_hilos_lock = threading.Lock()
+
+
+def _pool_consultas():
+    # Pool propio y acotado: cada hilo mantiene su conexión a la base
+    global _hilos
+    with _hilos_lock:
+        if _hilos is None:
+            _hilos = ThreadPoolExecutor(
+                max_workers=settings.CONSULTAS_PARALELAS, thread_name_prefix='consultas'
+            )
+        return _hilos
+
+
+def _en_hilo(funcion):
+    def ejecutar():
+        # Mismo ciclo de vida de conexiones que una petición (CONN_MAX_AGE)
+        close_old_connections()
+        try:
+            return funcion()
+        finally:
+            close_old_connections()
+    return ejecutar
+
+
+async def en_paralelo(**consultas):
+    """
+    Ejecuta a la vez funciones síncronas de consulta independientes.
+
+    El ORM asíncrono de Django serializa las consultas en un único hilo;
+    aquí cada función corre en un hilo del pool con su propia conexión, así
+    que las consultas se solapan en la base. Cada función recibe una copia
+    del contexto (p. ej. el ruteo a la réplica de la vista).
+
+    Con CONSULTAS_PARALELAS = 0 las funciones se ejecutan una tras otra en
+    el hilo de la petición (y su conexión), como en los tests, donde los
+    datos de la transacción del test no son visibles desde otra conexión.
+
+    Args:
+        consultas: nombre=función sin argumentos
+
+    Returns:
+        Diccionario {nombre: resultado}
+    """
+    if settings.CONSULTAS_PARALELAS <= 0:
+        return {nombre: await sync_to_async(funcion)() for nombre, funcion in consultas.items()}
+
+    loop = asyncio.get_running_loop()
+    pool = _pool_consultas()
+    resultados = await asyncio.gather(*(
+        loop.run_in_executor(pool, contextvars.copy_context().run, _en_hilo(funcion))
+        for funcion in consultas.values()
+    ))
+    return dict(zip(consultas, resultados))
+
+
+def es_asgi(request):
+    """True si la petición llegó por ASGI (acepta HttpRequest o Request de DRF)"""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def contenido_streaming(request, partes, agrupar=64):
+    """
+    Contenido para un StreamingHttpResponse que se envía a medida que se
+    genera también bajo ASGI.
+
+    Con un iterador síncrono, Django bajo ASGI lo consume entero antes de
+    enviar el primer byte (y lo tiene todo en memoria). Bajo ASGI se
+    devuelve un iterador asíncrono que pide `agrupar` partes por cada salto
+    al hilo de la petición, donde vive su conexión (cursores del servidor).
+    Bajo WSGI se devuelve el iterador tal cual.
+    """
+    if not es_asgi(request):
+        return partes
+
+    iterador = iter(partes)
+    siguientes = sync_to_async(lambda: list(islice(iterador, agrupar)), thread_sensitive=True)
+
+    async def iterar():
+        while bloque := await siguientes():
+            for parte in bloque:
+                yield parte
+
+    return iterar()
+
+
+def respuesta_api(datos, status=200):
+    """Respuesta con el renderer JSON configurado en REST_FRAMEWORK"""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(datos), status=status, content_type=renderer.media_type)
+
+
+def _autorizar(request, permisos):
+    """Autenticación y permisos de DRF; devuelve una respuesta de error o None"""
+    drf_request = Request(request, authenticators=[
+        autenticador() for autenticador in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ])
+    try:
+        for permiso in permisos:
+            if not permiso().has_permission(drf_request, None):
+                if drf_request.authenticators and not drf_request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied()
+    except (exceptions.NotAuthenticated, exceptions.AuthenticationFailed) as error:
+        encabezado = drf_request.authenticators[0].authenticate_header(drf_request)
+        respuesta = respuesta_api({'detail': error.detail}, status=401 if encabezado else 403)
+        if encabezado:
+            respuesta['WWW-Authenticate'] = encabezado
+        return respuesta
+    except exceptions.APIException as error:
+        return respuesta_api({'detail': error.detail}, status=error.status_code)
+
+    request.user = drf_request.user
+    return None
+
+
+def api_async(*permisos):
+    """
+    Equivalente de @api_view(['GET']) + @permission_classes para vistas
+    async def: autentica y comprueba permisos como DRF y deja el usuario en
+    request.user. La vista devuelve una respuesta (ver respuesta_api).
+    """
+    def decorador(vista):
+        @wraps(vista)
+        async def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return respuesta_api(
+                    {'detail': f'Método "{request.method}" no permitido.'}, status=405
+                )
+            error = await sync_to_async(_autorizar)(request, permisos)
+            if error is not None:
+                return error
+            return await vista(request, *args, **kwargs)
+
+        return envoltura
+
+    return decorador
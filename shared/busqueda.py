@@ -0,0 +1,44 @@
+import unicodedata
+
+
+def normalizar_texto(texto):
+    """
+    Normaliza texto para búsquedas: minúsculas y sin acentos ni diéresis
+    (ej: 'Núñez Güemes' -> 'nunez guemes')
+    """
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+
+def filtrar_por_texto(queryset, texto, campo='busqueda'):
+    """
+    Filtra por una columna de búsqueda desnormalizada (ver normalizar_texto).
+
+    Cada palabra del texto debe aparecer en la columna, en cualquier orden.
+    Se traduce a LIKE '%palabra%', que en PostgreSQL aprovecha el índice
+    GIN gin_trgm_ops de la columna cuando existe; en otros motores (o sin
+    pg_trgm) la misma consulta funciona sin índice.
+    """
+    for palabra in normalizar_texto(texto).split():
+        queryset = queryset.filter(**{f'{campo}__contains': palabra})
+    return queryset
+
+
+def recalcular_busqueda(queryset, campo='busqueda', lote=500):
+    """
+    Recalcula la columna de búsqueda (texto_busqueda() del modelo) de las
+    filas del queryset. save() ya lo hace; esto cubre los cambios que no
+    pasan por save(), como un update() masivo o el email del usuario.
+
+    Returns:
+        Cantidad de filas cuyo texto cambió
+    """
+    cambiadas = []
+    for instancia in queryset.iterator(chunk_size=lote):
+        texto = instancia.texto_busqueda()
+        if texto != getattr(instancia, campo):
+            setattr(instancia, campo, texto)
+            cambiadas.append(instancia)
+    if cambiadas:
+        queryset.model.objects.bulk_update(cambiadas, [campo], batch_size=lote)
+    return len(cambiadas)
@@ -0,0 +1,138 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from shared.serializacion import campos_legibles
+
+# Parámetros de consulta de los listados:
+#   ?fields=id,nombre        solo esos campos del serializer
+#   ?expand=alumno           la FK 'alumno' como objeto anidado en vez de su id
+#
+# Cada serializer declara en su Meta:
+#   fuentes = {'campo_metodo': ['columna', 'relacion__columna']}
+#       columnas que lee cada SerializerMethodField ([] si solo usa el pk)
+#   expandibles = {'campo_fk': SerializerAnidado}
+#       FK que admiten ?expand= y el serializer del objeto anidado
+# Sin 'fuentes' para un método pedido no se poda la consulta.
+
+
+def _lista(valor):
+    return [nombre.strip() for nombre in (valor or '').split(',') if nombre.strip()]
+
+
+def campos_solicitados(request, serializer_class):
+    """
+    Lee ?fields= y ?expand= de la petición.
+
+    Returns:
+        Tupla (campos, expandir): campos es un frozenset o None si se piden
+        todos; expandir es un frozenset (vacío si no hay expansiones)
+
+    Raises:
+        ValidationError: Si se piden campos o expansiones inexistentes
+    """
+    disponibles = campos_legibles(serializer_class)
+    expandibles = getattr(serializer_class.Meta, 'expandibles', {})
+    campos = _lista(request.GET.get('fields'))
+    expandir = _lista(request.GET.get('expand'))
+
+    errores = {}
+    desconocidos = [nombre for nombre in campos if nombre not in disponibles]
+    if desconocidos:
+        errores['fields'] = [
+            f'Campos desconocidos: {", ".join(desconocidos)}. '
+            f'Disponibles: {", ".join(disponibles)}'
+        ]
+    no_expandibles = [nombre for nombre in expandir if nombre not in expandibles]
+    if no_expandibles:
+        errores['expand'] = [
+            f'No se pueden expandir: {", ".join(no_expandibles)}. '
+            f'Expandibles: {", ".join(expandibles) or "ninguno"}'
+        ]
+    if errores:
+        raise ValidationError(errores)
+
+    return (frozenset(campos) or None), frozenset(expandir)
+
+
+def _es_columna(modelo, ruta):
+    """True si la ruta 'rel__rel__campo' llega a una columna siguiendo solo FK/OneToOne"""
+    partes = ruta.split('__')
+    try:
+        for parte in partes[:-1]:
+            campo = modelo._meta.get_field(parte)
+            if not (campo.many_to_one or campo.one_to_one) or not campo.concrete:
+                return False
+            modelo = campo.related_model
+        return modelo._meta.get_field(partes[-1]).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+def rutas_consulta(serializer_class, campos=None, expandir=frozenset(), prefijo=''):
+    """
+    Relaciones y columnas que necesita un serializer para los campos pedidos.
+
+    Returns:
+        Tupla (relaciones, columnas) con rutas de lookup para select_related
+        y only(). columnas es None si algún campo no se puede resolver
+        (método sin 'fuentes' declaradas, source con propiedades o '*').
+    """
+    modelo = serializer_class.Meta.model
+    fuentes = getattr(serializer_class.Meta, 'fuentes', {})
+    expandibles = getattr(serializer_class.Meta, 'expandibles', {})
+    relaciones, columnas = set(), set()
+
+    for nombre, campo in campos_legibles(serializer_class).items():
+        if campos is not None and nombre not in campos:
+            continue
+
+        if isinstance(campo, serializers.SerializerMethodField):
+            if nombre not in fuentes:
+                columnas = None
+                continue
+            rutas = fuentes[nombre]
+        else:
+            rutas = ['__'.join(campo.source_attrs)]
+
+        for ruta in rutas:
+            if not ruta or not _es_columna(modelo, ruta):
+                columnas = None
+                continue
+            relacion = ruta.rpartition('__')[0]
+            if relacion:
+                relaciones.add(prefijo + relacion)
+            if columnas is not None:
+                columnas.add(prefijo + ruta)
+
+        if nombre in expandir:
+            ruta = rutas[0]
+            relaciones.add(prefijo + ruta)
+            anidadas, columnas_anidadas = rutas_consulta(expandibles[nombre], prefijo=f'{prefijo}{ruta}__')
+            relaciones |= anidadas
+            if columnas is not None and columnas_anidadas is not None:
+                columnas |= columnas_anidadas
+            else:
+                columnas = None
+
+    return relaciones, columnas
+
+
+def podar_queryset(queryset, serializer_class, campos=None, expandir=frozenset()):
+    """
+    Ajusta select_related/only() del queryset de un listado a los campos pedidos.
+
+    Sin ?fields= ni ?expand= el queryset no cambia. Con ellos, los JOIN y
+    columnas del queryset se reemplazan por los que leen los campos pedidos;
+    si no se pueden determinar, solo se agregan los JOIN de las expansiones.
+    """
+    if campos is None and not expandir:
+        return queryset
+
+    relaciones, columnas = rutas_consulta(serializer_class, campos, expandir)
+    if columnas is None:
+        return queryset.select_related(*relaciones) if relaciones else queryset
+
+    queryset = queryset.select_related(None)
+    if relaciones:
+        queryset = queryset.select_related(*relaciones)
+    return queryset.only(*columnas)
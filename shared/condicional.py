@@ -0,0 +1,82 @@
+import hashlib
+import json
+from functools import wraps
+from django.db.models import Count, IntegerField, Max, Value
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def version_datos(*querysets):
+    """
+    Versión de los datos: último updated_at y cantidad de filas de cada
+    queryset, todo en una sola consulta (UNION ALL de agregados).
+
+    La cantidad detecta los borrados, que no cambian el máximo de updated_at.
+
+    Returns:
+        Lista de tuplas (ultimo, total) en el orden de los querysets
+    """
+    partes = [
+        queryset.order_by().annotate(
+            indice=Value(indice, output_field=IntegerField())
+        ).values('indice').annotate(
+            ultimo=Max('updated_at'), total=Count('pk')
+        ).values_list('indice', 'ultimo', 'total')
+        for indice, queryset in enumerate(querysets)
+    ]
+    filas = {indice: (ultimo, total) for indice, ultimo, total in partes[0].union(*partes[1:], all=True)}
+    return [filas.get(indice, (None, 0)) for indice in range(len(querysets))]
+
+
+def get_condicional(*modelos):
+    """
+    GET condicional para vistas @api_view de listado y detalle.
+
+    Antes de ejecutar la vista calcula un validador con version_datos sobre
+    los modelos indicados y, si coincide con el If-None-Match del cliente,
+    responde 304 sin consultar ni serializar nada más. Si la vista recibe
+    'pk', el primer modelo se restringe a esa fila; el resto se versiona
+    completo (tablas relacionadas que aparecen en la respuesta).
+
+    Va debajo de @permission_classes para que la autenticación y los
+    permisos se comprueben antes del 304. Los demás métodos no se tocan.
+
+    Last-Modified se envía como dato informativo, pero el 304 solo se decide
+    por ETag: un borrado no cambia el último updated_at.
+
+    Args:
+        modelos: Modelos con updated_at cuyos cambios alteran la respuesta
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return vista(request, *args, **kwargs)
+
+            querysets = [modelo.objects.all() for modelo in modelos]
+            if 'pk' in kwargs:
+                querysets[0] = querysets[0].filter(pk=kwargs['pk'])
+            versiones = version_datos(*querysets)
+
+            # La misma versión de datos se representa distinto según la URL
+            # (filtros, página, ?fields=) y el formato negociado
+            etag = quote_etag(hashlib.sha256(json.dumps(
+                [request.get_full_path(), request.accepted_media_type, versiones], default=str
+            ).encode()).hexdigest()[:32])
+            ultimos = [ultimo for ultimo, _ in versiones if ultimo is not None]
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = vista(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response['ETag'] = etag
+            if ultimos:
+                response['Last-Modified'] = http_date(max(ultimos).timestamp())
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        return envoltura
+
+    return decorador
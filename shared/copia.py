@@ -0,0 +1,137 @@
+import io
+from datetime import date, datetime, time
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Filas por cada COPY: acota la memoria del buffer sin perder rendimiento
+FILAS_POR_COPY = 100_000
+
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def texto_copy(valor):
+    """Representa un valor en el formato de texto de COPY (None es \\N)"""
+    if valor is None:
+        return '\\N'
+    if isinstance(valor, bool):
+        return 't' if valor else 'f'
+    if isinstance(valor, (date, datetime, time)):
+        return valor.isoformat()
+    if isinstance(valor, str):
+        return valor.translate(_ESCAPES)
+    return str(valor)
+
+
+def _columnas(modelo, campos):
+    return ', '.join(modelo._meta.get_field(campo).column for campo in campos)
+
+
+def copiar_lineas(modelo, campos, lineas, using=DEFAULT_DB_ALIAS, lote=FILAS_POR_COPY):
+    """
+    Inserta líneas ya formateadas (valores separados por tabulador, ver
+    texto_copy) con COPY ... FROM STDIN, sin pasar por el ORM.
+
+    Para tablas grandes (asistencias, notas) donde formatear cada valor por
+    separado costaría más que el propio COPY. No ejecuta save() ni señales:
+    los campos auto_now y los calculados (busqueda) deben venir en las líneas.
+
+    Returns:
+        Número de filas insertadas
+    """
+    conexion = connections[using]
+    sql = f'COPY {modelo._meta.db_table} ({_columnas(modelo, campos)}) FROM STDIN'
+    total = 0
+    buffer = io.StringIO()
+    pendientes = 0
+
+    def volcar():
+        buffer.seek(0)
+        with conexion.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for linea in lineas:
+        buffer.write(linea)
+        buffer.write('\n')
+        pendientes += 1
+        if pendientes >= lote:
+            volcar()
+            total += pendientes
+            pendientes = 0
+    if pendientes:
+        volcar()
+        total += pendientes
+    return total
+
+
+def copiar(modelo, campos, filas, using=DEFAULT_DB_ALIAS, lote=FILAS_POR_COPY):
+    """Como copiar_lineas, con filas como tuplas de valores Python"""
+    return copiar_lineas(
+        modelo, campos, ('\t'.join(map(texto_copy, fila)) for fila in filas), using=using, lote=lote
+    )
+
+
+def reservar_ids(modelo, cantidad, using=DEFAULT_DB_ALIAS):
+    """
+    Toma `cantidad` valores de la secuencia del pk del modelo, para insertar
+    con COPY filas a las que otras filas del mismo lote hacen referencia.
+    """
+    if cantidad <= 0:
+        return []
+    tabla = modelo._meta.db_table
+    columna = modelo._meta.pk.column
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [tabla, columna, cantidad]
+        )
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+def insertar_nuevos(objetos, clave, using=DEFAULT_DB_ALIAS, lote=1000):
+    """
+    Como bulk_create(ignore_conflicts=True), pero con INSERT ... ON CONFLICT
+    DO NOTHING RETURNING: informa exactamente qué filas insertó esta
+    sentencia, no las que otra transacción insertó a la vez. Los objetos
+    insertados reciben su pk. PostgreSQL y SQLite (3.35+).
+
+    Args:
+        objetos: Instancias sin guardar de un mismo modelo
+        clave: Campos de la restricción única que identifica cada fila
+            (ej: ('alumno', 'gestion')), para asociar el pk devuelto a su objeto
+
+    Returns:
+        Lista de los objetos insertados, en el orden recibido
+    """
+    objetos = list(objetos)
+    if not objetos:
+        return []
+    opciones = type(objetos[0])._meta
+    conexion = connections[using]
+    nombre = conexion.ops.quote_name
+    campos = [campo for campo in opciones.concrete_fields if not campo.primary_key]
+    claves = [opciones.get_field(campo) for campo in clave]
+    sql = (
+        f"INSERT INTO {nombre(opciones.db_table)} ({', '.join(nombre(campo.column) for campo in campos)}) "
+        'VALUES {valores} ON CONFLICT DO NOTHING '
+        f"RETURNING {nombre(opciones.pk.column)}, {', '.join(nombre(campo.column) for campo in claves)}"
+    )
+    fila = '(' + ', '.join(['%s'] * len(campos)) + ')'
+
+    insertados = set()
+    for inicio in range(0, len(objetos), lote):
+        bloque = objetos[inicio:inicio + lote]
+        por_clave = {tuple(getattr(objeto, campo.attname) for campo in claves): objeto for objeto in bloque}
+        # pre_save completa auto_now/auto_now_add en el propio objeto
+        parametros = [
+            campo.get_db_prep_save(campo.pre_save(objeto, True), conexion)
+            for objeto in bloque for campo in campos
+        ]
+        with conexion.cursor() as cursor:
+            cursor.execute(sql.format(valores=', '.join([fila] * len(bloque))), parametros)
+            for pk, *valores_clave in cursor.fetchall():
+                objeto = por_clave[tuple(valores_clave)]
+                objeto.pk = pk
+                objeto._state.adding, objeto._state.db = False, using
+                insertados.add(id(objeto))
+    return [objeto for objeto in objetos if id(objeto) in insertados]
@@ -0,0 +1,98 @@
+import sys
+import types
+import threading
+import importlib.util
+from importlib.machinery import PathFinder
+
+# Un solo lock reentrante: la carga de un módulo puede disparar la de otro
+# diferido (p. ej. matplotlib.figure -> matplotlib) en el mismo hilo
+_carga_lock = threading.RLock()
+_cargando = set()
+
+
+class _ModuloDiferido(types.ModuleType):
+    """Módulo registrado en sys.modules cuyo código se ejecuta en el primer acceso"""
+
+    def __getattribute__(self, atributo):
+        if type(self) is _ModuloDiferido:
+            _cargar(self)
+        return types.ModuleType.__getattribute__(self, atributo)
+
+
+def _cargar(modulo):
+    with _carga_lock:
+        # Otro hilo pudo terminar la carga mientras se esperaba el lock, o es
+        # el propio código del módulo accediendo a él mientras se ejecuta
+        if type(modulo) is not _ModuloDiferido or id(modulo) in _cargando:
+            return
+        _cargando.add(id(modulo))
+        try:
+            spec = types.ModuleType.__getattribute__(modulo, '__spec__')
+            try:
+                spec.loader.exec_module(modulo)
+            except BaseException:
+                # Como import: no dejar en sys.modules un módulo a medio
+                # ejecutar; el próximo acceso reintenta desde cero
+                if sys.modules.get(spec.name) is modulo:
+                    del sys.modules[spec.name]
+                raise
+            modulo.__class__ = types.ModuleType
+        finally:
+            _cargando.discard(id(modulo))
+
+
+def importar_diferido(nombre):
+    """
+    Importa un módulo sin ejecutarlo hasta que se use uno de sus atributos.
+
+    Pensado para librerías pesadas (matplotlib, openpyxl, numpy, pandas...)
+    que solo usan algunas rutas: se asignan a nivel de módulo como un import
+    normal y el costo de cargarlas lo paga la primera petición que las usa,
+    no el arranque de cada worker ni cada comando de manage.py.
+
+    A diferencia de importlib.util.LazyLoader, la primera carga es segura
+    con varios hilos (workers gthread): los demás esperan a que termine.
+
+        figure = importar_diferido('matplotlib.figure')
+        ...
+        figura = figure.Figure()    # aquí se carga matplotlib
+
+    Los submódulos no cargan al paquete padre hasta usarse. Los módulos de
+    extensión se importan de inmediato (no admiten ejecución diferida).
+
+    Raises:
+        ModuleNotFoundError: Si el módulo no está instalado (se detecta sin
+            ejecutarlo, así que sirve para dependencias opcionales)
+    """
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+
+    with _carga_lock:
+        if nombre in sys.modules:
+            return sys.modules[nombre]
+
+        padre, _, hijo = nombre.rpartition('.')
+        if padre:
+            paquete = importar_diferido(padre)
+            # Leer __spec__ sin disparar la carga del paquete
+            ubicaciones = types.ModuleType.__getattribute__(paquete, '__spec__').submodule_search_locations
+            spec = PathFinder.find_spec(nombre, ubicaciones) if ubicaciones else None
+        else:
+            spec = importlib.util.find_spec(nombre)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{nombre}'", name=nombre)
+
+        modulo = importlib.util.module_from_spec(spec)
+        if type(modulo) is not types.ModuleType:
+            return importlib.import_module(nombre)
+
+        modulo.__class__ = _ModuloDiferido
+        sys.modules[nombre] = modulo
+        if padre:
+            setattr(paquete, hijo, modulo)
+        return modulo
+
+
+def esta_cargado(nombre):
+    """True si el módulo ya se ejecutó (importado normalmente o diferido y usado)"""
+    return nombre in sys.modules and type(sys.modules[nombre]) is not _ModuloDiferido
@@ -0,0 +1,54 @@
+import csv
+from datetime import datetime
+from django.utils import timezone
+from django.http import StreamingHttpResponse
+from shared.asincrono import contenido_streaming
+
+# Filas por viaje al cursor del servidor
+TAMANO_CHUNK = 2000
+
+
+class _Eco:
+    """Pseudo-buffer: csv.writer escribe y la fila se devuelve tal cual"""
+
+    def write(self, valor):
+        return valor
+
+
+def _formatear(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, bool):
+        return 'Sí' if valor else 'No'
+    if isinstance(valor, datetime):
+        return timezone.localtime(valor).strftime('%Y-%m-%d %H:%M:%S')
+    return valor
+
+
+def respuesta_csv(request, nombre_archivo, encabezado, queryset):
+    """
+    Exporta un queryset values_list a CSV sin cargarlo en memoria.
+
+    Las filas se leen con un cursor del servidor (.iterator) y se escriben a
+    medida que el cliente las consume, así que la memoria no crece con la
+    cantidad de filas. Con DB_PGBOUNCER no hay cursores del servidor y el
+    driver recibe el resultado completo antes de la primera fila. Bajo ASGI
+    las filas se entregan con un iterador asíncrono (ver contenido_streaming).
+
+    Args:
+        request: Petición, para elegir el iterador según el servidor
+        nombre_archivo: Nombre sugerido para la descarga
+        encabezado: Lista con los nombres de columna
+        queryset: QuerySet con values_list en el mismo orden que el encabezado
+    """
+    escritor = csv.writer(_Eco())
+
+    def filas():
+        # BOM para que Excel detecte UTF-8
+        yield '\ufeff' + escritor.writerow(encabezado)
+        for fila in queryset.iterator(chunk_size=TAMANO_CHUNK):
+            yield escritor.writerow([_formatear(valor) for valor in fila])
+
+    response = StreamingHttpResponse(contenido_streaming(request, filas()), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{nombre_archivo}"'
+    return response
@@ -0,0 +1,37 @@
+from time import sleep
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.management.base import BaseCommand
+from shared.models import EstadoTrabajo
+from shared.trabajos import ejecutar, tomar_siguiente
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta los trabajos en segundo plano (importaciones, boletines) a medida '
+        'que se encolan. Pensado como proceso aparte del servidor web (Procfile: worker).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true', help='Procesar los pendientes y terminar')
+        parser.add_argument(
+            '--intervalo', type=float, default=None,
+            help='Segundos entre consultas cuando no hay pendientes (por defecto TRABAJOS_INTERVALO)'
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options['intervalo'] if options['intervalo'] is not None else settings.TRABAJOS_INTERVALO
+
+        while True:
+            # Como al final de una petición: respeta CONN_MAX_AGE y descarta conexiones rotas
+            close_old_connections()
+            trabajo = tomar_siguiente()
+            if trabajo is None:
+                if options['una_vez']:
+                    return
+                sleep(intervalo)
+                continue
+
+            ejecutar(trabajo)
+            estilo = self.style.SUCCESS if trabajo.estado == EstadoTrabajo.TERMINADO else self.style.ERROR
+            self.stdout.write(estilo(f'Trabajo {trabajo.pk} ({trabajo.tipo}): {trabajo.estado}'))
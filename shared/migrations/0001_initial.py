@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 13:03
+
+import django.db.models.deletion
+import shared.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Trabajo',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tipo', models.CharField(max_length=30)),
+                ('parametros', models.JSONField(default=dict)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_curso', 'En curso'), ('terminado', 'Terminado'), ('fallido', 'Fallido')], default='pendiente', max_length=10)),
+                ('entrada', models.FileField(blank=True, upload_to=shared.models.ruta_trabajo)),
+                ('archivo', models.FileField(blank=True, upload_to=shared.models.ruta_trabajo)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('iniciado_en', models.DateTimeField(blank=True, null=True)),
+                ('terminado_en', models.DateTimeField(blank=True, null=True)),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'trabajos',
+                'indexes': [models.Index(fields=['estado', 'id'], name='trabajos_estado_id_idx')],
+            },
+        ),
+    ]
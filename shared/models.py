@@ -9,4 +9,38 @@ class BaseEntity(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+
+class EstadoTrabajo(models.TextChoices):
+    PENDIENTE = 'pendiente', 'Pendiente'
+    EN_CURSO = 'en_curso', 'En curso'
+    TERMINADO = 'terminado', 'Terminado'
+    FALLIDO = 'fallido', 'Fallido'
+
+
+def ruta_trabajo(trabajo, nombre):
+    # Una carpeta por trabajo: el archivo conserva su nombre al descargarlo
+    return f'trabajos/{trabajo.pk}/{nombre}'
+
+
+class Trabajo(BaseEntity):
+    """
+    Tarea larga (importaciones, boletines) que se ejecuta fuera de las
+    peticiones, en el proceso procesar_trabajos (ver shared.trabajos)
+    """
+    tipo = models.CharField(max_length=30)
+    usuario = models.ForeignKey('authentication.Usuario', null=True, on_delete=models.SET_NULL)
+    parametros = models.JSONField(default=dict)
+    estado = models.CharField(max_length=10, choices=EstadoTrabajo.choices, default=EstadoTrabajo.PENDIENTE)
+    # Archivo subido (se borra al terminar) y archivo generado para descargar
+    entrada = models.FileField(upload_to=ruta_trabajo, blank=True)
+    archivo = models.FileField(upload_to=ruta_trabajo, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    iniciado_en = models.DateTimeField(null=True, blank=True)
+    terminado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'trabajos'
+        indexes = [models.Index(fields=['estado', 'id'], name='trabajos_estado_id_idx')]
@@ -0,0 +1,66 @@
+import random
+import logging
+from time import perf_counter
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from shared.rendimiento import ContadorConsultas
+
+logger = logging.getLogger(__name__)
+
+
+class PerfiladoSQLMiddleware:
+    """
+    Perfil SQL de cada petición (opcional, ver PERFIL_SQL en settings).
+
+    Cuenta consultas y tiempo de base con ContadorConsultas y escribe una
+    línea por petición en el log shared.perfilado:
+
+        sql GET /api/academic/materias/ estado=200 consultas=3 db_ms=4.1 total_ms=18.0 duplicadas=0
+
+    Las peticiones que superan PERFIL_SQL_LENTA_MS o que repiten un mismo
+    SQL PERFIL_SQL_DUPLICADAS veces o más (un N+1) se registran como
+    WARNING con su SQL y el tiempo de cada consulta. Los parámetros no se
+    registran: pueden contener datos personales.
+
+    Con PERFIL_SQL_CABECERAS la respuesta incluye X-DB-Queries, X-DB-Time
+    (ms) y X-DB-Duplicates. Exponen detalles internos: pensadas para
+    desarrollo y pruebas de carga, no para producción.
+
+    Solo ve las consultas del hilo de la petición: no las de los hilos de
+    shared.asincrono.en_paralelo ni las que hace una respuesta en streaming
+    después de devolverse.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERFIL_SQL:
+            # Sin perfilado no queda ni la llamada en la cadena de middleware
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if settings.PERFIL_SQL_MUESTREO < 1 and random.random() >= settings.PERFIL_SQL_MUESTREO:
+            return self.get_response(request)
+
+        inicio = perf_counter()
+        with ContadorConsultas() as contador:
+            response = self.get_response(request)
+        total_ms = (perf_counter() - inicio) * 1000
+        duplicadas = contador.duplicadas(settings.PERFIL_SQL_DUPLICADAS)
+
+        linea = (
+            f'sql {request.method} {request.path} estado={response.status_code} '
+            f'consultas={contador.consultas} db_ms={contador.tiempo_ms:.1f} '
+            f'total_ms={total_ms:.1f} duplicadas={len(duplicadas)}'
+        )
+        if total_ms >= settings.PERFIL_SQL_LENTA_MS or duplicadas:
+            detalle = [f'  {ms:8.1f} ms  {sql}' for sql, ms in zip(contador.sql, contador.tiempos)]
+            detalle += [f'  repetida {veces} veces: {sql}' for sql, veces in duplicadas]
+            logger.warning('%s\n%s', linea, '\n'.join(detalle))
+        else:
+            logger.info(linea)
+
+        if settings.PERFIL_SQL_CABECERAS:
+            response['X-DB-Queries'] = str(contador.consultas)
+            response['X-DB-Time'] = f'{contador.tiempo_ms:.1f}'
+            response['X-DB-Duplicates'] = str(len(duplicadas))
+        return response
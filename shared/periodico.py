@@ -0,0 +1,61 @@
+import os
+import logging
+import threading
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class TareaPeriodica:
+    """
+    Ejecuta `funcion` en un hilo daemon del proceso cada `intervalo()`
+    segundos, o antes si se llama a despertar(). Saca de las peticiones
+    escrituras que pueden esperar (ver authentication.last_login).
+
+    El hilo se crea en el primer iniciar() de cada proceso: tras un fork
+    (workers de gunicorn) el hijo crea el suyo. Cada vuelta cierra sus
+    conexiones a la base, que no quedan abiertas entre ejecuciones.
+    """
+
+    def __init__(self, nombre, funcion, intervalo):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.intervalo = intervalo
+        self._evento = threading.Event()
+        self._lock = threading.Lock()
+        self._hilo = None  # (pid, hilo, evento para detenerlo)
+
+    def iniciar(self):
+        with self._lock:
+            if self._hilo is None or self._hilo[0] != os.getpid() or not self._hilo[1].is_alive():
+                detenida = threading.Event()
+                hilo = threading.Thread(target=self._bucle, args=(detenida,), name=self.nombre, daemon=True)
+                self._hilo = (os.getpid(), hilo, detenida)
+                hilo.start()
+
+    def despertar(self):
+        self._evento.set()
+
+    def detener(self, espera=5):
+        """Termina el hilo de este proceso sin otra ejecución; iniciar() crea uno nuevo"""
+        with self._lock:
+            actual, self._hilo = self._hilo, None
+        if actual is None or actual[0] != os.getpid():
+            return
+        pid, hilo, detenida = actual
+        detenida.set()
+        self._evento.set()
+        hilo.join(espera)
+
+    def _bucle(self, detenida):
+        while not detenida.is_set():
+            self._evento.wait(self.intervalo())
+            self._evento.clear()
+            if detenida.is_set():
+                break
+            try:
+                self.funcion()
+            except Exception:
+                logger.exception('Falló la tarea periódica %s', self.nombre)
+            finally:
+                connections.close_all()
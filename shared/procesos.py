@@ -0,0 +1,31 @@
+import django
+from django.apps import apps
+from concurrent.futures import ProcessPoolExecutor
+
+
+def inicializar_django():
+    """Initializer de workers: con 'spawn' el proceso hijo arranca sin Django configurado"""
+    if not apps.ready:
+        django.setup()
+
+
+def mapear_en_procesos(funcion, elementos, procesos, chunksize=1):
+    """
+    Aplica una función CPU-bound a cada elemento en un pool de procesos.
+
+    Los resultados se devuelven en orden a medida que están listos, para que
+    el llamador pueda consumirlos (p. ej. escribirlos a disco) sin esperar al
+    final. Con un solo proceso o un solo elemento no se crea el pool.
+
+    Args:
+        funcion: Función a nivel de módulo (debe poder serializarse con pickle)
+        elementos: Lista de argumentos
+        procesos: Cantidad máxima de procesos
+        chunksize: Elementos enviados a cada worker por tarea
+    """
+    if procesos <= 1 or len(elementos) < 2:
+        yield from map(funcion, elementos)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(procesos, len(elementos)), initializer=inicializar_django) as pool:
+        yield from pool.map(funcion, elementos, chunksize=chunksize)
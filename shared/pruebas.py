@@ -0,0 +1,11 @@
+from shared.serializacion import serializar_lista
+
+
+class ParidadSerializacionMixin:
+    """Para TestCase: compara serializar_lista con el serializer DRF de un listado"""
+
+    def assertParidad(self, serializer_class, queryset):
+        instancias = list(queryset)
+        self.assertTrue(instancias)
+        esperado = [dict(fila) for fila in serializer_class(instancias, many=True).data]
+        self.assertEqual(serializar_lista(serializer_class, instancias), esperado)
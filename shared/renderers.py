@@ -0,0 +1,50 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ENCODER = encoders.JSONEncoder()
+
+
+def _default(valor):
+    # Tipos que orjson no serializa de forma nativa (Decimal, textos lazy, querysets...)
+    return _ENCODER.default(valor)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer basado en orjson, con la misma salida que el de DRF salvo
+    en los floats: se parsean al mismo valor, pero los exponentes se
+    escriben distinto (1e16 en lugar de 1e+16) y NaN/Infinity salen como
+    null en lugar de fallar (STRICT_JSON). Los serializers de la API
+    entregan los Decimal como texto, así que en la práctica solo afecta a
+    FloatField (ver RenderJSONTests).
+
+    Si orjson no está instalado, se pide una indentación distinta de 2
+    (p. ej. 'application/json; indent=4') o hay un valor que orjson no
+    soporta, usa el encoder estándar.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent not in (None, 2) or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        opciones = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent == 2:
+            opciones |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=opciones)
+        except orjson.JSONEncodeError:
+            # Casos fuera de orjson (p. ej. enteros de más de 64 bits)
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Igual que DRF: \u2028 y \u2029 escapados para que sea un subconjunto estricto de JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
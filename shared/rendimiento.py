@@ -0,0 +1,138 @@
+import json
+import statistics
+from collections import Counter
+from time import perf_counter
+from contextlib import ExitStack, nullcontext
+from django.db import connections
+
+
+class ContadorConsultas:
+    """
+    Cuenta las consultas SQL, su tiempo y las filas leídas en todas las
+    conexiones (connection.execute_wrapper) mientras el contexto está activo.
+
+    Las filas son el rowcount de cada SELECT; los cursores del lado del
+    servidor (iterator() sin pgbouncer) no lo informan y no suman. SQLite
+    nunca lo informa (rowcount -1 en todo SELECT): ahí filas queda en None,
+    no medido, en vez de un 0 que haría pasar cualquier regresión.
+    Solo ve las consultas del hilo actual.
+    """
+
+    def __init__(self):
+        self.consultas = 0
+        self.filas = 0
+        self.sql = []
+        self.tiempos = []
+        self.tiempo_ms = 0.0
+        self._pila = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = perf_counter()
+        resultado = execute(sql, params, many, context)
+        duracion = (perf_counter() - inicio) * 1000
+        self.consultas += 1
+        self.sql.append(sql)
+        self.tiempos.append(duracion)
+        self.tiempo_ms += duracion
+        if not many and sql.lstrip()[:6].upper().startswith(('SELECT', 'WITH')):
+            filas = context['cursor'].rowcount
+            if filas < 0 and context['connection'].vendor == 'sqlite':
+                self.filas = None
+            elif self.filas is not None:
+                self.filas += max(filas, 0)
+        return resultado
+
+    def duplicadas(self, minimo=2):
+        """
+        SQL ejecutado al menos `minimo` veces (con cualquier parámetro): la
+        firma de un N+1. Lista de (sql, veces), de la más repetida a la menos.
+        """
+        return [(sql, veces) for sql, veces in Counter(self.sql).most_common() if veces >= minimo]
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        for conexion in connections.all():
+            self._pila.enter_context(conexion.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc):
+        self._pila.close()
+
+
+def medir(funcion, repeticiones=1, entorno=nullcontext):
+    """
+    Ejecuta una función varias veces midiendo consultas, filas y tiempo.
+
+    entorno() envuelve cada ejecución fuera de la medición (p. ej.
+    transaction.atomic, cuyos SAVEPOINT no deben contarse).
+
+    Returns:
+        Diccionario con consultas y filas de la última ejecución (las
+        anteriores calientan cachés de proceso), ms (mediana) y resultado
+        (lo que devolvió la última ejecución)
+    """
+    tiempos = []
+    for _ in range(max(1, repeticiones)):
+        with entorno(), ContadorConsultas() as contador:
+            inicio = perf_counter()
+            resultado = funcion()
+            tiempos.append((perf_counter() - inicio) * 1000)
+    return {
+        'consultas': contador.consultas,
+        'filas': contador.filas,
+        'ms': round(statistics.median(tiempos), 2),
+        'sql': contador.sql,
+        'resultado': resultado,
+    }
+
+
+def cargar_base(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return {}
+
+
+def guardar_base(ruta, mediciones, claves=('consultas', 'filas')):
+    """
+    Guarda las `claves` de cada medición como nueva línea base. Por defecto
+    consultas y filas, que no dependen de la máquina; los ms solo tienen
+    sentido en la misma máquina y van a un archivo aparte sin versionar.
+    """
+    # Las filas no medidas (None, SQLite) se omiten en vez de guardarse
+    base = {
+        nombre: {clave: medicion[clave] for clave in claves if medicion[clave] is not None}
+        for nombre, medicion in sorted(mediciones.items())
+    }
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(base, archivo, indent=2, ensure_ascii=False)
+        archivo.write('\n')
+
+
+def regresiones(mediciones, base, tolerancia_tiempo=None):
+    """
+    Compara mediciones con la línea base.
+
+    Más consultas o más filas que la base es una regresión (p. ej. un N+1
+    nuevo o un listado que dejó de paginar); las filas solo se comparan si
+    se midieron en ambas (no en SQLite). El tiempo solo se compara si se
+    indica una tolerancia y la base tiene ms: ms > base * tolerancia + 5.
+
+    Returns:
+        Lista de mensajes, vacía si no hay regresiones
+    """
+    mensajes = []
+    for nombre, medicion in sorted(mediciones.items()):
+        anterior = base.get(nombre)
+        if anterior is None:
+            mensajes.append(f'{nombre}: sin línea base')
+            continue
+        for clave in ('consultas', 'filas'):
+            if medicion[clave] is None or anterior.get(clave) is None:
+                continue
+            if medicion[clave] > anterior[clave]:
+                mensajes.append(f'{nombre}: {medicion[clave]} {clave} (base {anterior[clave]})')
+        if tolerancia_tiempo and 'ms' in anterior and medicion['ms'] > anterior['ms'] * tolerancia_tiempo + 5:
+            mensajes.append(f"{nombre}: {medicion['ms']:.1f} ms (base {anterior['ms']:.1f} ms)")
+    return mensajes
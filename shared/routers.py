@@ -0,0 +1,158 @@
+import time
+import logging
+import threading
+from functools import wraps
+from inspect import iscoroutinefunction
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, DatabaseError, InterfaceError, OperationalError
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+
+# Estado de la petición en curso dentro de una vista @lectura_en_replica;
+# None fuera de ellas (todas las lecturas van a la primaria)
+_peticion = ContextVar('lectura_en_replica', default=None)
+
+_salud = {'hasta': 0.0, 'disponible': None}
+_salud_lock = threading.Lock()
+
+_RETRASO_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def _retraso_replica():
+    """Segundos de retraso de la réplica respecto a la primaria"""
+    conexion = connections[REPLICA]
+    if conexion.vendor != 'postgresql':
+        # Base de prueba local (ej: SQLite): sin replicación que medir
+        return 0
+    with conexion.cursor() as cursor:
+        cursor.execute(_RETRASO_SQL)
+        return float(cursor.fetchone()[0])
+
+
+def _actualizar_salud(disponible, motivo=''):
+    if disponible != _salud['disponible']:
+        if disponible:
+            logger.info('Réplica de lectura disponible')
+        else:
+            logger.warning('Réplica de lectura fuera de servicio: %s', motivo)
+    _salud['disponible'] = disponible
+    _salud['hasta'] = time.monotonic() + settings.REPLICA_CHECK_INTERVAL
+
+
+def replica_disponible():
+    """
+    True si hay réplica configurada, responde y su retraso no supera
+    REPLICA_MAX_LAG. El resultado se reutiliza REPLICA_CHECK_INTERVAL segundos
+    en cada proceso para no medir el retraso en cada consulta.
+    """
+    if REPLICA not in settings.DATABASES:
+        return False
+    if time.monotonic() < _salud['hasta']:
+        return _salud['disponible']
+
+    with _salud_lock:
+        if time.monotonic() < _salud['hasta']:
+            return _salud['disponible']
+        try:
+            retraso = _retraso_replica()
+        except DatabaseError as error:
+            connections[REPLICA].close()
+            _actualizar_salud(False, error)
+        else:
+            _actualizar_salud(retraso <= settings.REPLICA_MAX_LAG, f'retraso de {retraso:.1f} s')
+        return _salud['disponible']
+
+
+class ReplicaRouter:
+    """
+    Envía a la réplica las lecturas de las vistas marcadas con
+    @lectura_en_replica, mientras esté disponible y la petición no haya
+    escrito nada. Todo lo demás (y toda escritura) va a la primaria.
+    """
+
+    def db_for_read(self, model, **hints):
+        peticion = _peticion.get()
+        if peticion is None:
+            return None
+        if peticion['escribio'] or not replica_disponible():
+            return DEFAULT_DB_ALIAS
+        peticion['uso_replica'] = True
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        peticion = _peticion.get()
+        if peticion is not None:
+            # Lo que se lea después debe ver esta escritura
+            peticion['escribio'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica es una copia de la primaria: mismos datos en ambas
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db == REPLICA else None
+
+
+def lectura_en_replica(vista):
+    """
+    Marca una vista de solo lectura (estadísticas, dashboards, reportes)
+    para que sus consultas vayan a la réplica.
+
+    Va debajo de @permission_classes: la autenticación se resuelve en la
+    primaria. Si la réplica falla durante la vista y la vista aún no había
+    escrito, se da por caída y la vista se repite contra la primaria.
+    """
+    if iscoroutinefunction(vista):
+        @wraps(vista)
+        async def envoltura_async(request, *args, **kwargs):
+            peticion = {'escribio': False, 'uso_replica': False}
+            token = _peticion.set(peticion)
+            try:
+                return await vista(request, *args, **kwargs)
+            except (OperationalError, InterfaceError) as error:
+                if not await sync_to_async(_descartar_replica)(peticion, error):
+                    raise
+            finally:
+                _peticion.reset(token)
+
+            return await vista(request, *args, **kwargs)
+
+        return envoltura_async
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        peticion = {'escribio': False, 'uso_replica': False}
+        token = _peticion.set(peticion)
+        try:
+            return vista(request, *args, **kwargs)
+        except (OperationalError, InterfaceError) as error:
+            if not _descartar_replica(peticion, error):
+                raise
+        finally:
+            _peticion.reset(token)
+
+        return vista(request, *args, **kwargs)
+
+    return envoltura
+
+
+def _descartar_replica(peticion, error):
+    """Marca la réplica como caída si el error pudo venir de ella; True si se puede reintentar"""
+    if not peticion['uso_replica'] or peticion['escribio']:
+        return False
+    with _salud_lock:
+        # Las conexiones de los hilos de shared.asincrono que fallaron las
+        # cierra close_old_connections al terminar cada consulta
+        connections[REPLICA].close()
+        _actualizar_salud(False, error)
+    return True
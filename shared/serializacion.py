@@ -0,0 +1,190 @@
+from datetime import datetime
+from functools import cache, lru_cache
+from operator import attrgetter
+from django.conf import settings
+from django.utils import timezone
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.settings import api_settings
+from rest_framework.relations import PKOnlyObject
+
+# to_representation que no modifican valores de su tipo nativo
+_IDENTIDAD = {
+    serializers.CharField.to_representation: str,
+    serializers.IntegerField.to_representation: int,
+    serializers.BooleanField.to_representation: bool,
+}
+
+
+def _representacion_drf(campo, instancia):
+    """Camino estándar de DRF para un campo (Serializer.to_representation)"""
+    atributo = campo.get_attribute(instancia)
+    valor = atributo.pk if isinstance(atributo, PKOnlyObject) else atributo
+    return None if valor is None else campo.to_representation(atributo)
+
+
+def _fecha_hora_iso(campo):
+    """
+    Para DateTimeField ISO 8601 sin zona propia devuelve una función
+    (valor, zona) -> texto que replica DateTimeField.to_representation
+    recibiendo la zona horaria ya resuelta.
+    """
+    formato = getattr(campo, 'format', api_settings.DATETIME_FORMAT)
+    if type(campo).to_representation is not serializers.DateTimeField.to_representation \
+            or hasattr(campo, 'timezone') or formato is None or formato.lower() != 'iso-8601':
+        return None
+
+    def representar(valor, zona):
+        if zona is None or type(valor) is not datetime or valor.utcoffset() is None:
+            return campo.to_representation(valor)
+        texto = valor.astimezone(zona).isoformat()
+        return texto[:-6] + 'Z' if texto.endswith('+00:00') else texto
+
+    return representar
+
+
+def _compilar_campo(campo, modelo):
+    """
+    Devuelve una función (instancia, zona) -> valor representado para un
+    campo, especializada según su tipo para evitar la maquinaria genérica de DRF.
+    """
+    if isinstance(campo, serializers.SerializerMethodField):
+        metodo = getattr(campo.parent, campo.method_name)
+        return lambda instancia, zona: metodo(instancia)
+
+    fuente = campo.source_attrs
+
+    # FK como PK: se lee <campo>_id sin cargar el objeto relacionado
+    if isinstance(campo, serializers.PrimaryKeyRelatedField) and len(fuente) == 1 and campo.pk_field is None:
+        obtener_pk = attrgetter(modelo._meta.get_field(fuente[0]).attname)
+        return lambda instancia, zona: obtener_pk(instancia)
+
+    if isinstance(campo, (serializers.RelatedField, serializers.BaseSerializer)) or not fuente:
+        return lambda instancia, zona: _representacion_drf(campo, instancia)
+
+    obtener = attrgetter('.'.join(fuente))
+    tipo_identidad = _IDENTIDAD.get(type(campo).to_representation)
+    fecha_hora = _fecha_hora_iso(campo)
+
+    def representar(instancia, zona):
+        try:
+            valor = obtener(instancia)
+        except (AttributeError, ObjectDoesNotExist):
+            # Relación nula u objeto inexistente: mismo tratamiento que DRF
+            return _representacion_drf(campo, instancia)
+        if valor is None:
+            return None
+        if type(valor) is tipo_identidad:
+            return valor
+        if callable(valor):
+            return _representacion_drf(campo, instancia)
+        if fecha_hora is not None:
+            return fecha_hora(valor, zona)
+        return campo.to_representation(valor)
+
+    return representar
+
+
+@cache
+def campos_legibles(serializer_class):
+    """{nombre: campo} de los campos legibles de un serializer, en su orden"""
+    return {campo.field_name: campo for campo in serializer_class()._readable_fields}
+
+
+@cache
+def plan_lectura(serializer_class):
+    """
+    Compila una vez por clase el plan de lectura de un serializer:
+    lista de (nombre, función) para cada campo legible.
+    """
+    if serializer_class.to_representation is not serializers.ModelSerializer.to_representation:
+        raise TypeError(f'{serializer_class.__name__} redefine to_representation')
+
+    modelo = serializer_class.Meta.model
+    return [
+        (nombre, _compilar_campo(campo, modelo))
+        for nombre, campo in campos_legibles(serializer_class).items()
+    ]
+
+
+def _compilar_expansion(campo, serializer_anidado):
+    """Reemplaza el id de una FK por el objeto relacionado serializado"""
+    obtener = attrgetter('.'.join(campo.source_attrs))
+    plan = plan_lectura(serializer_anidado)
+
+    def representar(instancia, zona):
+        relacionado = obtener(instancia)
+        if relacionado is None:
+            return None
+        return {nombre: representar_anidado(relacionado, zona) for nombre, representar_anidado in plan}
+
+    return representar
+
+
+@lru_cache(maxsize=256)
+def _plan_parcial(serializer_class, campos, expandir):
+    """Plan de lectura restringido a 'campos' y con las FK de 'expandir' anidadas"""
+    legibles = campos_legibles(serializer_class)
+    expandibles = getattr(serializer_class.Meta, 'expandibles', {})
+    plan = []
+    for nombre, representar in plan_lectura(serializer_class):
+        if campos is not None and nombre not in campos:
+            continue
+        if nombre in expandir:
+            representar = _compilar_expansion(legibles[nombre], expandibles[nombre])
+        plan.append((nombre, representar))
+    return plan
+
+
+def _serializar_drf(serializer_class, instancias, campos, expandir):
+    """Camino estándar de DRF con el mismo recorte de campos y expansiones"""
+    filas = serializer_class(instancias, many=True).data
+    if campos is None and not expandir:
+        return filas
+
+    legibles = campos_legibles(serializer_class)
+    expandibles = getattr(serializer_class.Meta, 'expandibles', {})
+    resultado = []
+    for instancia, fila in zip(instancias, filas):
+        if campos is not None:
+            fila = {nombre: valor for nombre, valor in fila.items() if nombre in campos}
+        for nombre in expandir:
+            if nombre in fila:
+                relacionado = attrgetter('.'.join(legibles[nombre].source_attrs))(instancia)
+                fila[nombre] = None if relacionado is None else expandibles[nombre](relacionado).data
+        resultado.append(fila)
+    return resultado
+
+
+def serializar_lista(serializer_class, instancias, campos=None, expandir=frozenset()):
+    """
+    Serialización de solo lectura para listados, equivalente a
+    serializer_class(instancias, many=True).data.
+
+    Solo apta para serializers sin contexto (request) en sus métodos. Si un
+    campo pide omitirse (SkipField) se usa la serialización estándar.
+
+    Args:
+        serializer_class: ModelSerializer del listado
+        instancias: Objetos a serializar
+        campos: Subconjunto de campos a incluir (None = todos)
+        expandir: Campos FK a reemplazar por el objeto anidado, según
+            Meta.expandibles (ver shared.campos)
+    """
+    if campos is None and not expandir:
+        plan = plan_lectura(serializer_class)
+    else:
+        plan = _plan_parcial(
+            serializer_class, None if campos is None else frozenset(campos), frozenset(expandir)
+        )
+
+    # Zona horaria resuelta una vez por listado y no una vez por valor
+    zona = timezone.get_current_timezone() if settings.USE_TZ else None
+    try:
+        return [
+            {nombre: representar(instancia, zona) for nombre, representar in plan}
+            for instancia in instancias
+        ]
+    except SkipField:
+        return _serializar_drf(serializer_class, instancias, campos, expandir)
@@ -0,0 +1,25 @@
+import os
+from django.urls import reverse
+from rest_framework import serializers
+from shared.models import Trabajo
+
+
+class TrabajoSerializer(serializers.ModelSerializer):
+    """Estado de un trabajo en segundo plano, con el enlace a su archivo cuando está listo"""
+    descarga = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Trabajo
+        fields = [
+            'id', 'tipo', 'estado', 'parametros', 'resultado', 'error', 'descarga',
+            'created_at', 'iniciado_en', 'terminado_en'
+        ]
+        read_only_fields = fields
+
+    def get_descarga(self, obj):
+        if not obj.archivo:
+            return None
+        return {
+            'url': reverse('trabajo-archivo', kwargs={'pk': obj.pk}),
+            'nombre': os.path.basename(obj.archivo.name),
+        }
@@ -0,0 +1,83 @@
+import logging
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from shared.models import Trabajo, EstadoTrabajo
+
+logger = logging.getLogger(__name__)
+
+# Tipo de trabajo -> función que lo ejecuta. Recibe el Trabajo, puede
+# guardar un archivo en trabajo.archivo y devuelve el resultado (JSON)
+TIPOS = {
+    'importar_alumnos': 'authentication.importacion.trabajo_importar_alumnos',
+    'boletines': 'evaluations.boletines.trabajo_boletines',
+}
+
+
+class ErrorTrabajo(Exception):
+    """Falla prevista de un trabajo (ej: archivo ilegible): el mensaje se muestra al usuario"""
+
+
+def encolar(tipo, usuario=None, parametros=None, entrada=None):
+    """
+    Registra un trabajo pendiente. Lo ejecuta el proceso procesar_trabajos,
+    no el worker web: las peticiones responden enseguida con el id y el
+    estado se consulta en /api/trabajos/<id>/.
+
+    Args:
+        tipo: Clave de TIPOS
+        usuario: Usuario que lo pide
+        parametros: Diccionario serializable a JSON
+        entrada: Archivo subido que el trabajo procesa
+
+    Returns:
+        El Trabajo creado
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f'Tipo de trabajo desconocido: {tipo}')
+
+    # En una transacción: ningún proceso lo toma antes de tener su archivo
+    with transaction.atomic():
+        trabajo = Trabajo.objects.create(tipo=tipo, usuario=usuario, parametros=parametros or {})
+        if entrada is not None:
+            trabajo.entrada.save(entrada.name, entrada)
+    return trabajo
+
+
+def tomar_siguiente():
+    """
+    Marca en curso el trabajo pendiente más antiguo. Con SKIP LOCKED varios
+    procesos procesar_trabajos pueden correr a la vez sin tomar el mismo.
+
+    Returns:
+        El Trabajo, o None si no hay pendientes
+    """
+    with transaction.atomic():
+        trabajo = (
+            Trabajo.objects.select_for_update(skip_locked=True)
+            .filter(estado=EstadoTrabajo.PENDIENTE).order_by('id').first()
+        )
+        if trabajo is not None:
+            trabajo.estado = EstadoTrabajo.EN_CURSO
+            trabajo.iniciado_en = timezone.now()
+            trabajo.save(update_fields=['estado', 'iniciado_en', 'updated_at'])
+    return trabajo
+
+
+def ejecutar(trabajo):
+    """Ejecuta un trabajo tomado y guarda su resultado o su error"""
+    try:
+        trabajo.resultado = import_string(TIPOS[trabajo.tipo])(trabajo)
+        trabajo.estado = EstadoTrabajo.TERMINADO
+    except ErrorTrabajo as e:
+        trabajo.estado, trabajo.error = EstadoTrabajo.FALLIDO, str(e)
+    except Exception:
+        logger.exception('Falló el trabajo %s (%s)', trabajo.pk, trabajo.tipo)
+        trabajo.estado, trabajo.error = EstadoTrabajo.FALLIDO, 'Error interno al procesar el trabajo'
+    finally:
+        # La entrada puede traer contraseñas en texto plano: no se conserva
+        if trabajo.entrada:
+            trabajo.entrada.delete(save=False)
+        trabajo.terminado_en = timezone.now()
+        trabajo.save()
+    return trabajo
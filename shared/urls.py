@@ -0,0 +1,7 @@
+from shared import views
+from django.urls import path
+
+urlpatterns = [
+    path('<int:pk>/', views.trabajo_detail, name='trabajo-detail'),
+    path('<int:pk>/archivo/', views.trabajo_archivo, name='trabajo-archivo'),
+]
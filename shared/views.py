@@ -0,0 +1,54 @@
+import os
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes
+from shared.models import Trabajo
+from shared.asincrono import contenido_streaming, es_asgi
+from shared.permissions import IsDirector
+from shared.serializers import TrabajoSerializer
+
+
+def _trabajo_no_encontrado():
+    return Response(
+        {'error': 'Trabajo no encontrado'},
+        status=status.HTTP_404_NOT_FOUND
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+def trabajo_detail(request, pk):
+    """Estado y resultado de un trabajo en segundo plano (importaciones, boletines)"""
+    try:
+        trabajo = Trabajo.objects.get(pk=pk)
+    except Trabajo.DoesNotExist:
+        return _trabajo_no_encontrado()
+
+    return Response(TrabajoSerializer(trabajo).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsDirector])
+def trabajo_archivo(request, pk):
+    """Descargar el archivo generado por un trabajo terminado"""
+    try:
+        trabajo = Trabajo.objects.get(pk=pk)
+    except Trabajo.DoesNotExist:
+        return _trabajo_no_encontrado()
+
+    if not trabajo.archivo:
+        return Response(
+            {'error': 'El trabajo no generó un archivo', 'estado': trabajo.estado},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    response = FileResponse(
+        trabajo.archivo.open('rb'),
+        as_attachment=True,
+        filename=os.path.basename(trabajo.archivo.name)
+    )
+    if es_asgi(request):
+        # Bajo WSGI se sirve con wsgi.file_wrapper; bajo ASGI, por bloques
+        response.streaming_content = contenido_streaming(request, response.streaming_content)
+    return response